@@ -69,7 +69,8 @@ window.Tableify = class Tableify {
     this.currentSort = newSortDirection === 0 ? null : colName;
     this.sortDirection = newSortDirection;
 
-    this.redraw(); // Redraw the table with updated sorting
+    // rows are paginated server side, so sorting has to fetch them again rather than reorder the loaded ones
+    this.refreshData();
   }
 
   getFilterParams() {
@@ -80,6 +81,11 @@ window.Tableify = class Tableify {
         params[colName] = filterValues.join(',');
     }
 
+    if (this.currentSort) {
+        params["sort"] = this.currentSort;
+        params["sort_direction"] = this.sortDirection === -1 ? "desc" : "asc";
+    }
+
     return params;
   }
 
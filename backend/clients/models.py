@@ -24,6 +24,15 @@ class Client(OwnerBase):
     city = models.CharField(max_length=100, blank=True, null=True)
     country = models.CharField(max_length=100, blank=True, null=True)
 
+    class Meta(OwnerBase.Meta):
+        # keyset pagination on the public API (search is trigram indexed on PostgreSQL, see migration 0073)
+        indexes = [
+            models.Index(fields=["user", "active", "id"], name="client_user_id_idx"),
+            models.Index(fields=["organization", "active", "id"], name="client_org_id_idx"),
+            models.Index(fields=["user", "active", "name", "id"], name="client_user_name_idx"),
+            models.Index(fields=["organization", "active", "name", "id"], name="client_org_name_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -13,6 +13,7 @@ from backend.models import QuotaLimit, Organization, UserSettings
 from backend.core.types.requests import WebRequest
 from backend.core.utils.feature_flags import get_feature_status
 from backend.core.service.defaults.get import get_account_defaults
+from backend.core.service.invoices.common.filters import INVOICE_STATUS_FILTERS
 
 
 def open_modal(request: WebRequest, modal_name, context_type=None, context_value=None):
@@ -159,6 +160,9 @@ def open_modal(request: WebRequest, modal_name, context_type=None, context_value
                 ]
 
                 context["email_list"] = list(filter(lambda i: i is not "", list(context["email_list"]) + context["selected_clients"]))
+        elif modal_name == "export_invoices":
+            context["statuses"] = INVOICE_STATUS_FILTERS
+            context["clients"] = Client.filter_by_owner(owner=request.actor).filter(active=True).order_by("name").values("id", "name")
         elif modal_name == "invoices_to_destination":
             if existing_client := request.GET.get("client"):
                 context["existing_client_id"] = existing_client
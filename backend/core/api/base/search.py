@@ -0,0 +1,47 @@
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.urls import reverse
+
+from backend.models import SearchEntry
+from backend.core.service.permissions.resolver import missing_team_scopes
+from backend.core.service.search.query import search_entries
+from backend.core.types.requests import WebRequest
+
+# the scope a team member needs to see each kind of result
+SEARCH_KIND_SCOPES = {
+    SearchEntry.Kinds.INVOICE: "invoices:read",
+    SearchEntry.Kinds.PRODUCT: "invoices:read",
+    SearchEntry.Kinds.CLIENT: "clients:read",
+    SearchEntry.Kinds.RECEIPT: "receipts:read",
+}
+
+
+def _result_url(entry: SearchEntry) -> str | None:
+    match entry.kind:
+        case SearchEntry.Kinds.INVOICE:
+            return reverse("finance:invoices:single:overview", kwargs={"invoice_id": entry.object_id})
+        case SearchEntry.Kinds.CLIENT:
+            return reverse("clients:detail", kwargs={"id": entry.object_id})
+        case SearchEntry.Kinds.RECEIPT:
+            return reverse("receipts dashboard")
+    return None
+
+
+def global_search_endpoint(request: WebRequest):
+    query = request.GET.get("q", "").strip()
+    kinds = [kind for kind in SEARCH_KIND_SCOPES if request.GET.get("kind") in (None, "", kind)]
+
+    if request.team:
+        missing = missing_team_scopes(request.team, request.user.pk, set(SEARCH_KIND_SCOPES.values())) or set()
+        kinds = [kind for kind in kinds if SEARCH_KIND_SCOPES[kind] not in missing]
+
+    entries = search_entries(request.actor, query, kinds) if query and kinds else []
+    results = [
+        {"kind": entry.kind, "id": entry.object_id, "title": entry.title, "description": entry.body, "url": _result_url(entry)}
+        for entry in entries
+    ]
+
+    if request.htmx:
+        return render(request, "base/search/_results.html", {"results": results, "query": query})
+
+    return JsonResponse({"query": query, "results": results})
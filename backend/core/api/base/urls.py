@@ -1,5 +1,5 @@
 from django.urls import path
-from . import modal, notifications, breadcrumbs
+from . import modal, notifications, breadcrumbs, search
 
 urlpatterns = [
     path(
@@ -24,6 +24,7 @@ urlpatterns = [
         name="notifications delete",
     ),
     path("breadcrumbs/refetch/", breadcrumbs.update_breadcrumbs_endpoint, name="breadcrumbs refetch"),
+    path("search/", search.global_search_endpoint, name="search"),
 ]
 
 app_name = "base"
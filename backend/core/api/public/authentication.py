@@ -4,6 +4,7 @@ from rest_framework.authentication import TokenAuthentication, get_authorization
 from rest_framework.exceptions import AuthenticationFailed
 from django.utils.translation import gettext_lazy as _
 from backend.core.api.public.models import APIAuthToken
+from backend.core.service.api_keys.cache import get_verified_api_key
 from backend.models import User, Organization
 
 from rest_framework import exceptions
@@ -48,11 +49,9 @@ class CustomBearerAuthentication(TokenAuthentication):
         return (user_or_org, token)
 
     def authenticate_credentials(self, raw_key) -> tuple[User | Organization | None, APIAuthToken]:
-        model = self.get_model()
+        token = get_verified_api_key(raw_key)
 
-        try:
-            token = model.objects.get(hashed_key=model.hash_raw_key(raw_key), active=True)
-        except model.DoesNotExist:
+        if not token:
             raise AuthenticationFailed(_("Invalid token."))
 
         if token.has_expired:
@@ -4,8 +4,10 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.generics import get_object_or_404
 from rest_framework import status
 
-from backend.models import TeamMemberPermission, Organization, Client
+from backend.models import Organization, Client
 from backend.core.api.public.helpers.response import APIResponse
+from backend.core.service.api_keys.last_used import record_api_key_use
+from backend.core.service.permissions.resolver import expand_scopes, has_team_scopes, normalize_required_scopes
 
 import logging
 
@@ -13,6 +15,8 @@ logger = logging.getLogger(__name__)
 
 
 def require_scopes(scopes):
+    required_scopes = normalize_required_scopes(scopes)
+
     def decorator(view_func):
         @wraps(view_func)
         def _wrapped_view(request, *args, **kwargs):
@@ -28,16 +32,14 @@ def require_scopes(scopes):
 
             if request.team:
                 # Check for team permissions based on team_id and scopes
-                if not request.team.is_owner(token.user) and not request.team.is_logged_in_as_team(request):
-                    team_permissions = TeamMemberPermission.objects.filter(team=request.team, user=token.user).first()
-                    if not team_permissions or not all(scope in team_permissions.scopes for scope in scopes):
-                        return APIResponse(False, {"detail": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
+                if not request.team.is_logged_in_as_team(request) and not has_team_scopes(request.team, token.user_id, scopes):
+                    return APIResponse(False, {"detail": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
 
             # Check for global API Key permissions based on token scopes
-            if not all(scope in token.scopes for scope in scopes):
+            if not required_scopes <= expand_scopes(token.scopes):
                 return APIResponse(False, {"detail": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
 
-            token.update_last_used()
+            record_api_key_use(token)
 
             return view_func(request, *args, **kwargs)
 
@@ -71,6 +71,6 @@ def download(request: APIRequest, id: str) -> HttpResponse | Response:
     except Invoice.DoesNotExist:
         return APIResponse(False, {"message": "Invoice not found"}, status=status.HTTP_400_BAD_REQUEST)
 
-    if response := generate_pdf(invoice, "attachment"):
+    if response := generate_pdf(invoice, "attachment", request):
         return response
     return APIResponse(False, {"message": "Error generating PDF"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
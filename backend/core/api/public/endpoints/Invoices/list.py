@@ -1,6 +1,3 @@
-from django.db.models import Case, When, CharField
-from django.db.models.expressions import Value, F
-from django.utils import timezone
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -8,57 +5,68 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from backend.core.api.public.decorators import require_scopes
+from backend.core.api.public.helpers.pagination import (
+    CURSOR_PARAMETER,
+    PAGE_SIZE_PARAMETER,
+    PAGINATION_SCHEMA,
+    PaginationError,
+    get_page_size,
+    paginate_keyset,
+    parse_ordering,
+)
 from backend.core.api.public.helpers.response import APIResponse
 from backend.core.api.public.serializers.invoices import InvoiceSerializer
 from backend.core.api.public.swagger_ui import TEAM_PARAMETER
 from backend.core.api.public.types import APIRequest
+from backend.core.service.invoices.common.filters import INVOICE_STATUS_FILTERS, filter_invoices
 
 from backend.finance.models import Invoice
-from backend.core.service.invoices.common.fetch import get_context
+
+# each ordering is backed by an (owner, field, id) index, see Invoice.Meta.indexes
+INVOICE_ORDERINGS = ("id", "date_due", "date_issued")
+
+
+def _date_parameter(name: str, description: str) -> openapi.Parameter:
+    return openapi.Parameter(name, openapi.IN_QUERY, description=description, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE)
 
 
 @swagger_auto_schema(
     method="get",
-    operation_description="List all invoices",
+    operation_description="List invoices, a page at a time. Pass the returned next_cursor as cursor to fetch the next page.",
     operation_id="list_invoices",
     manual_parameters=[
         TEAM_PARAMETER,
-        # openapi.Parameter(
-        #     "sort",
-        #     openapi.IN_QUERY,
-        #     description="Field you want to order by to. Sort options: 'date_due', 'id', 'status'. Default by 'id'.",
-        #     type=openapi.TYPE_STRING,
-        # ),
-        # openapi.Parameter(
-        #     "sort_direction",
-        #     openapi.IN_QUERY,
-        #     description="Order by descending or ascending. 'False' for descending and 'True' for ascending. Default is ascending.",
-        #     type=openapi.TYPE_STRING,
-        # ),
-        # openapi.Parameter(
-        #     "filter_type",
-        #     openapi.IN_QUERY,
-        #     description="Select filter type by which results will be filtered. Filter types are 'status' and "
-        #                 "'amount'. By default there is no filter types applied.",
-        #     type=openapi.TYPE_STRING,
-        # ),
-        # openapi.Parameter(
-        #     "filter",
-        #     openapi.IN_QUERY,
-        #     description="Select filter by which results will be filtered. Filters for 'status' are 'paid', "
-        #                 "'pending', 'overdue', 'draft' and for 'amount' are '20+', '50+', '100+'. By default there is no "
-        #                 "filter applied.",
-        #     type=openapi.TYPE_STRING,
-        # ),
+        CURSOR_PARAMETER,
+        PAGE_SIZE_PARAMETER,
+        openapi.Parameter(
+            "ordering",
+            openapi.IN_QUERY,
+            description=f"Order by one of: {', '.join(INVOICE_ORDERINGS)}. Prefix with '-' for descending. Default is 'id'.",
+            type=openapi.TYPE_STRING,
+        ),
+        openapi.Parameter(
+            "status",
+            openapi.IN_QUERY,
+            description=f"Comma separated statuses to include: {', '.join(INVOICE_STATUS_FILTERS)}",
+            type=openapi.TYPE_STRING,
+        ),
+        _date_parameter("date_due_after", "Only invoices due on or after this date"),
+        _date_parameter("date_due_before", "Only invoices due on or before this date"),
+        _date_parameter("date_issued_after", "Only invoices issued on or after this date"),
+        _date_parameter("date_issued_before", "Only invoices issued on or before this date"),
+        openapi.Parameter("client", openapi.IN_QUERY, description="Only invoices for this client id", type=openapi.TYPE_INTEGER),
+        openapi.Parameter("amount_min", openapi.IN_QUERY, description="Minimum invoice total", type=openapi.TYPE_NUMBER),
+        openapi.Parameter("amount_max", openapi.IN_QUERY, description="Maximum invoice total", type=openapi.TYPE_NUMBER),
     ],
     responses={
         200: openapi.Response(
-            description="List of invoices",
+            description="A page of invoices",
             schema=openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
                     "success": openapi.Schema(type=openapi.TYPE_BOOLEAN),
                     "invoices": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+                    "pagination": PAGINATION_SCHEMA,
                 },
             ),
         )
@@ -72,15 +80,23 @@ def list_invoices_endpoint(request: APIRequest) -> Response:
     else:
         invoices = Invoice.objects.filter(user=request.user)
 
-    # sort_by = request.query_params.get("sort")
-    # sort_direction = request.query_params.get("sort_direction", "")
-    # action_filter_type = request.query_params.get("filter_type")
-    # action_filter_by = request.query_params.get("filter")
+    filter_response = filter_invoices(invoices, request.query_params)
 
-    # todo: add back sort + filters on backend for API
+    if filter_response.failed:
+        return APIResponse(False, {"detail": filter_response.error}, status=status.HTTP_400_BAD_REQUEST)
 
-    _, invoices = get_context(invoices)  # type: ignore[assignment]
+    try:
+        ordering_field, descending = parse_ordering(request.query_params.get("ordering"), INVOICE_ORDERINGS)
+        page = paginate_keyset(
+            filter_response.response.prefetch_related("items"),
+            ordering_field,
+            descending,
+            cursor=request.query_params.get("cursor"),
+            page_size=get_page_size(request.query_params.get("page_size")),
+        )
+    except PaginationError as error:
+        return APIResponse(False, {"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
-    serializer = InvoiceSerializer(invoices, many=True)
+    serializer = InvoiceSerializer(page.items, many=True)
 
-    return APIResponse(True, {"invoices": serializer.data}, status=status.HTTP_200_OK)
+    return APIResponse(True, {"invoices": serializer.data, "pagination": page.pagination}, status=status.HTTP_200_OK)
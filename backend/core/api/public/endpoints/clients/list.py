@@ -1,36 +1,67 @@
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from django.db.models import QuerySet
+from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from backend.core.api.public.decorators import require_scopes
+from backend.core.api.public.helpers.pagination import (
+    CURSOR_PARAMETER,
+    PAGE_SIZE_PARAMETER,
+    PAGINATION_SCHEMA,
+    PaginationError,
+    get_page_size,
+    paginate_keyset,
+    parse_ordering,
+)
 from backend.core.api.public.helpers.response import APIResponse
 from backend.core.api.public.serializers.clients import ClientSerializer
 from backend.core.api.public.swagger_ui import TEAM_PARAMETER
 from backend.core.api.public.types import APIRequest
-from backend.core.service.clients.get import fetch_clients, FetchClientServiceResponse
+from backend.core.service.clients.get import fetch_clients, FetchClientServiceResponse, search_clients
 
-from backend.models import Organization
+# each ordering is backed by an (owner, field, id) index, see Client.Meta.indexes
+CLIENT_ORDERINGS = ("id", "name")
+CLIENT_FIELDS = tuple(ClientSerializer().fields)
 
 
 @swagger_auto_schema(
     method="get",
-    operation_description="List all clients",
+    operation_description="List clients, a page at a time. Pass the returned next_cursor as cursor to fetch the next page.",
     operation_id="clients_list",
     manual_parameters=[
         TEAM_PARAMETER,
-        openapi.Parameter("order_by", openapi.IN_QUERY, description="field you want to order by to", type=openapi.TYPE_STRING),
-        openapi.Parameter("search", openapi.IN_QUERY, description="field you want to search by", type=openapi.TYPE_STRING),
+        CURSOR_PARAMETER,
+        PAGE_SIZE_PARAMETER,
+        openapi.Parameter(
+            "order_by",
+            openapi.IN_QUERY,
+            description=f"Order by one of: {', '.join(CLIENT_ORDERINGS)}. Prefix with '-' for descending. Default is 'id'.",
+            type=openapi.TYPE_STRING,
+        ),
+        openapi.Parameter("search", openapi.IN_QUERY, description="Search clients by name, email, company or id", type=openapi.TYPE_STRING),
+        openapi.Parameter(
+            "search_type",
+            openapi.IN_QUERY,
+            description="'contains' (default) to match anywhere, or 'prefix' to match the start of the name, email or company",
+            type=openapi.TYPE_STRING,
+        ),
+        openapi.Parameter(
+            "fields",
+            openapi.IN_QUERY,
+            description=f"Comma separated fields to return, e.g. 'id,email'. Available: {', '.join(CLIENT_FIELDS)}",
+            type=openapi.TYPE_STRING,
+        ),
     ],
     responses={
         200: openapi.Response(
-            description="List of clients",
+            description="A page of clients",
             schema=openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
                     "success": openapi.Schema(type=openapi.TYPE_BOOLEAN),
                     "clients": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Items(type=openapi.TYPE_OBJECT)),
+                    "pagination": PAGINATION_SCHEMA,
                 },
             ),
         )
@@ -39,14 +70,40 @@ from backend.models import Organization
 @api_view(["GET"])
 @require_scopes(["clients:read"])
 def list_clients_endpoint(request: APIRequest):
-    # paginator = PageNumberPagination()
-    # paginator.page_size = 5
+    params = request.query_params
+
+    fields: list[str] | None = None
+    if params.get("fields"):
+        fields = [field.strip() for field in params["fields"].split(",") if field.strip()]
+        if invalid := [field for field in fields if field not in CLIENT_FIELDS]:
+            return APIResponse(False, {"detail": f"Invalid fields: {', '.join(invalid)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    search_type = params.get("search_type", "contains")
+    if search_type not in ("contains", "prefix"):
+        return APIResponse(False, {"detail": "search_type must be 'contains' or 'prefix'"}, status=status.HTTP_400_BAD_REQUEST)
 
-    search_text = request.data.get("search")
+    clients: FetchClientServiceResponse = fetch_clients(request, team=request.team)
+    queryset = clients.response
 
-    clients: FetchClientServiceResponse = fetch_clients(request, search_text=search_text, team=request.team)
+    if search_text := params.get("search", "").strip():
+        queryset = search_clients(queryset, search_text, prefix=search_type == "prefix")
 
-    # queryset = paginator.paginate_queryset(clients, request)
+    try:
+        ordering_field, descending = parse_ordering(params.get("order_by"), CLIENT_ORDERINGS)
+
+        if fields:
+            # only load the requested columns (plus what the cursor needs)
+            queryset = queryset.only(*{*fields, "id", ordering_field})
+
+        page = paginate_keyset(
+            queryset,
+            ordering_field,
+            descending,
+            cursor=params.get("cursor"),
+            page_size=get_page_size(params.get("page_size")),
+        )
+    except PaginationError as error:
+        return APIResponse(False, {"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
-    serializer = ClientSerializer(clients.response, many=True)
-    return APIResponse(True, {"clients": serializer.data})
+    serializer = ClientSerializer(page.items, many=True, fields=fields)
+    return APIResponse(True, {"clients": serializer.data, "pagination": page.pagination})
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import F, Q, QuerySet
+from drf_yasg import openapi
+
+M = TypeVar("M", bound=models.Model)
+
+
+class PaginationError(ValueError):
+    """
+    Raised for an invalid cursor, ordering or page size; the message is safe to return to the API client
+    """
+
+
+CURSOR_PARAMETER = openapi.Parameter(
+    "cursor", openapi.IN_QUERY, description="next_cursor from the previous page, omit for the first page", type=openapi.TYPE_STRING
+)
+PAGE_SIZE_PARAMETER = openapi.Parameter(
+    "page_size",
+    openapi.IN_QUERY,
+    description=f"Results per page (default {settings.PUBLIC_API_DEFAULT_PAGE_SIZE}, max {settings.PUBLIC_API_MAX_PAGE_SIZE})",
+    type=openapi.TYPE_INTEGER,
+)
+PAGINATION_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "next_cursor": openapi.Schema(type=openapi.TYPE_STRING, x_nullable=True),
+        "has_more": openapi.Schema(type=openapi.TYPE_BOOLEAN),
+        "page_size": openapi.Schema(type=openapi.TYPE_INTEGER),
+    },
+)
+
+
+def get_page_size(value: str | None) -> int:
+    if not value:
+        return settings.PUBLIC_API_DEFAULT_PAGE_SIZE
+
+    try:
+        page_size = int(value)
+    except ValueError:
+        raise PaginationError("page_size must be a number")
+
+    return max(1, min(page_size, settings.PUBLIC_API_MAX_PAGE_SIZE))
+
+
+def parse_ordering(value: str | None, allowed: tuple[str, ...], default: str = "id") -> tuple[str, bool]:
+    """
+    Parses "field" / "-field" into (field, descending), only allowing orderings that have a backing index
+    """
+    value = value or default
+    field, descending = value.removeprefix("-"), value.startswith("-")
+
+    if field not in allowed:
+        raise PaginationError(f"Invalid ordering, choose from: {', '.join(allowed)} (prefix with '-' for descending)")
+
+    return field, descending
+
+
+def _encode_cursor(ordering: str, value: Any, pk: int) -> str:
+    raw = json.dumps([ordering, value.isoformat() if hasattr(value, "isoformat") else value, pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, ordering: str, field: models.Field) -> tuple[Any, int]:
+    try:
+        cursor_ordering, value, pk = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        value = None if value is None else field.to_python(value)
+        pk = int(pk)
+    except (ValueError, TypeError, ValidationError):
+        raise PaginationError("Invalid cursor")
+
+    if cursor_ordering != ordering:
+        raise PaginationError("This cursor belongs to a different ordering")
+
+    return value, pk
+
+
+@dataclass
+class KeysetPage(Generic[M]):
+    items: list[M]
+    next_cursor: str | None
+    page_size: int
+
+    @property
+    def pagination(self) -> dict:
+        return {"next_cursor": self.next_cursor, "has_more": self.next_cursor is not None, "page_size": self.page_size}
+
+
+def paginate_keyset(queryset: QuerySet[M], field_name: str, descending: bool, cursor: str | None, page_size: int) -> KeysetPage[M]:
+    """
+    Cursor (keyset) pagination ordered by (field_name, pk), so every page is a bounded range scan over an index on
+    (owner, field_name, id) no matter how deep into the results it is. NULLs sort last in both directions.
+    """
+    field: models.Field = queryset.model._meta.get_field(field_name)
+    ordering = f"-{field_name}" if descending else field_name
+    is_pk = field.primary_key
+
+    if cursor:
+        value, pk = _decode_cursor(cursor, ordering, field)
+        after = "lt" if descending else "gt"
+
+        if is_pk:
+            queryset = queryset.filter(**{f"pk__{after}": pk})
+        elif value is None:
+            queryset = queryset.filter(**{f"{field_name}__isnull": True, f"pk__{after}": pk})
+        else:
+            keyset = Q(**{f"{field_name}__{after}": value}) | Q(**{field_name: value, f"pk__{after}": pk})
+            if field.null:
+                keyset |= Q(**{f"{field_name}__isnull": True})
+            queryset = queryset.filter(keyset)
+
+    if is_pk:
+        order_by = [F("pk").desc() if descending else F("pk").asc()]
+    else:
+        order_by = [
+            F(field_name).desc(nulls_last=True) if descending else F(field_name).asc(nulls_last=True),
+            F("pk").desc() if descending else F("pk").asc(),
+        ]
+
+    items = list(queryset.order_by(*order_by)[: page_size + 1])
+
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = _encode_cursor(ordering, None if is_pk else getattr(last, field.attname), last.pk)
+
+    return KeysetPage(items=items, next_cursor=next_cursor, page_size=page_size)
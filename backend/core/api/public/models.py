@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.contrib.auth.hashers import check_password, make_password
 import binascii
+import hashlib
+import hmac
 import os
 from django.utils import timezone
 
@@ -12,7 +15,10 @@ from backend.core.models import OwnerBase, ExpiresBase
 class APIAuthToken(OwnerBase, ExpiresBase):
     id = models.AutoField(primary_key=True)
 
-    hashed_key = models.CharField("Key", max_length=128, unique=True)
+    # keyed HMAC-SHA256 digest of the raw key, used for the (indexed) lookup on every authenticated request
+    lookup_key = models.CharField("Lookup Key", max_length=64, unique=True, null=True, blank=True, editable=False)
+    # legacy PBKDF2 hash, only set for keys that haven't been used since lookup_key was introduced
+    hashed_key = models.CharField("Key", max_length=128, unique=True, null=True, blank=True)
 
     name = models.CharField("Key Name", max_length=64)
     description = models.TextField("Description", blank=True, null=True)
@@ -38,7 +44,7 @@ class APIAuthToken(OwnerBase, ExpiresBase):
 
     def update_last_used(self):
         self.last_used = timezone.now()
-        self.save()
+        self.save(update_fields=["last_used"])
         return True
 
     # def save(self, *args, **kwargs):
@@ -50,16 +56,37 @@ class APIAuthToken(OwnerBase, ExpiresBase):
         """
 
         raw = binascii.hexlify(os.urandom(20)).decode()
-        self.hashed_key = self.hash_raw_key(raw)
+        self.lookup_key = self.digest_raw_key(raw)
+        self.hashed_key = None
 
         return raw
 
+    @classmethod
+    def digest_raw_key(cls, raw_key: str) -> str:
+        """
+        Fast, constant-cost keyed digest of a raw key. Safe to run on every request.
+        """
+        return hmac.new(settings.API_KEY_LOOKUP_SECRET.encode(), raw_key.encode(), hashlib.sha256).hexdigest()
+
     @classmethod
     def hash_raw_key(cls, raw_key: str):
+        """
+        Legacy PBKDF2 hash (full key derivation per call). Only used to find keys created before lookup_key existed.
+        """
         return make_password(raw_key, salt="api_tokens", hasher="default")
 
+    def upgrade_lookup_key(self, raw_key: str) -> None:
+        """
+        Moves a legacy PBKDF2 hashed key over to the HMAC lookup digest
+        """
+        self.lookup_key = self.digest_raw_key(raw_key)
+        self.hashed_key = None
+        self.save(update_fields=["lookup_key", "hashed_key"])
+
     def verify(self, key) -> bool:
-        return check_password(key, self.hashed_key)
+        if self.lookup_key:
+            return hmac.compare_digest(self.lookup_key, self.digest_raw_key(key))
+        return bool(self.hashed_key) and check_password(key, self.hashed_key)
 
     def deactivate(self):
         self.active = False
@@ -4,6 +4,17 @@ from backend.finance.models import Client
 
 
 class ClientSerializer(serializers.ModelSerializer):
+    """
+    Pass fields=[...] to only serialize a subset of the fields (sparse fieldsets)
+    """
+
     class Meta:
         model = Client
         exclude = ("organization", "user", "email_verified")
+
+    def __init__(self, *args, fields: list[str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
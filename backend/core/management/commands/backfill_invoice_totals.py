@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from backend.finance.models import Invoice, InvoiceRecurringProfile
+
+
+class Command(BaseCommand):
+    help = "Recalculate the stored subtotal, discount, tax and total of every invoice and recurring profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="rows loaded and written per batch")
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+
+        for model in (Invoice, InvoiceRecurringProfile):
+            updated = 0
+            last_id = 0
+
+            while True:
+                batch = list(model.objects.filter(pk__gt=last_id).order_by("pk").prefetch_related("items")[:batch_size])
+                if not batch:
+                    break
+
+                for invoice in batch:
+                    invoice.refresh_totals(save=False)
+
+                model.objects.bulk_update(batch, model.MONEY_FIELDS)
+                updated += len(batch)
+                last_id = batch[-1].pk
+
+            self.stdout.write(f"Recalculated totals for {updated} {model._meta.verbose_name_plural}")
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from backend.core.api.public import APIAuthToken
+from backend.core.service.api_keys.get import get_api_key_by_raw_key
+from backend.models import User
+
+
+class Command(BaseCommand):
+    """
+    Compares the per-request cost of building the API key lookup value with the legacy PBKDF2 hash
+    against the HMAC lookup digest, plus the full lookup through get_api_key_by_raw_key.
+
+    Everything created here is rolled back afterwards.
+    """
+
+    help = "Benchmark API key authentication cost per request (legacy PBKDF2 vs HMAC lookup digest)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("-n", "--iterations", type=int, default=50, help="requests to simulate per benchmark")
+
+    def handle(self, *args, **kwargs):
+        iterations: int = max(kwargs["iterations"], 1)
+
+        with transaction.atomic():
+            user = User.objects.create_user(username="benchmark-api-auth", email="benchmark-api-auth@example.com")
+            token = APIAuthToken(user=user, name="benchmark")
+            raw_key = token.generate_key()
+            token.save()
+
+            results = {
+                "legacy PBKDF2 hash (before)": self.time_per_call(lambda: APIAuthToken.hash_raw_key(raw_key), iterations),
+                "HMAC lookup digest (after)": self.time_per_call(lambda: APIAuthToken.digest_raw_key(raw_key), iterations),
+                "full lookup incl. DB query (after)": self.time_per_call(lambda: get_api_key_by_raw_key(raw_key), iterations),
+            }
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"API key authentication cost per request ({iterations} iterations):")
+        for name, seconds in results.items():
+            self.stdout.write(f"  {name:<40} {seconds * 1000:>10.3f} ms")
+
+        before = results["legacy PBKDF2 hash (before)"]
+        after = results["full lookup incl. DB query (after)"]
+        self.stdout.write(f"  speedup: {before / after:.0f}x")
+
+    @staticmethod
+    def time_per_call(func, iterations: int) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) / iterations
@@ -0,0 +1,45 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.core.service.invoices.common.filters import INVOICE_STATUS_FILTERS
+from backend.core.service.invoices.single.export_pdfs import export_invoices_queryset, stream_invoices_zip
+from backend.models import Organization, User
+
+
+class Command(BaseCommand):
+    help = "Export the PDFs of a user's or team's invoices into a ZIP file"
+
+    def add_arguments(self, parser):
+        owner = parser.add_mutually_exclusive_group(required=True)
+        owner.add_argument("--user", type=int, help="id of the user whose invoices are exported")
+        owner.add_argument("--organization", type=int, help="id of the team whose invoices are exported")
+        parser.add_argument("--output", required=True, help="path of the ZIP file to write")
+        parser.add_argument("--start", type=date.fromisoformat, help="first issue date included (YYYY-MM-DD)")
+        parser.add_argument("--end", type=date.fromisoformat, help="last issue date included (YYYY-MM-DD)")
+        parser.add_argument("--status", action="append", choices=INVOICE_STATUS_FILTERS, default=[], help="can be given more than once")
+        parser.add_argument("--client", type=int, help="only invoices sent to this client id")
+        parser.add_argument("--workers", type=int, help="rendering processes, defaults to the INVOICE_EXPORT_WORKERS setting")
+
+    def handle(self, *args, **kwargs):
+        try:
+            if kwargs["user"]:
+                owner = User.objects.get(pk=kwargs["user"])
+            else:
+                owner = Organization.objects.get(pk=kwargs["organization"])
+        except (User.DoesNotExist, Organization.DoesNotExist):
+            raise CommandError("Owner not found")
+
+        invoices = export_invoices_queryset(owner, kwargs["start"], kwargs["end"], kwargs["status"], kwargs["client"])
+        exported = 0
+
+        def on_progress(done: int, total: int):
+            nonlocal exported
+            exported = done
+            self.stdout.write(f"Rendered {done}/{total} invoices")
+
+        with open(kwargs["output"], "wb") as output:
+            for chunk in stream_invoices_zip(invoices, kwargs["workers"], on_progress):
+                output.write(chunk)
+
+        self.stdout.write(f"Exported {exported} invoices to {kwargs['output']}")
@@ -0,0 +1,25 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from backend.core.service.invoices.recurring.generation.batch import generate_due_recurring_invoices
+
+
+class Command(BaseCommand):
+    help = "Generate the invoices of every recurring profile due on a date, in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=date.fromisoformat, help="issue date to generate for (YYYY-MM-DD), defaults to today")
+        parser.add_argument("--batch-size", type=int, help="profiles generated per transaction")
+
+    def handle(self, *args, **kwargs):
+        issue_date = kwargs["date"] or timezone.now().date()
+        result = generate_due_recurring_invoices(issue_date, kwargs["batch_size"])
+
+        self.stdout.write(
+            f"Generated {len(result.generated)} invoices for {issue_date} in {result.seconds:.2f}s ({result.per_second:.0f}/s), "
+            f"{len(result.failed)} failed"
+        )
+        for profile_id, error in result.failed.items():
+            self.stderr.write(f"Recurring profile #{profile_id}: {error}")
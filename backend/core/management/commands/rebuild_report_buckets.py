@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.service.reports.buckets import rebuild_report_buckets
+from backend.models import Invoice, Organization, Receipt, User
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-day report buckets used by live reports from every owner's invoices and receipts"
+
+    def handle(self, *args, **kwargs):
+        user_ids = {
+            *Invoice.objects.values_list("user_id", flat=True).distinct(),
+            *Receipt.objects.values_list("user_id", flat=True).distinct(),
+        } - {None}
+        organization_ids = {
+            *Invoice.objects.values_list("organization_id", flat=True).distinct(),
+            *Receipt.objects.values_list("organization_id", flat=True).distinct(),
+        } - {None}
+
+        owners = [*User.objects.filter(pk__in=user_ids), *Organization.objects.filter(pk__in=organization_ids)]
+        for owner in owners:
+            rebuild_report_buckets(owner)
+
+        self.stdout.write(f"Rebuilt report buckets for {len(owners)} owners")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.service.reports.revenue import rebuild_revenue_rollup, refresh_overdue_revenue_rollups
+from backend.models import Invoice, Organization, User
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily revenue rollup behind the dashboard charts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--overdue", action="store_true", help="only refresh days with invoices that have become overdue (run this daily)"
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["overdue"]:
+            refreshed = refresh_overdue_revenue_rollups()
+            self.stdout.write(f"Refreshed {refreshed} days with newly overdue invoices")
+            return
+
+        user_ids = set(Invoice.objects.filter(user__isnull=False).values_list("user_id", flat=True).distinct())
+        organization_ids = set(Invoice.objects.filter(organization__isnull=False).values_list("organization_id", flat=True).distinct())
+
+        owners = [*User.objects.filter(pk__in=user_ids), *Organization.objects.filter(pk__in=organization_ids)]
+        for owner in owners:
+            rebuild_revenue_rollup(owner)
+
+        self.stdout.write(f"Rebuilt the revenue rollup for {len(owners)} owners")
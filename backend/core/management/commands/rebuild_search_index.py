@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.service.search.index import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of invoices, clients, receipts and products"
+
+    def handle(self, *args, **kwargs):
+        written = rebuild_search_index()
+        self.stdout.write(f"Indexed {written} objects")
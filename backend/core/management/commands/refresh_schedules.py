@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from backend.core.service.boto3.scheduler.refresh import refresh_schedules
+
+
+class Command(BaseCommand):
+    help = "Reconcile every active recurring profile's AWS schedule with the profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="concurrent schedule updates (default SCHEDULE_REFRESH_WORKERS)")
+        parser.add_argument("--rate", type=float, default=None, help="API calls per second (default SCHEDULE_REFRESH_RATE)")
+        parser.add_argument(
+            "--full", action="store_true", help="also check the cron expression, end date and input of schedules already in the right state"
+        )
+
+    def handle(self, *args, **kwargs):
+        summary = refresh_schedules(workers=kwargs["workers"], rate=kwargs["rate"], full=kwargs["full"])
+
+        self.stdout.write(str(summary))
+        if summary.failed:
+            self.stdout.write(f"Failed profiles: {', '.join(map(str, summary.failed))}")
+        if summary.orphaned:
+            self.stdout.write(f"Schedules without an active profile: {', '.join(summary.orphaned)}")
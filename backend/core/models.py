@@ -10,9 +10,10 @@ from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.files.storage import storages, FileSystemStorage
 from django.db import models
-from django.db.models import Count, QuerySet
+from django.db.models import QuerySet
 from django.utils import timezone
 from django.utils.crypto import get_random_string
+from django.utils.functional import cached_property
 from storages.backends.s3 import S3Storage
 
 
@@ -63,12 +64,7 @@ M = typing.TypeVar("M", bound=models.Model)
 
 class CustomUserManager(UserManager):
     def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .select_related("user_profile", "logged_in_as_team")
-            .annotate(notification_count=(Count("user_notifications")))
-        )
+        return super().get_queryset().select_related("user_profile", "logged_in_as_team")
 
     def create_user(self, username, email, password=None, **extra_fields):
         if not email:
@@ -110,6 +106,11 @@ class User(AbstractUser):
     def name(self):
         return self.first_name
 
+    @cached_property
+    def notification_count(self) -> int:
+        # only counted when something (e.g. the topbar template) actually reads it
+        return self.user_notifications.count()
+
     @property
     def teams_apart_of(self):
         return set(itertools.chain(self.teams_joined.all(), self.teams_leader_of.all()))
@@ -738,3 +739,35 @@ class MultiFileUpload(OwnerBase):
 
     def is_finished(self):
         return self.finished_at is not None
+
+
+class SearchEntry(OwnerBase):
+    """
+    One searchable document per invoice, client, receipt or product, kept current by the search signals.
+    The text is full-text indexed outside of the ORM (FTS5 on SQLite, a tsvector GIN index on PostgreSQL), see migration 0078.
+    """
+
+    class Kinds(models.TextChoices):
+        INVOICE = "invoice", "Invoice"
+        CLIENT = "client", "Client"
+        RECEIPT = "receipt", "Receipt"
+        PRODUCT = "product", "Product"
+
+    kind = models.CharField(max_length=10, choices=Kinds.choices)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=200)
+    body = models.TextField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(OwnerBase.Meta):
+        constraints = [
+            *OwnerBase.Meta.constraints,
+            models.UniqueConstraint(fields=["kind", "object_id"], name="search_entry_object_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "kind"], name="search_entry_user_kind_idx"),
+            models.Index(fields=["organization", "kind"], name="search_entry_org_kind_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.title}"
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCacheClient
+
+from backend.core.api.public import APIAuthToken
+from backend.core.service.api_keys.get import get_api_key_by_raw_key
+from backend.models import User, Organization
+
+cache: RedisCacheClient = cache  # type: ignore[no-redef]
+
+
+@dataclass(frozen=True)
+class VerifiedAPIKey:
+    """
+    Snapshot of a verified API key: everything authentication and scope checks need, and nothing secret.
+    """
+
+    id: int
+    lookup_key: str
+    user_id: int | None
+    organization_id: int | None
+    scopes: tuple[str, ...]
+    expires: datetime | None
+    active: bool
+    administrator_service_type: str | None
+
+    @classmethod
+    def from_token(cls, token: APIAuthToken) -> VerifiedAPIKey:
+        return cls(
+            id=token.id,
+            lookup_key=token.lookup_key,  # type: ignore[arg-type]
+            user_id=token.user_id,  # type: ignore[attr-defined]
+            organization_id=token.organization_id,  # type: ignore[attr-defined]
+            scopes=tuple(token.scopes),
+            expires=token.expires,
+            active=token.active,
+            administrator_service_type=token.administrator_service_type,
+        )
+
+    def matches(self, **filters) -> bool:
+        return all(getattr(self, field) == value for field, value in filters.items())
+
+    def to_token(self) -> APIAuthToken:
+        """
+        Rebuilds the token without touching the database. Fields not held in the snapshot (name, description...) are
+        deferred, so they're only loaded if something actually reads them.
+        """
+        values = asdict(self) | {"scopes": list(self.scopes)}
+        field_names = [field.attname for field in APIAuthToken._meta.concrete_fields if field.attname in values]
+        token = APIAuthToken.from_db("default", field_names, [values[name] for name in field_names])
+
+        if self.user_id:
+            token.user = User.from_db("default", ["id"], [self.user_id])
+        else:
+            token.organization = Organization.from_db("default", ["id"], [self.organization_id])
+        return token
+
+
+class _LocalLRU:
+    """
+    Small thread-safe LRU with a per-entry TTL, so each worker can skip loading and unpickling the full snapshot for hot
+    keys. Entries remember the shared generation they were stored under and are only served while it still matches.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str | None, VerifiedAPIKey]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, generation: str | None) -> VerifiedAPIKey | None:
+        if self.ttl <= 0:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            expires_at, entry_generation, value = entry
+            if expires_at < time.monotonic() or entry_generation != generation:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, generation: str | None, value: VerifiedAPIKey) -> None:
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_local_cache = _LocalLRU(maxsize=settings.API_KEY_CACHE_MAXSIZE, ttl=settings.API_KEY_CACHE_LOCAL_TTL)
+
+
+GENERATION_CACHE_KEY = "myfinances:api_keys:generation"
+
+
+def _cache_key(lookup_key: str) -> str:
+    return f"myfinances:api_keys:verified:{lookup_key}"
+
+
+def get_verified_api_key(raw_key: str, **filters) -> APIAuthToken | None:
+    """
+    Cached version of get_api_key_by_raw_key. A hit (in-process LRU first, then the shared cache) costs zero DB queries.
+    The in-process LRU is only trusted while the shared generation matches, so an invalidation on any worker applies
+    to every worker straight away.
+
+    Only active keys are cached; callers are still expected to check has_expired.
+    """
+    lookup_key = APIAuthToken.digest_raw_key(raw_key)
+    generation = cache.get(GENERATION_CACHE_KEY)
+
+    verified = _local_cache.get(lookup_key, generation)
+
+    if verified is None and (verified := cache.get(_cache_key(lookup_key))) is not None:
+        _local_cache.set(lookup_key, generation, verified)
+
+    if verified is not None:
+        return verified.to_token() if verified.matches(**filters) else None
+
+    token = get_api_key_by_raw_key(raw_key)
+
+    if not token:
+        return None
+
+    verified = VerifiedAPIKey.from_token(token)
+    cache.set(_cache_key(lookup_key), verified, timeout=settings.API_KEY_CACHE_TTL)
+    _local_cache.set(lookup_key, generation, verified)
+
+    return token if verified.matches(**filters) else None
+
+
+def invalidate_api_key_cache(token: APIAuthToken) -> None:
+    """
+    Drops a key from the shared cache and this worker's LRU, and starts a new shared generation so every other
+    worker's LRU entries stop being served on their next lookup.
+    """
+    if not token.lookup_key:
+        return
+
+    cache.delete(_cache_key(token.lookup_key))
+    cache.set(GENERATION_CACHE_KEY, uuid4().hex, timeout=None)
+    _local_cache.delete(token.lookup_key)
+
+
+def clear_local_api_key_cache() -> None:
+    _local_cache.clear()
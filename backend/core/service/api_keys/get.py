@@ -8,3 +8,26 @@ def get_api_key_by_name(owner: User | Organization, key_name: str) -> APIAuthTok
 
 def get_api_key_by_id(owner: User | Organization, key_id: str | int) -> APIAuthToken | None:
     return APIAuthToken.filter_by_owner(owner).filter(id=key_id, active=True).first()
+
+
+def get_api_key_by_raw_key(raw_key: str, **filters) -> APIAuthToken | None:
+    """
+    Finds an active API key from the raw bearer value using the indexed HMAC lookup digest.
+
+    Keys created before the digest existed are matched via their legacy PBKDF2 hash (only while any remain)
+    and are upgraded in place, so each legacy key pays the PBKDF2 cost at most once.
+    """
+    token = APIAuthToken.objects.filter(lookup_key=APIAuthToken.digest_raw_key(raw_key), active=True, **filters).first()
+
+    if token:
+        return token
+
+    if not APIAuthToken.objects.filter(lookup_key__isnull=True, hashed_key__isnull=False).exists():
+        return None
+
+    token = APIAuthToken.objects.filter(hashed_key=APIAuthToken.hash_raw_key(raw_key), active=True, **filters).first()
+
+    if token:
+        token.upgrade_lookup_key(raw_key)
+
+    return token
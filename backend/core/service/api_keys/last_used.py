@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.utils import timezone
+
+from backend.core.api.public import APIAuthToken
+
+logger = logging.getLogger(__name__)
+
+
+class LastUsedBuffer:
+    """
+    Coalesces APIAuthToken.last_used writes in memory and flushes them with a single bulk_update
+    (one UPDATE ... CASE) at most once every `flush_interval` seconds, instead of a row write per request.
+
+    last_used is therefore accurate to within `flush_interval` seconds. The first record after a flush starts a daemon
+    timer, so pending timestamps are written even when no further request arrives. An interval of 0 writes through immediately.
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._pending: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._timer: threading.Timer | None = None
+
+    def record(self, token_id: int, used_at: datetime | None = None) -> None:
+        used_at = used_at or timezone.now()
+
+        with self._lock:
+            self._merge(token_id, used_at)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if not due and self._timer is None:
+                self._start_timer()
+
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Writes every pending timestamp in one bulk update. Returns the number of tokens written.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        tokens = [APIAuthToken(id=token_id, last_used=used_at) for token_id, used_at in pending.items()]
+
+        try:
+            APIAuthToken.objects.bulk_update(tokens, ["last_used"], batch_size=500)
+        except DatabaseError:
+            logger.exception("Failed to flush API key last_used timestamps, they will be retried on the next flush")
+            with self._lock:
+                for token_id, used_at in pending.items():
+                    self._merge(token_id, used_at)
+            return 0
+
+        return len(tokens)
+
+    def _start_timer(self) -> None:
+        # must be called with the lock held
+        self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_from_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush API key last_used timestamps from the timer")
+        finally:
+            # the timer thread's own connection, Django only closes connections at the end of a request
+            connection.close()
+
+    def _merge(self, token_id: int, used_at: datetime) -> None:
+        # keeps the newest timestamp per token, must be called with the lock held
+        if (current := self._pending.get(token_id)) is None or current < used_at:
+            self._pending[token_id] = used_at
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+last_used_buffer = LastUsedBuffer(flush_interval=settings.API_KEY_LAST_USED_FLUSH_INTERVAL)
+
+
+def record_api_key_use(token: APIAuthToken) -> None:
+    """
+    Write-behind replacement for token.update_last_used() on hot request paths.
+    """
+    last_used_buffer.record(token.pk)
+
+
+@atexit.register
+def _flush_on_exit() -> None:
+    try:
+        last_used_buffer.flush()
+    except Exception:  # the database may already be gone during interpreter shutdown
+        pass
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory
+
+from backend.core.api.public import APIAuthToken
+from backend.core.api.public.authentication import CustomBearerAuthentication
+from backend.core.service.api_keys import cache as api_key_cache
+from backend.core.service.api_keys.cache import get_verified_api_key, clear_local_api_key_cache
+from backend.core.service.api_keys.delete import delete_api_key
+from backend.models import User, Organization
+
+
+class VerifiedAPIKeyCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_local_api_key_cache()
+        self.user = User.objects.create_user(username="apicache", email="apicache@example.com", password="password")
+        self.token = APIAuthToken(user=self.user, name="key", scopes=["invoices:read"])
+        self.raw_key = self.token.generate_key()
+        self.token.save()
+
+    def test_cache_hit_makes_no_queries(self):
+        get_verified_api_key(self.raw_key)
+
+        with self.assertNumQueries(0):
+            token = get_verified_api_key(self.raw_key)
+            self.assertEqual(token.pk, self.token.pk)
+            self.assertEqual(token.scopes, ["invoices:read"])
+            self.assertEqual(token.user.pk, self.user.pk)
+            self.assertIsNone(token.organization)
+
+    def test_shared_cache_hit_without_local_entry(self):
+        get_verified_api_key(self.raw_key)
+        clear_local_api_key_cache()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_verified_api_key(self.raw_key).pk, self.token.pk)
+
+    def test_authentication_on_cache_hit_makes_no_queries(self):
+        auth = CustomBearerAuthentication()
+        auth.authenticate_credentials(self.raw_key)
+
+        with self.assertNumQueries(0):
+            owner, token = auth.authenticate_credentials(self.raw_key)
+
+        self.assertIsInstance(owner, User)
+        self.assertEqual(owner.pk, self.user.pk)
+
+    def test_organization_owner(self):
+        team = Organization.objects.create(name="Cache Team", leader=self.user)
+        token = APIAuthToken(organization=team, name="team key")
+        raw_key = token.generate_key()
+        token.save()
+
+        get_verified_api_key(raw_key)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_verified_api_key(raw_key).organization.pk, team.pk)
+
+    def test_deactivate_invalidates(self):
+        get_verified_api_key(self.raw_key)
+
+        self.token.deactivate()
+
+        self.assertIsNone(get_verified_api_key(self.raw_key))
+
+    def test_delete_service_invalidates(self):
+        get_verified_api_key(self.raw_key)
+
+        request = RequestFactory().delete("/")
+        request.user = self.user
+        self.assertTrue(delete_api_key(request, self.user, self.token))
+
+        self.assertIsNone(get_verified_api_key(self.raw_key))
+
+    def test_revocation_on_another_worker_invalidates_local_entries(self):
+        get_verified_api_key(self.raw_key)
+
+        # the other worker invalidates through its own LRU, leaving this worker's entry in place
+        with mock.patch.object(api_key_cache, "_local_cache", api_key_cache._LocalLRU(maxsize=8, ttl=60)):
+            self.token.deactivate()
+
+        self.assertIsNone(get_verified_api_key(self.raw_key))
+
+    def test_local_hit_survives_unrelated_lookups(self):
+        get_verified_api_key(self.raw_key)
+
+        with mock.patch.object(api_key_cache.cache, "get", wraps=api_key_cache.cache.get) as shared_get:
+            self.assertEqual(get_verified_api_key(self.raw_key).pk, self.token.pk)
+
+        shared_get.assert_called_once_with(api_key_cache.GENERATION_CACHE_KEY)
+
+    def test_scope_change_invalidates(self):
+        get_verified_api_key(self.raw_key)
+
+        self.token.scopes = ["invoices:read", "invoices:write"]
+        self.token.save()
+
+        self.assertEqual(get_verified_api_key(self.raw_key).scopes, ["invoices:read", "invoices:write"])
+
+    def test_filters_apply_to_cached_keys(self):
+        get_verified_api_key(self.raw_key)
+
+        self.assertIsNone(
+            get_verified_api_key(self.raw_key, administrator_service_type=APIAuthToken.AdministratorServiceTypes.AWS_WEBHOOK_CALLBACK)
+        )
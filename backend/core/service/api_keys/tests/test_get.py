@@ -0,0 +1,58 @@
+from django.test import TestCase
+
+from backend.core.api.public import APIAuthToken
+from backend.core.service.api_keys.get import get_api_key_by_raw_key
+from backend.models import User
+
+
+class GetAPIKeyByRawKeyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="apikeys", email="apikeys@example.com", password="password")
+
+    def create_token(self, **kwargs) -> tuple[APIAuthToken, str]:
+        token = APIAuthToken(user=self.user, name="key", **kwargs)
+        raw_key = token.generate_key()
+        token.save()
+        return token, raw_key
+
+    def test_new_keys_only_store_lookup_digest(self):
+        token, raw_key = self.create_token()
+
+        self.assertIsNone(token.hashed_key)
+        self.assertEqual(token.lookup_key, APIAuthToken.digest_raw_key(raw_key))
+        self.assertTrue(token.verify(raw_key))
+        self.assertFalse(token.verify("wrong"))
+
+    def test_lookup_by_raw_key(self):
+        token, raw_key = self.create_token()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_api_key_by_raw_key(raw_key), token)
+
+    def test_invalid_or_inactive_key_not_found(self):
+        token, raw_key = self.create_token()
+
+        self.assertIsNone(get_api_key_by_raw_key("not-a-key"))
+
+        token.deactivate()
+        self.assertIsNone(get_api_key_by_raw_key(raw_key))
+
+    def test_extra_filters_are_applied(self):
+        token, raw_key = self.create_token()
+
+        self.assertIsNone(
+            get_api_key_by_raw_key(raw_key, administrator_service_type=APIAuthToken.AdministratorServiceTypes.AWS_WEBHOOK_CALLBACK)
+        )
+
+    def test_legacy_key_is_upgraded_on_first_use(self):
+        raw_key = "legacy-raw-key"
+        token = APIAuthToken.objects.create(user=self.user, name="legacy", hashed_key=APIAuthToken.hash_raw_key(raw_key))
+
+        self.assertEqual(get_api_key_by_raw_key(raw_key), token)
+
+        token.refresh_from_db()
+        self.assertIsNone(token.hashed_key)
+        self.assertEqual(token.lookup_key, APIAuthToken.digest_raw_key(raw_key))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_api_key_by_raw_key(raw_key), token)
@@ -0,0 +1,74 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.core.api.public import APIAuthToken
+from backend.core.service.api_keys import last_used
+from backend.core.service.api_keys.last_used import LastUsedBuffer
+from backend.models import User
+
+
+class LastUsedBufferTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="lastused", email="lastused@example.com", password="password")
+        self.tokens = [APIAuthToken.objects.create(user=self.user, name=f"key {i}", lookup_key=str(i)) for i in range(3)]
+
+    def test_records_are_buffered_until_flush(self):
+        buffer = LastUsedBuffer(flush_interval=60)
+
+        with self.assertNumQueries(0):
+            for token in self.tokens:
+                buffer.record(token.pk)
+
+        self.assertEqual(buffer.pending_count(), 3)
+        self.assertFalse(APIAuthToken.objects.filter(last_used__isnull=False).exists())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 3)
+
+        self.assertEqual(APIAuthToken.objects.filter(last_used__isnull=False).count(), 3)
+        self.assertEqual(buffer.pending_count(), 0)
+
+    def test_keeps_newest_timestamp_per_token(self):
+        buffer = LastUsedBuffer(flush_interval=60)
+        now = timezone.now()
+
+        buffer.record(self.tokens[0].pk, now)
+        buffer.record(self.tokens[0].pk, now - timedelta(seconds=30))
+        buffer.flush()
+
+        self.tokens[0].refresh_from_db()
+        self.assertEqual(self.tokens[0].last_used, now)
+
+    def test_zero_interval_writes_through(self):
+        buffer = LastUsedBuffer(flush_interval=0)
+
+        buffer.record(self.tokens[1].pk)
+
+        self.assertEqual(buffer.pending_count(), 0)
+        self.tokens[1].refresh_from_db()
+        self.assertIsNotNone(self.tokens[1].last_used)
+
+    @mock.patch.object(last_used, "connection")
+    @mock.patch.object(last_used.threading, "Timer")
+    def test_timer_flushes_without_another_request(self, timer, connection):
+        buffer = LastUsedBuffer(flush_interval=60)
+
+        for token in self.tokens:
+            buffer.record(token.pk)
+
+        timer.assert_called_once_with(60, buffer._flush_from_timer)
+        self.assertTrue(timer.return_value.daemon)
+        timer.return_value.start.assert_called_once_with()
+
+        # what the timer runs once the interval has passed
+        timer.call_args.args[1]()
+
+        self.assertEqual(APIAuthToken.objects.filter(last_used__isnull=False).count(), 3)
+        self.assertEqual(buffer.pending_count(), 0)
+        connection.close.assert_called_once_with()
+
+        buffer.record(self.tokens[0].pk)
+        self.assertEqual(timer.call_count, 2)
@@ -5,6 +5,7 @@ import threading
 import boto3
 import inspect
 
+from django.db import connection
 from django.urls import reverse
 
 
@@ -46,6 +47,28 @@ class Task:
 
         return "Task submitted to SQS"
 
+    def queue_background_task(self, func, *args, **kwargs):
+        """
+        Like queue_task, but without SQS the function runs in a daemon thread instead of before the caller returns.
+        For work a request shouldn't wait on; the thread doesn't outlive the process, so anything that must survive
+        a restart needs SQS.
+        """
+        if self.queue_url and self.region_name:
+            return self.queue_task(func, *args, **kwargs)
+
+        func_name = func if isinstance(func, str) else self._get_function_path(func)
+        threading.Thread(target=self._execute_in_thread, args=(func_name, args, kwargs), daemon=True).start()
+        return "Task started in a background thread"
+
+    def _execute_in_thread(self, func_name, args, kwargs):
+        try:
+            self.execute_now(func_name, *args, **kwargs)
+        except Exception as e:
+            print(f"Error running background task {func_name}: {str(e)}")
+        finally:
+            # the thread's own connection, Django only closes connections at the end of a request
+            connection.close()
+
     def _send_message(self, func_name, args, kwargs):
         message_body = {"func_name": func_name, "args": args, "kwargs": kwargs, "webhook_url": self.WEBHOOK_URL}
         print(message_body)
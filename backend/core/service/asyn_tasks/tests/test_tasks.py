@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from backend.core.service.asyn_tasks import tasks
+from backend.core.service.asyn_tasks.tasks import Task
+
+calls: list[tuple] = []
+
+
+def record_call(*args, **kwargs):
+    calls.append((args, kwargs))
+
+
+def fail():
+    raise RuntimeError("task failed")
+
+
+@mock.patch.object(tasks, "connection")
+@mock.patch.dict(tasks.os.environ, {"AWS_SQS_QUEUE_URL": ""})
+class QueueBackgroundTaskTests(SimpleTestCase):
+    def setUp(self):
+        calls.clear()
+
+    @mock.patch.object(tasks.threading, "Thread")
+    def test_runs_in_a_daemon_thread_without_sqs(self, thread, connection):
+        Task().queue_background_task(record_call, 1, key="value")
+
+        self.assertEqual(calls, [])
+        self.assertTrue(thread.call_args.kwargs["daemon"])
+        thread.return_value.start.assert_called_once_with()
+
+        # what the thread runs
+        thread.call_args.kwargs["target"](*thread.call_args.kwargs["args"])
+        self.assertEqual(calls, [((1,), {"key": "value"})])
+        connection.close.assert_called_once_with()
+
+    @mock.patch.object(tasks.threading, "Thread")
+    def test_failures_still_close_the_connection(self, thread, connection):
+        Task().queue_background_task(fail)
+
+        thread.call_args.kwargs["target"](*thread.call_args.kwargs["args"])
+
+        connection.close.assert_called_once_with()
+
+    @mock.patch.object(Task, "queue_task")
+    def test_sent_to_sqs_when_configured(self, queue_task, connection):
+        with mock.patch.dict(tasks.os.environ, {"AWS_SQS_QUEUE_URL": "https://sqs.example/queue", "AWS_REGION_NAME": "eu-west-2"}):
+            with mock.patch.object(tasks.boto3, "client"):
+                Task().queue_background_task(record_call, 1)
+
+        queue_task.assert_called_once_with(record_call, 1)
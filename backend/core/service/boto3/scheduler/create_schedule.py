@@ -1,8 +1,10 @@
 import datetime
 import json
 import logging
+from typing import Any
 from uuid import uuid4, UUID
 
+from botocore.exceptions import BotoCoreError, ClientError
 from django.urls import reverse
 
 from backend.finance.models import InvoiceRecurringProfile
@@ -13,37 +15,10 @@ from settings.helpers import get_var
 logger = logging.getLogger(__name__)
 
 
-def create_boto_schedule(instance_id: int | str | InvoiceRecurringProfile):
-    print("TASK 7 - View logic")
-    instance: InvoiceRecurringProfile
-
-    if isinstance(instance_id, int | str):
-        try:
-            instance = InvoiceRecurringProfile.objects.get(id=instance_id, active=True)
-        except InvoiceRecurringProfile.DoesNotExist:
-            logger.error(f"InvoiceRecurringProfile with id {instance_id} does not exist.")
-            return None
-    elif isinstance(instance_id, InvoiceRecurringProfile):
-        instance = instance_id
-    else:
-        logger.error(f"Invalid instance type: {type(instance_id)}")
-        return None
-
-    if not BOTO3_HANDLER.initiated:
-        instance.status = "paused"
-        instance.save()
-        logger.error(f'BOTO3 IS CURRENTLY DOWN, #{instance_id} has been set to "Paused"!')
-        return None
-
-    schedule_uuid: str
-
-    if isinstance(instance.boto_schedule_uuid, str):
-        schedule_uuid = instance.boto_schedule_uuid
-    elif isinstance(instance.boto_schedule_uuid, UUID):
-        schedule_uuid = str(instance.boto_schedule_uuid)
-    else:
-        schedule_uuid = str(uuid4())
-
+def build_schedule_params(instance: InvoiceRecurringProfile, schedule_uuid: str, group_name: str) -> dict[str, Any] | None:
+    """
+    The CreateSchedule parameters the profile's schedule should have, None if its frequency can't be scheduled
+    """
     CRON_FREQUENCY_TYPE = instance.frequency.lower()
     CRON_RESPONSE: CronServiceResponse
 
@@ -61,8 +36,6 @@ def create_boto_schedule(instance_id: int | str | InvoiceRecurringProfile):
         logger.error(f"Error getting cron expression: {CRON_RESPONSE.error}")
         return None
 
-    EXCEPTIONS = BOTO3_HANDLER._schedule_client.exceptions
-
     SITE_URL = get_var("SITE_URL") + reverse("webhooks:receive_recurring_invoices")
 
     end_date: datetime.date | None = instance.end_date
@@ -70,13 +43,16 @@ def create_boto_schedule(instance_id: int | str | InvoiceRecurringProfile):
 
     create_schedule_params = {
         "Name": schedule_uuid,
-        "GroupName": BOTO3_HANDLER.scheduler_invoices_group_name,
+        "GroupName": group_name,
         "FlexibleTimeWindow": {"Mode": "OFF"},
         "ScheduleExpression": f"cron({CRON_RESPONSE.response})",
         "Target": {
             "Arn": BOTO3_HANDLER.scheduler_lambda_arn,
             "RoleArn": BOTO3_HANDLER.scheduler_lambda_access_role_arn,
-            "Input": json.dumps({"invoice_profile_id": instance.id, "endpoint_url": f"{SITE_URL}"}),
+            # scheduled-time is the same on every retry of a run, so the webhook can tell retries apart from new periods
+            "Input": json.dumps(
+                {"invoice_profile_id": instance.id, "endpoint_url": f"{SITE_URL}", "scheduled_time": "<aws.scheduler.scheduled-time>"}
+            ),
             "RetryPolicy": {"MaximumRetryAttempts": 20, "MaximumEventAgeInSeconds": 21600},  # 6 hours
         },
         "ActionAfterCompletion": "NONE",
@@ -86,15 +62,53 @@ def create_boto_schedule(instance_id: int | str | InvoiceRecurringProfile):
     if not end_datetime:
         del create_schedule_params["EndDate"]
 
+    return create_schedule_params
+
+
+def create_boto_schedule(instance_id: int | str | InvoiceRecurringProfile, client=None, group_name: str | None = None):
+    """
+    Creates the profile's schedule, with the given scheduler client (the handler's by default)
+    """
+    print("TASK 7 - View logic")
+    instance: InvoiceRecurringProfile
+
+    if isinstance(instance_id, int | str):
+        try:
+            instance = InvoiceRecurringProfile.objects.get(id=instance_id, active=True)
+        except InvoiceRecurringProfile.DoesNotExist:
+            logger.error(f"InvoiceRecurringProfile with id {instance_id} does not exist.")
+            return None
+    elif isinstance(instance_id, InvoiceRecurringProfile):
+        instance = instance_id
+    else:
+        logger.error(f"Invalid instance type: {type(instance_id)}")
+        return None
+
+    if client is None:
+        if not BOTO3_HANDLER.initiated:
+            instance.status = "paused"
+            instance.save()
+            logger.error(f'BOTO3 IS CURRENTLY DOWN, #{instance_id} has been set to "Paused"!')
+            return None
+        client = BOTO3_HANDLER._schedule_client
+
+    schedule_uuid: str
+
+    if isinstance(instance.boto_schedule_uuid, str):
+        schedule_uuid = instance.boto_schedule_uuid
+    elif isinstance(instance.boto_schedule_uuid, UUID):
+        schedule_uuid = str(instance.boto_schedule_uuid)
+    else:
+        schedule_uuid = str(uuid4())
+
+    if not (
+        create_schedule_params := build_schedule_params(instance, schedule_uuid, group_name or BOTO3_HANDLER.scheduler_invoices_group_name)
+    ):
+        return None
+
     try:
-        boto_response = BOTO3_HANDLER._schedule_client.create_schedule(**create_schedule_params)
-    except (
-        EXCEPTIONS.ServiceQuotaExceededException,
-        EXCEPTIONS.ValidationException,
-        EXCEPTIONS.InternalServerException,
-        EXCEPTIONS.ConflictException,
-        EXCEPTIONS.ResourceNotFoundException,
-    ) as error:
+        boto_response = client.create_schedule(**create_schedule_params)
+    except (BotoCoreError, ClientError) as error:
         logger.error(f"Error creating schedule for inv set #{instance.id}: {error}")
         return None
 
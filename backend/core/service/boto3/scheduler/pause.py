@@ -5,6 +5,7 @@ from mypy_boto3_scheduler.type_defs import UpdateScheduleOutputTypeDef
 from backend.core.service.boto3.handler import BOTO3_HANDLER
 from backend.core.service.boto3.scheduler.get import get_boto_schedule
 from backend.core.utils.dataclasses import BaseServiceResponse
+from backend.finance.models import InvoiceRecurringProfile
 
 logger = logging.getLogger(__name__)
 
@@ -38,3 +39,19 @@ def pause_boto_schedule(name: str, pause: bool = True) -> bool:
     ):
         return False
         # return PauseScheduleServiceResponse(False, error_message="Schedule not found").asdict()
+
+
+def pause_recurring_schedule(profile_id: int, pause: bool = True) -> bool:
+    """
+    Pauses or resumes a profile's schedule, recording the outcome on the profile for its dashboard to pick up
+    """
+    if not (profile := InvoiceRecurringProfile.objects.filter(pk=profile_id).first()):
+        return False
+
+    updated = bool(profile.boto_schedule_uuid) and pause_boto_schedule(str(profile.boto_schedule_uuid), pause=pause)
+
+    profile.boto_schedule_status = (
+        InvoiceRecurringProfile.BotoStatusTypes.COMPLETED if updated else InvoiceRecurringProfile.BotoStatusTypes.FAILED
+    )
+    profile.save(update_fields=["boto_schedule_status"])
+    return updated
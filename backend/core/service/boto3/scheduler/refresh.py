@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import uuid4
+
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+from backend.core.service.boto3.handler import BOTO3_HANDLER
+from backend.core.service.boto3.scheduler.create_schedule import build_schedule_params
+from backend.finance.models import InvoiceRecurringProfile
+
+logger = logging.getLogger(__name__)
+
+# keys of a GetSchedule response that UpdateSchedule doesn't accept
+READ_ONLY_SCHEDULE_KEYS = ["ResponseMetadata", "Arn", "CreationDate", "LastModificationDate"]
+
+
+class RateLimiter:
+    """
+    Spaces calls at least 1/rate seconds apart, across every thread sharing it. A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self.calls = 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            self.calls += 1
+        if start > now:
+            time.sleep(start - now)
+
+
+@dataclass
+class ScheduleRefreshSummary:
+    profiles: int = 0
+    in_sync: int = 0
+    updated: int = 0
+    created: int = 0
+    failed: list[int] = field(default_factory=list)  # profile ids
+    orphaned: list[str] = field(default_factory=list)  # schedule names without an active profile
+    api_calls: int = 0
+    seconds: float = 0.0
+
+    def __str__(self):
+        return (
+            f"{self.profiles} profiles: {self.in_sync} in sync, {self.updated} updated, {self.created} created, "
+            f"{len(self.failed)} failed, {len(self.orphaned)} orphaned schedules ({self.api_calls} API calls in {self.seconds:.1f}s)"
+        )
+
+
+def list_boto_schedules(client, group_name: str, limiter: RateLimiter) -> Iterator[dict[str, Any]]:
+    """
+    Every schedule summary (Name, State, Arn...) in the group, a ListSchedules page at a time
+    """
+    kwargs: dict[str, Any] = {"GroupName": group_name, "MaxResults": 100}
+    while True:
+        limiter.wait()
+        page = client.list_schedules(**kwargs)
+        yield from page.get("Schedules", [])
+        if not (next_token := page.get("NextToken")):
+            return
+        kwargs["NextToken"] = next_token
+
+
+def _schedule_changes(schedule: dict[str, Any], expected: dict[str, Any]) -> dict[str, Any]:
+    """
+    What a GetSchedule response needs changed to match the expected state, cron expression, end date and target
+    input. End dates are compared by day, the time of day is whenever the schedule was created.
+    """
+    changes: dict[str, Any] = {}
+
+    for key in ("State", "ScheduleExpression"):
+        if schedule.get(key) != expected[key]:
+            changes[key] = expected[key]
+
+    target = schedule.get("Target") or {}
+    if target.get("Input") != expected["Target"]["Input"]:
+        changes["Target"] = {**expected["Target"], **target, "Input": expected["Target"]["Input"]}
+
+    end_date, expected_end_date = schedule.get("EndDate"), expected.get("EndDate")
+    if (end_date.date() if end_date else None) != (expected_end_date.date() if expected_end_date else None):
+        changes["EndDate"] = expected_end_date
+
+    return changes
+
+
+def _reconcile_schedule(client, limiter: RateLimiter, expected: dict[str, Any]) -> bool | None:
+    """
+    Updates the schedule to the expected one if it drifted: True once updated, None if it already matched, False on failure
+    """
+    name = expected["Name"]
+    try:
+        limiter.wait()
+        schedule = client.get_schedule(Name=name, GroupName=expected["GroupName"])
+        if not (changes := _schedule_changes(schedule, expected)):
+            return None
+
+        params = {k: v for k, v in schedule.items() if k not in READ_ONLY_SCHEDULE_KEYS} | changes
+        if params.get("EndDate") is None:
+            # UpdateSchedule replaces the whole schedule, so leaving it out removes the end date
+            params.pop("EndDate", None)
+
+        limiter.wait()
+        client.update_schedule(**params)
+        return True
+    except (BotoCoreError, ClientError) as error:
+        logger.error(f"Failed to update schedule {name}: {error}")
+        return False
+
+
+def _create_schedule(client, limiter: RateLimiter, expected: dict[str, Any]) -> str | None:
+    """
+    Creates a missing schedule: its ARN, None on failure
+    """
+    try:
+        limiter.wait()
+        return client.create_schedule(**expected).get("ScheduleArn")
+    except (BotoCoreError, ClientError) as error:
+        logger.error(f"Failed to create schedule {expected['Name']}: {error}")
+        return None
+
+
+def _expected_state(profile: InvoiceRecurringProfile) -> str:
+    return "ENABLED" if profile.status == "ongoing" else "DISABLED"
+
+
+def _chunks(profiles, size: int) -> Iterator[list[InvoiceRecurringProfile]]:
+    chunk: list[InvoiceRecurringProfile] = []
+    for profile in profiles.iterator(chunk_size=size):
+        chunk.append(profile)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def refresh_schedules(
+    client=None,
+    group_name: str | None = None,
+    workers: int | None = None,
+    rate: float | None = None,
+    chunk_size: int = 500,
+    full: bool = False,
+) -> ScheduleRefreshSummary:
+    """
+    Reconciles the scheduler with the database, which is the source of truth for each profile's schedule.
+    Schedules are read in bulk with ListSchedules, which only returns their state. So by default only schedules in
+    the wrong state are fetched, and brought back in line with the profile (state, cron expression, end date and
+    target input). full=True fetches every schedule to catch the other drift too, one more call per schedule; it's
+    also how schedules created before a target input change get the new input.
+    Updates go through a bounded thread pool, missing schedules are created one at a time in the profile's state
+    (a paused profile gets a disabled schedule, its status is left alone). Every call is rate limited.
+    """
+    summary = ScheduleRefreshSummary()
+    started = time.monotonic()
+
+    if client is None:
+        if not BOTO3_HANDLER.initiated:
+            logger.error("Boto3 handler not initiated. Cannot refresh schedules.")
+            return summary
+        client = BOTO3_HANDLER._schedule_client
+    group_name = group_name or BOTO3_HANDLER.scheduler_invoices_group_name
+    workers = workers or settings.SCHEDULE_REFRESH_WORKERS
+    limiter = RateLimiter(settings.SCHEDULE_REFRESH_RATE if rate is None else rate)
+
+    remote = {schedule["Name"]: schedule for schedule in list_boto_schedules(client, group_name, limiter)}
+    seen: set[str] = set()
+
+    profiles = InvoiceRecurringProfile.objects.filter(active=True).order_by("pk")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk in _chunks(profiles, chunk_size):
+            summary.profiles += len(chunk)
+            to_reconcile: list[tuple[InvoiceRecurringProfile, dict[str, Any]]] = []
+            missing: list[InvoiceRecurringProfile] = []
+            # profiles whose schedule ARN (and for created schedules, name) changed
+            moved_arns: list[InvoiceRecurringProfile] = []
+
+            for profile in chunk:
+                name = str(profile.boto_schedule_uuid) if profile.boto_schedule_uuid else None
+                if not name or not (schedule := remote.get(name)):
+                    missing.append(profile)
+                    continue
+
+                seen.add(name)
+                if profile.boto_schedule_arn != schedule["Arn"]:
+                    profile.boto_schedule_arn = schedule["Arn"]
+                    moved_arns.append(profile)
+
+                state = _expected_state(profile)
+                if schedule["State"] == state and not full:
+                    summary.in_sync += 1
+                elif expected := build_schedule_params(profile, name, group_name):
+                    to_reconcile.append((profile, expected | {"State": state}))
+                else:
+                    summary.failed.append(profile.pk)
+
+            # workers only call the API; the database is written from this thread
+            results = executor.map(lambda change: _reconcile_schedule(client, limiter, change[1]), to_reconcile)
+            for (profile, _), updated in zip(to_reconcile, results):
+                if updated is None:
+                    summary.in_sync += 1
+                elif updated:
+                    summary.updated += 1
+                else:
+                    summary.failed.append(profile.pk)
+
+            for profile in missing:
+                name = str(profile.boto_schedule_uuid or uuid4())
+                if (expected := build_schedule_params(profile, name, group_name)) and (
+                    arn := _create_schedule(client, limiter, expected | {"State": _expected_state(profile)})
+                ):
+                    profile.boto_schedule_uuid, profile.boto_schedule_arn = name, arn
+                    moved_arns.append(profile)
+                    summary.created += 1
+                else:
+                    summary.failed.append(profile.pk)
+
+            # one query per chunk, without each profile's save signals (which would call AWS again, outside the limiter)
+            InvoiceRecurringProfile.objects.bulk_update(moved_arns, ["boto_schedule_arn", "boto_schedule_uuid"])
+
+    summary.orphaned = sorted(remote.keys() - seen)
+    summary.api_calls = limiter.calls
+    summary.seconds = time.monotonic() - started
+    logger.info(f"Refreshed schedules: {summary}")
+    return summary
@@ -0,0 +1,188 @@
+import json
+from datetime import date, datetime
+from unittest import mock
+from uuid import uuid4
+
+from botocore.exceptions import ClientError
+from django.db.models.signals import post_save
+from django.test import TestCase
+from model_bakery import baker
+
+from backend.core.service.boto3.scheduler import refresh
+from backend.core.service.boto3.scheduler.create_schedule import build_schedule_params
+from backend.core.service.boto3.scheduler.refresh import RateLimiter, refresh_schedules
+from backend.models import InvoiceRecurringProfile, User
+
+GROUP = "invoices"
+
+
+class StubSchedulerClient:
+    """
+    In-memory stand in for the AWS Scheduler client, paginating list_schedules like the real API
+    """
+
+    def __init__(self, page_size: int = 2):
+        self.schedules: dict[str, dict] = {}
+        self.page_size = page_size
+        self.calls: list[str] = []
+        self.failing: set[str] = set()
+
+    def add(self, Name: str, State: str = "ENABLED", Arn: str | None = None, **schedule) -> None:
+        self.schedules[Name] = {"GroupName": GROUP, **schedule, "Name": Name, "State": State, "Arn": Arn or f"arn:{Name}"}
+
+    def list_schedules(self, GroupName, MaxResults, NextToken=None):
+        self.calls.append("list_schedules")
+        names = sorted(self.schedules)
+        start = int(NextToken or 0)
+        page = {
+            "Schedules": [
+                {key: self.schedules[name][key] for key in ("Name", "GroupName", "State", "Arn")}
+                for name in names[start : start + self.page_size]
+            ]
+        }
+        if start + self.page_size < len(names):
+            page["NextToken"] = str(start + self.page_size)
+        return page
+
+    def get_schedule(self, Name, GroupName):
+        self.calls.append("get_schedule")
+        return self.schedules[Name] | {"ResponseMetadata": {}}
+
+    def update_schedule(self, **kwargs):
+        self.calls.append("update_schedule")
+        if kwargs["Name"] in self.failing:
+            raise ClientError({"Error": {"Code": "InternalServerException", "Message": "down"}}, "UpdateSchedule")
+        self.schedules[kwargs["Name"]] = kwargs | {"Arn": self.schedules[kwargs["Name"]]["Arn"]}
+        return {"ScheduleArn": self.schedules[kwargs["Name"]]["Arn"]}
+
+    def create_schedule(self, **kwargs):
+        self.calls.append("create_schedule")
+        self.add(**kwargs | {"State": kwargs.get("State", "ENABLED")})
+        return {"ScheduleArn": self.schedules[kwargs["Name"]]["Arn"]}
+
+
+class RefreshSchedulesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+        self.scheduler = StubSchedulerClient()
+
+    def make_profile(self, status: str = "ongoing", remote_state: str | None = "ENABLED", **kwargs) -> InvoiceRecurringProfile:
+        kwargs = {"frequency": "monthly", "day_of_month": 1, "end_date": None, **kwargs}
+        profile = baker.make(InvoiceRecurringProfile, user=self.user, vat_number=None, logo=None)
+        # set without signals, which would try to schedule it on AWS
+        InvoiceRecurringProfile.objects.filter(pk=profile.pk).update(
+            status=status, boto_schedule_uuid=uuid4(), boto_schedule_arn=None, **kwargs
+        )
+        profile.refresh_from_db()
+        if remote_state:
+            expected = build_schedule_params(profile, str(profile.boto_schedule_uuid), GROUP)
+            self.scheduler.add(**expected | {"State": remote_state})
+        return profile
+
+    def refresh(self, **kwargs):
+        return refresh_schedules(self.scheduler, **{"group_name": GROUP, "workers": 2, "rate": 0, **kwargs})
+
+    def test_in_sync_schedules_only_cost_the_listing(self):
+        for _ in range(5):
+            self.make_profile()
+
+        summary = self.refresh()
+
+        self.assertEqual((summary.profiles, summary.in_sync, summary.updated), (5, 5, 0))
+        self.assertEqual(self.scheduler.calls, ["list_schedules"] * 3)
+        self.assertEqual(summary.api_calls, 3)
+
+    def test_out_of_sync_states_follow_the_database(self):
+        paused = self.make_profile(status="paused", remote_state="ENABLED")
+        resumed = self.make_profile(status="ongoing", remote_state="DISABLED")
+
+        summary = self.refresh(chunk_size=1)
+
+        self.assertEqual(summary.updated, 2)
+        self.assertEqual(self.scheduler.schedules[str(paused.boto_schedule_uuid)]["State"], "DISABLED")
+        self.assertEqual(self.scheduler.schedules[str(resumed.boto_schedule_uuid)]["State"], "ENABLED")
+
+    def test_missing_schedules_are_created_and_orphans_reported(self):
+        missing = self.make_profile(remote_state=None)
+        self.scheduler.add("orphan")
+
+        summary = self.refresh()
+
+        self.assertEqual((summary.created, summary.orphaned), (1, ["orphan"]))
+        created = self.scheduler.schedules[str(missing.boto_schedule_uuid)]
+        self.assertEqual((created["GroupName"], created["ScheduleExpression"]), (GROUP, "cron(0 7 1 * ? *)"))
+        missing.refresh_from_db()
+        self.assertEqual(missing.boto_schedule_arn, f"arn:{missing.boto_schedule_uuid}")
+
+    def test_missing_schedules_of_paused_profiles_are_created_disabled(self):
+        paused = self.make_profile(status="paused", remote_state=None)
+        InvoiceRecurringProfile.objects.filter(pk=paused.pk).update(boto_schedule_uuid=None)
+
+        saved = mock.Mock()
+        post_save.connect(saved, sender=InvoiceRecurringProfile, weak=False)
+        self.addCleanup(post_save.disconnect, saved, sender=InvoiceRecurringProfile)
+
+        summary = self.refresh()
+
+        paused.refresh_from_db()
+        self.assertEqual((summary.created, paused.status), (1, "paused"))
+        self.assertEqual(self.scheduler.schedules[str(paused.boto_schedule_uuid)]["State"], "DISABLED")
+        self.assertEqual(self.scheduler.calls, ["list_schedules", "create_schedule"])
+        saved.assert_not_called()
+
+    def test_failures_are_summarised(self):
+        failing = self.make_profile(status="paused")
+        self.scheduler.failing.add(str(failing.boto_schedule_uuid))
+        self.make_profile()
+
+        summary = self.refresh()
+
+        self.assertEqual((summary.failed, summary.in_sync), ([failing.pk], 1))
+
+    def test_arns_are_stored(self):
+        profile = self.make_profile()
+
+        self.refresh()
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.boto_schedule_arn, f"arn:{profile.boto_schedule_uuid}")
+
+    def test_schedules_fetched_for_their_state_are_fully_reconciled(self):
+        paused = self.make_profile(status="paused", end_date=date(2030, 6, 1))
+        name = str(paused.boto_schedule_uuid)
+        self.scheduler.schedules[name].update(ScheduleExpression="cron(0 0 9 * ? *)", Target={"Arn": "arn:lambda", "Input": "{}"})
+        del self.scheduler.schedules[name]["EndDate"]
+
+        summary = self.refresh()
+
+        schedule = self.scheduler.schedules[name]
+        self.assertEqual(summary.updated, 1)
+        self.assertEqual((schedule["State"], schedule["ScheduleExpression"]), ("DISABLED", "cron(0 7 1 * ? *)"))
+        self.assertEqual(schedule["EndDate"].date(), date(2030, 6, 1))
+        self.assertEqual(schedule["Target"]["Arn"], "arn:lambda")
+        self.assertIn("scheduled_time", json.loads(schedule["Target"]["Input"]))
+
+    def test_full_refresh_finds_drift_in_schedules_in_the_right_state(self):
+        drifted = self.make_profile()
+        self.make_profile()
+        self.scheduler.schedules[str(drifted.boto_schedule_uuid)]["EndDate"] = datetime(2025, 1, 1, 9)
+
+        self.assertEqual(self.refresh().in_sync, 2)
+
+        summary = self.refresh(full=True)
+
+        self.assertEqual((summary.in_sync, summary.updated), (1, 1))
+        self.assertNotIn("EndDate", self.scheduler.schedules[str(drifted.boto_schedule_uuid)])
+
+
+class RateLimiterTests(TestCase):
+    @mock.patch.object(refresh.time, "sleep")
+    @mock.patch.object(refresh.time, "monotonic", return_value=100.0)
+    def test_calls_are_spaced_out(self, monotonic, sleep):
+        limiter = RateLimiter(rate=4)
+
+        for _ in range(3):
+            limiter.wait()
+
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.25, 0.5])
+        self.assertEqual(limiter.calls, 3)
@@ -1,6 +1,7 @@
 from django.db.models import Q, QuerySet
 
-from backend.models import Client, Organization
+from backend.models import Client, Organization, SearchEntry
+from backend.core.service.search.query import MAX_FILTER_RESULTS, search_object_ids
 from backend.core.utils.dataclasses import BaseServiceResponse
 
 
@@ -14,6 +15,21 @@ def fetch_clients(request, *, search_text: str | None = None, team: Organization
         clients = Client.objects.filter(user=request.user, active=True)
 
     if search_text:
-        clients = clients.filter(Q(name__icontains=search_text) | Q(email__icontains=search_text) | Q(id__icontains=search_text))
+        owner = team or request.user
+        clients = clients.filter(id__in=search_object_ids(owner, search_text, SearchEntry.Kinds.CLIENT, limit=MAX_FILTER_RESULTS))
 
     return FetchClientServiceResponse(True, clients)
+
+
+def search_clients(clients: QuerySet[Client], search_text: str, *, prefix: bool = False) -> QuerySet[Client]:
+    """
+    Case-insensitive search over name, email and company (or an exact id). On PostgreSQL both the substring and the
+    prefix lookups are served by the trigram indexes from migration 0073.
+    """
+    lookup = "istartswith" if prefix else "icontains"
+    query = Q(**{f"name__{lookup}": search_text}) | Q(**{f"email__{lookup}": search_text}) | Q(**{f"company__{lookup}": search_text})
+
+    if search_text.isdigit():
+        query |= Q(id=int(search_text))
+
+    return clients.filter(query)
@@ -1,7 +1,7 @@
-from django.db.models import Prefetch, ExpressionWrapper, F, FloatField, Sum, Case, When, Q, Value, CharField, QuerySet
+from django.db.models import F, Sum, Case, When, Value, CharField, QuerySet, OuterRef, Subquery
 from django.utils import timezone
 
-from backend.finance.models import Invoice, InvoiceItem
+from backend.finance.models import Invoice, InvoiceRecurringProfile
 
 
 def should_add_condition(was_previous_selection, has_just_been_selected):
@@ -12,31 +12,23 @@ def get_context(invoices: QuerySet) -> tuple[dict, QuerySet[Invoice]]:
     context: dict = {}
 
     invoices = (
-        invoices.prefetch_related(
-            Prefetch(
-                "items",
-                queryset=InvoiceItem.objects.annotate(
-                    subtotal=ExpressionWrapper(
-                        F("hours") * F("price_per_hour"),
-                        output_field=FloatField(),
-                    ),
-                ),
-            ),
-        )
-        .select_related("client_to", "client_to__user", "user", "organization")
+        invoices.select_related("client_to", "client_to__user", "user", "organization")
         # .only("invoice_id", "id", "payment_status", "date_due", "client_to", "client_name", "user", "organization")
         # .only was causing 100x more queries due to re-fetching extra fields
-        .annotate(
-            subtotal=Sum(F("items__hours") * F("items__price_per_hour")),
-            amount=Case(
-                When(vat_number=True, then=F("subtotal") * 1.2),
-                default=F("subtotal"),
-                output_field=FloatField(),
-            ),
-        )
-        .distinct()  # just an extra precaution
+        # money columns are materialized on the row, so the items are never joined, grouped or prefetched
+        .annotate(amount=F("total"))
     )
 
+    if invoices.model is InvoiceRecurringProfile:
+        invoices = invoices.annotate(
+            generated_total=Subquery(
+                Invoice.objects.filter(invoice_recurring_profile=OuterRef("pk"))
+                .values("invoice_recurring_profile")
+                .annotate(generated_total=Sum("total"))
+                .values("generated_total")[:1]
+            )
+        )
+
     if invoices.model is Invoice:
         invoices = invoices.annotate(
             filterable_dynamic_status=Case(
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Q, QuerySet
+from django.http import QueryDict
+from django.utils import timezone
+
+from backend.core.utils.dataclasses import BaseServiceResponse
+from backend.core.service.search.query import MAX_FILTER_RESULTS, search_object_ids
+from backend.finance.models import Invoice
+from backend.models import Organization, SearchEntry, User
+
+INVOICE_STATUS_FILTERS = ("draft", "pending", "overdue", "paid")
+
+
+class FilterInvoicesServiceResponse(BaseServiceResponse[QuerySet[Invoice]]): ...
+
+
+def _parse_date(params: QueryDict, key: str) -> date | None:
+    if not (value := params.get(key)):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{key} must be a date in the format YYYY-MM-DD")
+
+
+def _parse_decimal(params: QueryDict, key: str) -> Decimal | None:
+    if not (value := params.get(key)):
+        return None
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"{key} must be a number")
+
+
+def status_query(statuses: list[str]) -> Q:
+    today = timezone.now().date()
+    query = Q()
+
+    for status in statuses:
+        match status:
+            case "overdue":
+                query |= Q(status="pending", date_due__lt=today)
+            case "pending":
+                query |= Q(status="pending", date_due__gte=today)
+            case _:
+                query |= Q(status=status)
+    return query
+
+
+def filter_invoices(invoices: QuerySet[Invoice], params: QueryDict) -> FilterInvoicesServiceResponse:
+    """
+    Applies the public API invoice filters:
+    status (comma separated, including "overdue"), date_due_after/before, date_issued_after/before, client, amount_min/max (on the materialized invoice total)
+    """
+    try:
+        if statuses := [status.strip().lower() for status in params.get("status", "").split(",") if status.strip()]:
+            if invalid := [status for status in statuses if status not in INVOICE_STATUS_FILTERS]:
+                raise ValueError(f"Invalid status: {', '.join(invalid)}. Choose from: {', '.join(INVOICE_STATUS_FILTERS)}")
+            invoices = invoices.filter(status_query(statuses))
+
+        for field in ("date_due", "date_issued"):
+            if after := _parse_date(params, f"{field}_after"):
+                invoices = invoices.filter(**{f"{field}__gte": after})
+            if before := _parse_date(params, f"{field}_before"):
+                invoices = invoices.filter(**{f"{field}__lte": before})
+
+        if client := params.get("client"):
+            if not client.isdigit():
+                raise ValueError("client must be a client id")
+            invoices = invoices.filter(client_to_id=int(client))
+
+        amount_min, amount_max = _parse_decimal(params, "amount_min"), _parse_decimal(params, "amount_max")
+    except ValueError as error:
+        return FilterInvoicesServiceResponse(False, error_message=str(error))
+
+    if amount_min is not None:
+        invoices = invoices.filter(total__gte=amount_min)
+    if amount_max is not None:
+        invoices = invoices.filter(total__lte=amount_max)
+
+    return FilterInvoicesServiceResponse(True, invoices)
+
+
+def _amount_query(value: str) -> Q:
+    """
+    Dashboard amount filter on the invoice total: "100" exactly, "100+" and above, or a "100-250" range
+    """
+    value = value.replace(",", "").strip()
+    try:
+        if value.endswith("+"):
+            return Q(total__gte=Decimal(value[:-1]))
+        if "-" in value.lstrip("-"):
+            low, high = value.split("-", 1)
+            return Q(total__gte=Decimal(low), total__lte=Decimal(high))
+        return Q(total=Decimal(value))
+    except InvalidOperation:
+        raise ValueError("Amount must be a number, a number followed by + or a range like 100-250")
+
+
+def filter_dashboard_invoices(invoices: QuerySet[Invoice], params: QueryDict, owner: User | Organization) -> FilterInvoicesServiceResponse:
+    """
+    Applies the invoice dashboard table filters, named after its columns:
+    invoice-id, client_name, amount (see _amount_query), status (comma separated, including "overdue") and
+    due_date ("dd/mm/YYYY,dd/mm/YYYY")
+    """
+    try:
+        if invoice_id := params.get("invoice-id", "").strip():
+            if not invoice_id.isdigit():
+                raise ValueError("Invoice ID must be a number")
+            invoices = invoices.filter(id=int(invoice_id))
+
+        if client_name := params.get("client_name", "").strip():
+            # invoices are indexed under their client's name, see backend.core.service.search
+            matching = search_object_ids(owner, client_name, SearchEntry.Kinds.INVOICE, title_only=True, limit=MAX_FILTER_RESULTS)
+            invoices = invoices.filter(id__in=matching)
+
+        if amount := params.get("amount", "").strip():
+            invoices = invoices.filter(_amount_query(amount))
+
+        if statuses := [status.strip().lower() for status in params.get("status", "").split(",") if status.strip()]:
+            if invalid := [status for status in statuses if status not in INVOICE_STATUS_FILTERS]:
+                raise ValueError(f"Invalid status: {', '.join(invalid)}")
+            invoices = invoices.filter(status_query(statuses))
+
+        if due_date := params.get("due_date"):
+            try:
+                date_start, date_end = (datetime.strptime(value.strip(), "%d/%m/%Y").date() for value in due_date.split(","))
+            except ValueError:
+                raise ValueError("Due date must be a range in the format dd/mm/YYYY,dd/mm/YYYY")
+            invoices = invoices.filter(date_due__range=[date_start, date_end])
+    except ValueError as error:
+        return FilterInvoicesServiceResponse(False, error_message=str(error))
+
+    return FilterInvoicesServiceResponse(True, invoices)
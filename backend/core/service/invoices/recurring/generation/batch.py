@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min, Q, QuerySet
+
+from backend.clients.models import DefaultValues
+from backend.core.service.asyn_tasks.tasks import Task
+from backend.core.service.defaults.get import get_account_defaults
+from backend.core.service.invoices.common.emails.on_create import on_create_invoice_email_service
+from backend.core.service.invoices.recurring.generation.ledger import claim_periods
+from backend.core.service.invoices.recurring.generation.next_invoice import build_next_invoice, handle_invoice_generation_failure
+from backend.core.service.reports.buckets import OwnerKey, owner_key, refresh_report_buckets_for
+from backend.core.service.reports.revenue import refresh_revenue_rollup_for
+from backend.core.service.search.index import index_objects
+from backend.models import AuditLog, Invoice, InvoiceRecurringProfile, RecurringInvoiceGeneration
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchGenerationResult:
+    issue_date: date
+    generated: list[int] = field(default_factory=list)  # invoice ids
+    failed: dict[int, str] = field(default_factory=dict)  # profile id: error
+    skipped: list[int] = field(default_factory=list)  # profile ids whose period was already generated
+    seconds: float = 0.0
+
+    @property
+    def per_second(self) -> float:
+        return len(self.generated) / self.seconds if self.seconds else 0.0
+
+
+def due_recurring_profile_ids(issue_date: date) -> list[int]:
+    """
+    Ongoing profiles whose next invoice is issued on or before issue_date (so a missed day is caught up),
+    one range scan of the (status, next_issue_date) index
+    """
+    return list(
+        InvoiceRecurringProfile.objects.filter(status="ongoing", next_issue_date__lte=issue_date, active=True)
+        .filter(Q(end_date__isnull=True) | Q(end_date__gte=issue_date))
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def _load_chunk(profile_ids: list[int]) -> QuerySet[InvoiceRecurringProfile]:
+    return (
+        InvoiceRecurringProfile.objects.filter(pk__in=profile_ids)
+        .annotate(first_period=Min("generations__period"))
+        .select_related("client_to", "client_to__default_values", "user", "organization")
+        .prefetch_related("items")
+        .order_by("pk")
+    )
+
+
+def _account_defaults(profiles: list[InvoiceRecurringProfile]) -> dict[OwnerKey, DefaultValues]:
+    """
+    Account level defaults (those without a client) of every owner in the chunk, in one query
+    """
+    user_ids = {profile.user_id for profile in profiles if profile.user_id}
+    organization_ids = {profile.organization_id for profile in profiles if profile.organization_id}
+
+    defaults = DefaultValues.objects.filter(client__isnull=True).filter(Q(user_id__in=user_ids) | Q(organization_id__in=organization_ids))
+    return {owner_key(default): default for default in defaults}
+
+
+def _defaults_for(profile: InvoiceRecurringProfile, account_defaults: dict[OwnerKey, DefaultValues]) -> DefaultValues:
+    if profile.client_to:
+        return profile.client_to.default_values  # raises if the client has none, as get_account_defaults does
+    if (key := owner_key(profile)) not in account_defaults:
+        account_defaults[key] = get_account_defaults(profile.owner)
+    return account_defaults[key]
+
+
+def _generate_chunk(profiles: list[InvoiceRecurringProfile], issue_date: date, result: BatchGenerationResult) -> None:
+    account_defaults = _account_defaults(profiles)
+    built: list[tuple[InvoiceRecurringProfile, Invoice]] = []
+
+    for profile in profiles:
+        try:
+            built.append((profile, build_next_invoice(profile, issue_date, _defaults_for(profile, account_defaults))))
+        except Exception as error:
+            result.failed[profile.pk] = str(error)
+            handle_invoice_generation_failure(profile, str(error))
+
+    if not built:
+        return
+
+    with transaction.atomic():
+        # the period is the date the profile was scheduled for, which a catch-up issues later
+        claimed = claim_periods({profile.pk: profile.next_issue_date or issue_date for profile, _ in built})
+        result.skipped.extend(profile.pk for profile, _ in built if profile.pk not in claimed)
+        if not (built := [(profile, invoice) for profile, invoice in built if profile.pk in claimed]):
+            return
+
+        invoices = Invoice.objects.bulk_create([invoice for _, invoice in built])
+        for profile, invoice in built:
+            claimed[profile.pk].invoice = invoice
+        RecurringInvoiceGeneration.objects.bulk_update(claimed.values(), ["invoice"])
+
+        InvoiceItemLink = Invoice.items.through
+        InvoiceItemLink.objects.bulk_create(
+            [InvoiceItemLink(invoice_id=invoice.pk, invoiceitem_id=item.pk) for profile, invoice in built for item in profile.items.all()]
+        )
+        AuditLog.objects.bulk_create(
+            [
+                AuditLog(
+                    action=f"[SYSTEM] Generated invoice #{invoice.pk} from the recurring profile #{profile.pk}",
+                    user_id=profile.user_id,
+                    organization_id=profile.organization_id,
+                )
+                for profile, invoice in built
+            ]
+        )
+
+        for profile, _ in built:
+            # on from the period just claimed, not the day it was generated on, so a catch-up keeps the schedule's day
+            period = claimed[profile.pk].period
+            profile.next_issue_date = profile.following_issue_date(period, anchor=profile.first_period)
+        InvoiceRecurringProfile.objects.bulk_update([profile for profile, _ in built], ["next_issue_date"])
+
+        # bulk_create sends no save signals, so everything they'd keep up to date is refreshed here, once per chunk
+        refresh_report_buckets_for(invoices, "date_issued")
+        refresh_revenue_rollup_for(invoices)
+        index_objects(invoices)
+
+        invoice_ids = [invoice.pk for invoice in invoices]
+        # queue_task, not queue_background_task: without SQS the emails are sent by whatever runs the batch (the
+        # webhook's background thread, or the command, whose process would end before a daemon thread finished)
+        transaction.on_commit(lambda: Task().queue_task(send_generated_invoice_emails, invoice_ids))
+
+    result.generated.extend(invoice_ids)
+
+
+def generate_due_recurring_invoices(issue_date: date, batch_size: int | None = None) -> BatchGenerationResult:
+    """
+    Generates the invoice of every recurring profile due on issue_date, a chunk of profiles per transaction.
+    Emails are queued once each chunk has committed.
+    """
+    batch_size = batch_size or settings.RECURRING_GENERATION_BATCH_SIZE
+    result = BatchGenerationResult(issue_date=issue_date)
+    started = time.monotonic()
+
+    profile_ids = due_recurring_profile_ids(issue_date)
+
+    for start in range(0, len(profile_ids), batch_size):
+        _generate_chunk(list(_load_chunk(profile_ids[start : start + batch_size])), issue_date, result)
+        logger.info(f"Generated {len(result.generated)} recurring invoices for {issue_date} ({len(result.failed)} failed)")
+
+    result.seconds = time.monotonic() - started
+    return result
+
+
+def generate_due_recurring_invoices_task(issue_date: str) -> None:
+    """
+    Queued task: generate_due_recurring_invoices for an ISO formatted issue date, logging the outcome.
+    """
+    result = generate_due_recurring_invoices(date.fromisoformat(issue_date))
+
+    logger.info(f"Batch generated {len(result.generated)} recurring invoices in {result.seconds:.1f}s ({len(result.failed)} failed)")
+    for profile_id, error in result.failed.items():
+        logger.error(f"Recurring profile #{profile_id}: {error}")
+
+
+def send_generated_invoice_emails(invoice_ids: list[int]) -> None:
+    """
+    Queued task: emails each generated invoice to its client. A failed send is audit logged, the invoice stays.
+    """
+    invoices = Invoice.objects.filter(pk__in=invoice_ids).select_related("client_to", "invoice_recurring_profile", "user", "organization")
+
+    for invoice in invoices:
+        users_email = (invoice.client_to.email if invoice.client_to else invoice.client_email) or ""
+        response = on_create_invoice_email_service(users_email=users_email, invoice=invoice)
+
+        if response.failed and invoice.invoice_recurring_profile:
+            handle_invoice_generation_failure(
+                invoice.invoice_recurring_profile, f"Failed to send invoice #{invoice.pk} to {users_email}: {response.error}"
+            )
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import date
+
+from django.db import IntegrityError, transaction
+
+from backend.models import RecurringInvoiceGeneration
+
+
+def claim_period(profile_id: int, period: date) -> RecurringInvoiceGeneration | None:
+    """
+    Claims a profile's period for the current transaction, None if it was already generated. A concurrent claim
+    waits on the unique constraint until the other transaction commits (then fails) or rolls back (then succeeds).
+    """
+    try:
+        with transaction.atomic():
+            return RecurringInvoiceGeneration.objects.create(profile_id=profile_id, period=period)
+    except IntegrityError:
+        return None
+
+
+def claim_periods(periods: dict[int, date]) -> dict[int, RecurringInvoiceGeneration]:
+    """
+    Claims the period of many profiles (profile id: period) with one insert, falling back to a claim per profile
+    when a concurrent run got to some of them first. Returns the claimed generations by profile id.
+    """
+    generated = set(
+        RecurringInvoiceGeneration.objects.filter(profile_id__in=periods, period__in=set(periods.values())).values_list(
+            "profile_id", "period"
+        )
+    )
+    unclaimed = {profile_id: period for profile_id, period in periods.items() if (profile_id, period) not in generated}
+
+    try:
+        with transaction.atomic():
+            claimed = RecurringInvoiceGeneration.objects.bulk_create(
+                [RecurringInvoiceGeneration(profile_id=profile_id, period=period) for profile_id, period in unclaimed.items()]
+            )
+    except IntegrityError:
+        claimed = [generation for profile_id, period in unclaimed.items() if (generation := claim_period(profile_id, period))]
+
+    return {generation.profile_id: generation for generation in claimed}
+
+
+def get_generation(profile_id: int, period: date) -> RecurringInvoiceGeneration | None:
+    return RecurringInvoiceGeneration.objects.select_related("invoice").filter(profile_id=profile_id, period=period).first()
@@ -5,6 +5,8 @@ from django.db import transaction, IntegrityError
 from backend.models import Invoice, InvoiceRecurringProfile, DefaultValues, AuditLog
 from backend.core.service.defaults.get import get_account_defaults
 from backend.core.service.invoices.common.emails.on_create import on_create_invoice_email_service
+from backend.core.service.invoices.recurring.generation.ledger import claim_period, get_generation
+from backend.core.service.invoices.recurring.schedule import advance_next_issue_date
 from backend.core.utils.dataclasses import BaseServiceResponse
 
 import logging
@@ -12,37 +14,29 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class GenerateNextInvoiceServiceResponse(BaseServiceResponse[Invoice]): ...
+class GenerateNextInvoiceServiceResponse(BaseServiceResponse[Invoice]):
+    def __init__(self, *args, already_generated: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        # the period had been generated before: nothing was created or sent
+        self.already_generated = already_generated
 
 
-@transaction.atomic
-def generate_next_invoice_service(
-    invoice_recurring_profile: InvoiceRecurringProfile,
-    issue_date: date = date.today(),
-    account_defaults: DefaultValues | None = None,
-) -> GenerateNextInvoiceServiceResponse:
+def build_next_invoice(invoice_recurring_profile: InvoiceRecurringProfile, issue_date: date, account_defaults: DefaultValues) -> Invoice:
     """
-    This will generate the next single invoice based on the invoice recurring profile
+    The next invoice of a recurring profile, unsaved and without its items
     """
-
-    if not invoice_recurring_profile:
-        return GenerateNextInvoiceServiceResponse(error_message="Invoice recurring profile not found")
-
     generated_invoice = Invoice(
         invoice_recurring_profile=invoice_recurring_profile,
     )
 
     if invoice_recurring_profile.client_to:
-        account_defaults = account_defaults or get_account_defaults(invoice_recurring_profile.owner, invoice_recurring_profile.client_to)
         generated_invoice.client_to = invoice_recurring_profile.client_to
     else:
-        account_defaults = account_defaults or get_account_defaults(invoice_recurring_profile.owner)
         generated_invoice.client_name = invoice_recurring_profile.client_name
         generated_invoice.client_city = invoice_recurring_profile.client_city
         generated_invoice.client_email = invoice_recurring_profile.client_email
         generated_invoice.client_address = invoice_recurring_profile.client_address
         generated_invoice.client_county = invoice_recurring_profile.client_county
-        generated_invoice.client_county = invoice_recurring_profile.client_county
         generated_invoice.client_company = invoice_recurring_profile.client_company
 
     generated_invoice.self_name = invoice_recurring_profile.self_name
@@ -73,12 +67,47 @@ def generate_next_invoice_service(
     generated_invoice.discount_percentage = invoice_recurring_profile.discount_percentage
     generated_invoice.owner = invoice_recurring_profile.owner
 
+    # the invoice gets the profile's items, so it has the profile's subtotal
+    generated_invoice.subtotal = invoice_recurring_profile.subtotal
+    generated_invoice.apply_totals()
+
+    return generated_invoice
+
+
+@transaction.atomic
+def generate_next_invoice_service(
+    invoice_recurring_profile: InvoiceRecurringProfile,
+    issue_date: date = date.today(),
+    account_defaults: DefaultValues | None = None,
+    period: date | None = None,
+) -> GenerateNextInvoiceServiceResponse:
+    """
+    This will generate the next single invoice based on the invoice recurring profile.
+    Each period (defaults to the issue date) is generated once: a repeated call returns the invoice generated the first time.
+    """
+
+    if not invoice_recurring_profile:
+        return GenerateNextInvoiceServiceResponse(error_message="Invoice recurring profile not found")
+
+    period = period or issue_date
+
+    if not (generation := claim_period(invoice_recurring_profile.pk, period)):
+        return already_generated_response(invoice_recurring_profile, period)
+
+    if not account_defaults:
+        account_defaults = get_account_defaults(invoice_recurring_profile.owner, invoice_recurring_profile.client_to)
+
+    generated_invoice = build_next_invoice(invoice_recurring_profile, issue_date, account_defaults)
+
     generated_invoice.save()
 
     generated_invoice.items.set(invoice_recurring_profile.items.all())
 
     generated_invoice.save(update_fields=["invoice_recurring_profile"])
 
+    generation.invoice = generated_invoice
+    generation.save(update_fields=["invoice"])
+
     logger.info(f"Invoice generated with the ID of {generated_invoice.pk}")
 
     users_email: str = (
@@ -97,9 +126,23 @@ def generate_next_invoice_service(
         organization=invoice_recurring_profile.organization,
     )
 
+    advance_next_issue_date(invoice_recurring_profile, period)
+
     return GenerateNextInvoiceServiceResponse(True, response=generated_invoice)
 
 
+def already_generated_response(invoice_recurring_profile: InvoiceRecurringProfile, period: date) -> GenerateNextInvoiceServiceResponse:
+    generation = get_generation(invoice_recurring_profile.pk, period)
+
+    logger.info(f"Invoice for the recurring profile #{invoice_recurring_profile.pk} and period {period} was already generated")
+
+    if generation and generation.invoice:
+        return GenerateNextInvoiceServiceResponse(True, response=generation.invoice, already_generated=True)
+    return GenerateNextInvoiceServiceResponse(
+        error_message=f"The invoice for {period} was already generated and has since been deleted", already_generated=True
+    )
+
+
 def handle_invoice_generation_failure(invoice_recurring_profile, error_message):
     """
     Function to handle invoice generation failure and log it in AuditLog.
@@ -115,13 +158,14 @@ def safe_generate_next_invoice_service(
     invoice_recurring_profile: InvoiceRecurringProfile,
     issue_date: date = date.today(),
     account_defaults: DefaultValues | None = None,
+    period: date | None = None,
 ) -> GenerateNextInvoiceServiceResponse:
     """
     Safe wrapper to generate the next invoice with transaction rollback and error logging.
     """
     try:
         # Call the main service function wrapped with @transaction.atomic
-        return generate_next_invoice_service(invoice_recurring_profile, issue_date, account_defaults)
+        return generate_next_invoice_service(invoice_recurring_profile, issue_date, account_defaults, period)
     except Exception as e:
         # Handle the error and ensure the failure is logged
         handle_invoice_generation_failure(invoice_recurring_profile, str(e))
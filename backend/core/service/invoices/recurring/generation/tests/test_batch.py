@@ -0,0 +1,208 @@
+from datetime import date, timedelta
+from importlib import import_module
+from decimal import Decimal
+from unittest import mock
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+from model_bakery import baker
+
+from backend.core.service.invoices.recurring.generation import batch
+from backend.core.service.invoices.recurring.generation.batch import due_recurring_profile_ids, generate_due_recurring_invoices
+from backend.core.service.invoices.recurring.schedule import refresh_next_issue_date
+from backend.models import (
+    AuditLog,
+    Client,
+    DefaultValues,
+    Invoice,
+    InvoiceItem,
+    InvoiceRecurringProfile,
+    ReportDayBucket,
+    SearchEntry,
+    User,
+)
+
+ISSUE_DATE = date(2024, 2, 15)
+# the day the profiles' schedules are calculated on, before ISSUE_DATE
+SCHEDULED_ON = date(2024, 2, 1)
+
+
+class BatchRecurringGenerationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+
+    def make_profile(self, last_issued: date | None = None, **kwargs) -> InvoiceRecurringProfile:
+        kwargs = {"status": "ongoing", "frequency": "monthly", "date_issued": None, "end_date": None, "client_to": None, **kwargs}
+        profile = baker.make(
+            InvoiceRecurringProfile,
+            user=self.user,
+            client_name="Globex",
+            client_email="billing@globex.example",
+            vat_number=None,
+            discount_amount=0,
+            discount_percentage=0,
+            logo=None,
+            **kwargs,
+        )
+        profile.items.add(InvoiceItem.objects.create(name="Hosting", description="Hosting", is_service=False, price=Decimal("30")))
+        if last_issued:
+            baker.make(Invoice, user=self.user, invoice_recurring_profile=profile, date_issued=last_issued, vat_number=None, logo=None)
+        refresh_next_issue_date(profile, today=SCHEDULED_ON)
+        profile.refresh_from_db()
+        return profile
+
+    def test_due_profiles(self):
+        monthly = self.make_profile(date(2024, 1, 15))
+        weekly = self.make_profile(date(2024, 2, 8), frequency="weekly")
+        never_generated = self.make_profile(date_issued=date(2024, 2, 10))
+        missed = self.make_profile(date(2024, 1, 10))  # due on the 10th, caught up
+        self.make_profile(date(2024, 2, 1))  # next due in March
+        self.make_profile(date(2024, 1, 15), status="paused")
+        self.make_profile(date(2024, 1, 15), end_date=date(2024, 2, 1))
+        self.make_profile(date_issued=date(2024, 3, 1))
+
+        self.assertEqual(due_recurring_profile_ids(ISSUE_DATE), [monthly.pk, weekly.pk, never_generated.pk, missed.pk])
+
+    def test_due_profiles_is_one_query(self):
+        for _ in range(3):
+            self.make_profile(date(2024, 1, 15))
+
+        with self.assertNumQueries(1):
+            self.assertEqual(len(due_recurring_profile_ids(ISSUE_DATE)), 3)
+
+    @mock.patch.object(batch.Task, "queue_task")
+    def test_generates_invoices_in_bulk(self, queue_task):
+        profiles = [self.make_profile(date(2024, 1, 15)) for _ in range(3)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = generate_due_recurring_invoices(ISSUE_DATE, batch_size=2)
+
+        self.assertEqual((len(result.generated), result.failed), (3, {}))
+        invoices = Invoice.objects.filter(pk__in=result.generated).order_by("pk")
+        for profile, invoice in zip(profiles, invoices):
+            self.assertEqual(invoice.invoice_recurring_profile_id, profile.pk)
+            self.assertEqual((invoice.date_issued, invoice.client_name), (ISSUE_DATE, "Globex"))
+            self.assertEqual(list(invoice.items.all()), list(profile.items.all()))
+            self.assertEqual(invoice.total, Decimal("30.00"))
+
+        self.assertEqual(AuditLog.objects.filter(action__contains="from the recurring profile").count(), 3)
+        self.assertEqual(SearchEntry.objects.filter(kind="invoice", object_id__in=result.generated).count(), 3)
+        self.assertEqual(ReportDayBucket.objects.get(user=self.user, date=ISSUE_DATE).invoices_sent, 3)
+        # one email task per committed chunk
+        self.assertEqual([call.args[1] for call in queue_task.call_args_list], [result.generated[:2], result.generated[2:]])
+
+        self.assertEqual(generate_due_recurring_invoices(ISSUE_DATE).generated, [])
+        self.assertEqual(set(InvoiceRecurringProfile.objects.values_list("next_issue_date", flat=True)), {date(2024, 3, 15)})
+
+    @mock.patch.object(batch.Task, "queue_task")
+    def test_failures_dont_stop_the_batch(self, queue_task):
+        client = baker.make(Client, user=self.user, name="No defaults")
+        broken = self.make_profile(date(2024, 1, 15), client_to=client)
+        working = self.make_profile(date(2024, 1, 15))
+
+        result = generate_due_recurring_invoices(ISSUE_DATE)
+
+        self.assertEqual(list(result.failed), [broken.pk])
+        self.assertEqual(Invoice.objects.get(pk__in=result.generated).invoice_recurring_profile_id, working.pk)
+
+    def test_issue_date_after_clamps_month_ends(self):
+        profile = InvoiceRecurringProfile(frequency="monthly")
+        self.assertEqual(profile.issue_date_after(date(2024, 1, 31)), date(2024, 2, 29))
+        self.assertEqual(profile.issue_date_after(date(2024, 12, 15)), date(2025, 1, 15))
+
+        profile.frequency = "yearly"
+        self.assertEqual(profile.issue_date_after(date(2024, 2, 29)), date(2025, 2, 28))
+
+    def test_next_issue_date_rolls_over_the_year(self):
+        profile = self.make_profile(date(2023, 12, 31))
+
+        # 31st January was missed, so it's rolled on to February (clamped from the 31st, not from the 29th)
+        self.assertEqual(profile.next_issue_date, date(2024, 2, 29))
+        self.assertEqual(profile.following_issue_date(date(2024, 1, 31)), date(2024, 2, 29))
+
+    @mock.patch.object(batch.Task, "queue_task")
+    def test_month_end_schedules_dont_drift(self, queue_task):
+        profile = self.make_profile(date_issued=date(2024, 1, 31))
+        InvoiceRecurringProfile.objects.filter(pk=profile.pk).update(next_issue_date=date(2024, 1, 31))
+
+        next_issue_dates = []
+        for issue_date in [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)]:
+            generate_due_recurring_invoices(issue_date)
+            profile.refresh_from_db()
+            next_issue_dates.append(profile.next_issue_date)
+
+        self.assertEqual(next_issue_dates, [date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30), date(2024, 5, 31)])
+
+    @mock.patch.object(batch.Task, "queue_task")
+    def test_month_end_anchor_without_issue_date_is_the_first_period(self, queue_task):
+        profile = self.make_profile()
+        InvoiceRecurringProfile.objects.filter(pk=profile.pk).update(next_issue_date=date(2024, 1, 31))
+
+        generate_due_recurring_invoices(date(2024, 1, 31))
+        generate_due_recurring_invoices(date(2024, 2, 29))
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.next_issue_date, date(2024, 3, 31))
+
+    @mock.patch.object(batch.Task, "queue_task")
+    def test_catch_up_keeps_the_scheduled_day(self, queue_task):
+        profile = self.make_profile(date(2024, 1, 15))
+
+        generate_due_recurring_invoices(ISSUE_DATE + timedelta(days=1))
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.next_issue_date, date(2024, 3, 15))
+
+    def test_saves_without_schedule_changes_keep_a_missed_period(self):
+        profile = self.make_profile(date(2024, 1, 15))
+
+        profile = InvoiceRecurringProfile.objects.get(pk=profile.pk)
+        profile.notes = "Updated notes"
+        profile.save()
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.next_issue_date, ISSUE_DATE)
+
+    def test_ended_profiles_have_no_next_issue_date(self):
+        profile = self.make_profile(date(2024, 1, 15), end_date=date(2024, 2, 14))
+
+        self.assertIsNone(profile.next_issue_date)
+
+    def test_resuming_skips_the_paused_periods(self):
+        today = date.today()
+        profile = self.make_profile(today - timedelta(days=100), status="paused")
+
+        profile.status = "ongoing"
+        profile.save(update_fields=["status"])
+
+        profile.refresh_from_db()
+        self.assertTrue(today <= profile.next_issue_date <= today + timedelta(days=31))
+
+    def test_frequency_changes_reschedule(self):
+        today = date.today()
+        profile = self.make_profile(today - timedelta(days=3))
+
+        profile.frequency = "weekly"
+        profile.save()
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.next_issue_date, today + timedelta(days=4))
+
+    def test_due_date_in_the_following_month_rolls_over_the_year(self):
+        profile = InvoiceRecurringProfile(frequency="monthly")
+        defaults = DefaultValues(invoice_due_date_type=DefaultValues.InvoiceDueDateType.date_following, invoice_due_date_value=31)
+
+        self.assertEqual(profile.next_invoice_due_date(defaults, from_date=date(2024, 12, 10)), date(2025, 1, 31))
+        self.assertEqual(profile.next_invoice_due_date(defaults, from_date=date(2024, 1, 10)), date(2024, 2, 29))
+
+    def test_migration_backfills_existing_profiles(self):
+        backfill = import_module("backend.migrations.0080_recurring_next_issue_date").backfill_next_issue_dates
+        profiles = [self.make_profile(date.today() - timedelta(days=40)), self.make_profile(), self.make_profile(frequency="weekly")]
+        InvoiceRecurringProfile.objects.update(next_issue_date=None)
+
+        backfill(django_apps, None)
+
+        for profile in profiles:
+            profile.refresh_from_db()
+            self.assertIsNotNone(profile.next_issue_date)
+            self.assertEqual(profile.next_issue_date, profile.scheduled_issue_date())
@@ -0,0 +1,106 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from model_bakery import baker
+
+from backend.core.service.invoices.recurring.generation import batch, ledger, next_invoice
+from backend.core.service.invoices.recurring.generation.batch import generate_due_recurring_invoices
+from backend.core.service.invoices.recurring.generation.ledger import claim_periods
+from backend.core.service.invoices.recurring.generation.next_invoice import safe_generate_next_invoice_service
+from backend.core.service.invoices.recurring.schedule import refresh_next_issue_date
+from backend.core.utils.dataclasses import BaseServiceResponse
+from backend.models import DefaultValues, Invoice, InvoiceItem, InvoiceRecurringProfile, RecurringInvoiceGeneration, User
+
+PERIOD = date(2024, 2, 15)
+
+
+def sent():
+    return BaseServiceResponse(True, response="sent")
+
+
+class RecurringGenerationLedgerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+        self.defaults = DefaultValues.objects.create(user=self.user)
+        self.profile = baker.make(
+            InvoiceRecurringProfile,
+            user=self.user,
+            status="ongoing",
+            frequency="monthly",
+            date_issued=None,
+            end_date=None,
+            client_to=None,
+            client_name="Globex",
+            client_email="billing@globex.example",
+            vat_number=None,
+            discount_amount=0,
+            discount_percentage=0,
+            logo=None,
+        )
+        self.profile.items.add(InvoiceItem.objects.create(name="Hosting", description="Hosting", is_service=False, price=Decimal("30")))
+
+    def generate(self, **kwargs):
+        return safe_generate_next_invoice_service(self.profile, issue_date=PERIOD, account_defaults=self.defaults, **kwargs)
+
+    @mock.patch.object(next_invoice, "on_create_invoice_email_service", side_effect=lambda **kwargs: sent())
+    def test_retries_return_the_generated_invoice(self, send_email):
+        first = self.generate()
+        retry = self.generate(period=PERIOD)
+
+        self.assertTrue(first.success and retry.success)
+        self.assertFalse(first.already_generated)
+        self.assertTrue(retry.already_generated)
+        self.assertEqual(retry.response, first.response)
+        self.assertEqual(Invoice.objects.filter(invoice_recurring_profile=self.profile).count(), 1)
+        self.assertEqual(send_email.call_count, 1)
+        self.assertEqual(RecurringInvoiceGeneration.objects.get(profile=self.profile, period=PERIOD).invoice, first.response)
+
+    @mock.patch.object(next_invoice, "on_create_invoice_email_service", side_effect=lambda **kwargs: sent())
+    def test_deleted_invoices_are_not_generated_again(self, send_email):
+        self.generate().response.delete()
+
+        retry = self.generate()
+
+        self.assertTrue(retry.failed and retry.already_generated)
+        self.assertFalse(Invoice.objects.filter(invoice_recurring_profile=self.profile).exists())
+
+    @mock.patch.object(next_invoice, "on_create_invoice_email_service")
+    def test_failed_generation_releases_the_period(self, send_email):
+        send_email.return_value = BaseServiceResponse(False, error_message="mail server down")
+        self.assertTrue(self.generate().failed)
+        self.assertFalse(RecurringInvoiceGeneration.objects.exists())
+
+        send_email.return_value = sent()
+        self.assertTrue(self.generate().success)
+
+    @mock.patch.object(batch.Task, "queue_task")
+    def test_batch_skips_generated_periods(self, queue_task):
+        refresh_next_issue_date(self.profile, today=PERIOD)
+        RecurringInvoiceGeneration.objects.create(profile=self.profile, period=PERIOD)
+
+        result = generate_due_recurring_invoices(PERIOD)
+
+        self.assertEqual((result.generated, result.skipped), ([], [self.profile.pk]))
+        self.assertFalse(Invoice.objects.exists())
+
+    @mock.patch.object(batch.Task, "queue_task")
+    def test_batch_records_its_generations(self, queue_task):
+        refresh_next_issue_date(self.profile, today=PERIOD)
+
+        result = generate_due_recurring_invoices(PERIOD)
+
+        self.assertEqual(RecurringInvoiceGeneration.objects.get(profile=self.profile, period=PERIOD).invoice_id, result.generated[0])
+
+    def test_claims_fall_back_one_by_one_when_a_concurrent_run_got_there_first(self):
+        other = baker.make(InvoiceRecurringProfile, user=self.user, vat_number=None, logo=None)
+        RecurringInvoiceGeneration.objects.create(profile=self.profile, period=PERIOD)
+
+        # the concurrent claim committed after the generated periods were read
+        with mock.patch.object(ledger.RecurringInvoiceGeneration.objects, "filter") as already_generated:
+            already_generated.return_value.values_list.return_value = []
+            claimed = claim_periods({self.profile.pk: PERIOD, other.pk: PERIOD})
+
+        self.assertEqual(list(claimed), [other.pk])
+        self.assertEqual(RecurringInvoiceGeneration.objects.count(), 2)
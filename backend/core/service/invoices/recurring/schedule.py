@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import date
+
+from backend.finance.models import InvoiceRecurringProfile
+
+
+def refresh_next_issue_date(profile: InvoiceRecurringProfile, today: date | None = None) -> date | None:
+    """
+    Recalculates and stores the profile's next_issue_date. Written with update() so the profile's post_save
+    signals (which called this) don't run again.
+    """
+    profile.next_issue_date = profile.scheduled_issue_date(today)
+    InvoiceRecurringProfile.objects.filter(pk=profile.pk).update(next_issue_date=profile.next_issue_date)
+    return profile.next_issue_date
+
+
+def advance_next_issue_date(profile: InvoiceRecurringProfile, period: date) -> date | None:
+    """
+    Moves next_issue_date one period on from the period just generated, whichever day it was generated on
+    """
+    first_period, _ = profile.generated_periods()
+    profile.next_issue_date = profile.following_issue_date(period, anchor=first_period)
+    InvoiceRecurringProfile.objects.filter(pk=profile.pk).update(next_issue_date=profile.next_issue_date)
+    return profile.next_issue_date
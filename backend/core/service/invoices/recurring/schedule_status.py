@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+
+SCHEDULE_STATUS_TIMEOUT = 60 * 60
+
+
+def _version_key(profile_id: int) -> str:
+    return f"myfinances:invoices:recurring:schedule_status:{profile_id}"
+
+
+def get_schedule_status_version(profile_id: int) -> int:
+    return cache.get(_version_key(profile_id), 0)
+
+
+def publish_schedule_status(profile_id: int) -> None:
+    """
+    Tells polling dashboards the profile's schedule changed, they then read its state from the database
+    """
+    key = _version_key(profile_id)
+    cache.add(key, 0, SCHEDULE_STATUS_TIMEOUT)
+    try:
+        cache.incr(key)
+    except ValueError:  # expired in between
+        cache.set(key, 1, SCHEDULE_STATUS_TIMEOUT)
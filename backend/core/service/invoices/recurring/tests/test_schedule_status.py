@@ -0,0 +1,17 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from backend.core.service.invoices.recurring.schedule_status import get_schedule_status_version, publish_schedule_status
+
+
+class ScheduleStatusTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_publishing_moves_the_version_on(self):
+        self.assertEqual(get_schedule_status_version(1), 0)
+
+        publish_schedule_status(1)
+        publish_schedule_status(1)
+
+        self.assertEqual((get_schedule_status_version(1), get_schedule_status_version(2)), (2, 0))
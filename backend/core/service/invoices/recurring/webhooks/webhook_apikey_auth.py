@@ -1,4 +1,6 @@
 from backend.core.api.public import APIAuthToken
+from backend.core.service.api_keys.cache import get_verified_api_key
+from backend.core.service.api_keys.last_used import record_api_key_use
 from backend.core.types.requests import WebRequest
 from backend.core.utils.dataclasses import BaseServiceResponse
 
@@ -16,18 +18,14 @@ def authenticate_api_key(request: WebRequest) -> APIAuthenticationServiceRespons
 
     token_key = auth_header.split(" ")[1]
 
-    try:
-        token = APIAuthToken.objects.get(
-            hashed_key=APIAuthToken.hash_raw_key(token_key),
-            active=True,
-            administrator_service_type=APIAuthToken.AdministratorServiceTypes.AWS_WEBHOOK_CALLBACK,
-        )
+    token = get_verified_api_key(token_key, administrator_service_type=APIAuthToken.AdministratorServiceTypes.AWS_WEBHOOK_CALLBACK)
 
-        if token.has_expired:
-            return APIAuthenticationServiceResponse(error_message="Token expired", status_code=400)
-    except APIAuthToken.DoesNotExist:
+    if not token:
         return APIAuthenticationServiceResponse(error_message="Token not found", status_code=400)
 
-    token.update_last_used()
+    if token.has_expired:
+        return APIAuthenticationServiceResponse(error_message="Token expired", status_code=400)
+
+    record_api_key_use(token)
 
     return APIAuthenticationServiceResponse(True, None, status_code=200)
@@ -1,39 +1,72 @@
-from io import BytesIO
-
-from django.http import HttpResponse
+from django.http import HttpRequest, HttpResponse
 from django.template.loader import get_template
-from xhtml2pdf import pisa
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from backend.core.service.invoices.single.pdf_conversion import html_to_pdf
+from backend.core.service.invoices.single.pdf_cache import get_cached_invoice_pdf, invoice_render_hash, store_invoice_pdf
+from backend.finance.models import UserSettings, Invoice, InvoicePDF
+
+INVOICE_PDF_TEMPLATE = "pages/invoices/single/view/invoice_page.html"
+
 
-from backend.finance.models import UserSettings, Invoice
+def render_pdf_bytes(template_src: str, context_dict: dict) -> bytes | None:
+    return html_to_pdf(get_template(template_src).render(context_dict))
 
 
 def render_to_pdf(template_src: str, context_dict: dict) -> HttpResponse | None:
-    template = get_template(template_src)
-    html = template.render(context_dict)
-    result = BytesIO()
-    pdf = pisa.pisaDocument(BytesIO(html.encode("UTF-8")), result)
-    if not pdf.err:
-        return HttpResponse(result.getvalue(), content_type="application/pdf")
+    if (content := render_pdf_bytes(template_src, context_dict)) is not None:
+        return HttpResponse(content, content_type="application/pdf")
     return None
 
 
-def generate_pdf(invoice: Invoice, content_type: str) -> HttpResponse | None:
+def invoice_currency_symbol(invoice: Invoice) -> str:
     try:
-        currency_symbol = invoice.get_currency_symbol()
+        return invoice.get_currency_symbol()
     except UserSettings.DoesNotExist:
-        currency_symbol = "$"
+        return "$"
 
-    context = {
+
+def invoice_pdf_context(invoice: Invoice, currency_symbol: str) -> dict:
+    return {
         "invoice": invoice,
         "currency_symbol": currency_symbol,
         "img_path": invoice.logo.path.replace("\\", "/") if invoice.logo else None,
     }
 
-    pdf = render_to_pdf("pages/invoices/single/view/invoice_page.html", context)
 
-    if pdf:
-        response = HttpResponse(pdf, content_type="application/pdf")
-        content = f"{content_type}; filename=invoice_{invoice.id}.pdf"
-        response["Content-Disposition"] = content
-        return response
-    return None
+def get_invoice_pdf(invoice: Invoice) -> InvoicePDF | None:
+    """
+    The invoice's cached PDF, rendered (and cached) first if the invoice changed since. None if rendering failed.
+    """
+    currency_symbol = invoice_currency_symbol(invoice)
+    render_hash = invoice_render_hash(invoice, currency_symbol)
+
+    if cached := get_cached_invoice_pdf(invoice, render_hash):
+        return cached
+
+    if (content := render_pdf_bytes(INVOICE_PDF_TEMPLATE, invoice_pdf_context(invoice, currency_symbol))) is None:
+        return None
+    return store_invoice_pdf(invoice, render_hash, content)
+
+
+def generate_pdf(invoice: Invoice, content_type: str, request: HttpRequest | None = None) -> HttpResponse | None:
+    """
+    The invoice as a PDF response, rendered only when the invoice changed since its cached PDF.
+    Given the request, conditional GETs (If-None-Match / If-Modified-Since) are answered with a 304.
+    """
+    if not (cached := get_invoice_pdf(invoice)):
+        return None
+
+    etag = f'"{cached.render_hash}"'
+    last_modified = int(cached.rendered_at.timestamp())
+
+    if request and (not_modified := get_conditional_response(request, etag=etag, last_modified=last_modified)):
+        return not_modified
+
+    with cached.file.open("rb") as file:
+        response = HttpResponse(file.read(), content_type="application/pdf")
+    response["Content-Disposition"] = f"{content_type}; filename=invoice_{invoice.id}.pdf"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
+from typing import IO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db.models import QuerySet
+from django.template.loader import get_template
+from django.utils import timezone
+
+from backend.core.models import _private_storage
+from backend.core.service.invoices.common.filters import status_query
+from backend.core.service.invoices.single.create_pdf import INVOICE_PDF_TEMPLATE, invoice_currency_symbol, invoice_pdf_context
+from backend.core.service.invoices.single.pdf_cache import get_cached_invoice_pdf, invoice_render_hash, store_invoice_pdf
+from backend.core.service.invoices.single.pdf_conversion import html_to_pdf
+from backend.finance.models import Invoice, InvoiceExport
+from backend.models import Organization, User
+
+# invoices loaded, and their missing PDFs rendered in parallel, per batch - bounds memory however large the export
+EXPORT_BATCH_SIZE = 20
+# how long an export, and its ZIP in private storage, are kept
+EXPORT_TIMEOUT = 60 * 60
+EXPORT_FOLDER = "invoice_exports"
+
+ExportProgressCallback = Callable[[int, int], None]
+
+
+def export_invoices_queryset(
+    owner: User | Organization,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    statuses: Iterable[str] = (),
+    client_id: int | None = None,
+) -> QuerySet[Invoice]:
+    invoices = Invoice.filter_by_owner(owner)
+    if start_date:
+        invoices = invoices.filter(date_issued__gte=start_date)
+    if end_date:
+        invoices = invoices.filter(date_issued__lte=end_date)
+    if statuses := list(statuses):
+        invoices = invoices.filter(status_query(statuses))
+    if client_id:
+        invoices = invoices.filter(client_to_id=client_id)
+    return invoices.order_by("date_issued", "id")
+
+
+def get_export(export_id: str, owner: User | Organization) -> InvoiceExport | None:
+    try:
+        return InvoiceExport.objects.filter(owner=owner, pk=export_id).first()
+    except ValidationError:  # not a uuid
+        return None
+
+
+def set_export_progress(export_id: str, **progress) -> None:
+    """
+    Updates the export's "done" and "total", then "file_path" once its ZIP is stored, or "failed".
+    Written with update() so each progress step is one query.
+    """
+    InvoiceExport.objects.filter(pk=export_id).update(**progress)
+
+
+def open_export_file(export: InvoiceExport) -> IO[bytes]:
+    return _private_storage().open(export.file_path, "rb")
+
+
+_render_pools: dict[int, ProcessPoolExecutor] = {}
+_render_pools_lock = threading.Lock()
+
+
+def get_render_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    The process pool shared by every export in this process, so concurrent exports queue for the same
+    bounded workers rather than each starting their own. Uses the platform's default start method.
+    """
+    with _render_pools_lock:
+        if (pool := _render_pools.get(workers)) is None:
+            pool = _render_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def _discard_render_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    with _render_pools_lock:
+        if _render_pools.get(workers) is pool:
+            del _render_pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _batches(invoices: QuerySet[Invoice]) -> Iterator[list[Invoice]]:
+    batch: list[Invoice] = []
+    for invoice in invoices.select_related("client_to").prefetch_related("items").iterator(chunk_size=EXPORT_BATCH_SIZE):
+        batch.append(invoice)
+        if len(batch) == EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _render_batch(batch: list[Invoice], executor: ProcessPoolExecutor | None) -> list[bytes | None]:
+    """
+    PDFs of a batch in order: cached ones are read from storage, the rest have their HTML rendered here
+    (templates need the database) and converted by the worker processes
+    """
+    template = get_template(INVOICE_PDF_TEMPLATE)
+    contents: list[bytes | None] = [None] * len(batch)
+    misses: list[tuple[int, str, str]] = []
+
+    for position, invoice in enumerate(batch):
+        currency_symbol = invoice_currency_symbol(invoice)
+        render_hash = invoice_render_hash(invoice, currency_symbol)
+
+        if cached := get_cached_invoice_pdf(invoice, render_hash):
+            with cached.file.open("rb") as file:
+                contents[position] = file.read()
+        else:
+            misses.append((position, render_hash, template.render(invoice_pdf_context(invoice, currency_symbol))))
+
+    htmls = [html for _, _, html in misses]
+    rendered = executor.map(html_to_pdf, htmls) if executor else map(html_to_pdf, htmls)
+
+    for (position, render_hash, _), content in zip(misses, rendered):
+        if content is not None:
+            store_invoice_pdf(batch[position], render_hash, content)
+        contents[position] = content
+
+    return contents
+
+
+def iter_invoice_pdfs(invoices: QuerySet[Invoice], workers: int | None = None) -> Iterator[tuple[Invoice, bytes | None]]:
+    """
+    Yields each invoice with its PDF (None if it failed to render), in the queryset's order.
+    xhtml2pdf is CPU bound, so with more than one worker the missing PDFs are rendered in the shared process pool.
+    """
+    workers = settings.INVOICE_EXPORT_WORKERS if workers is None else workers
+    executor = get_render_pool(workers) if workers > 1 else None
+
+    try:
+        for batch in _batches(invoices):
+            yield from zip(batch, _render_batch(batch, executor))
+    except BrokenProcessPool:
+        # a worker died, the next export starts a fresh pool
+        _discard_render_pool(workers, executor)  # type: ignore[arg-type]
+        raise
+
+
+class _ZipStream:
+    """
+    Write-only file object collecting what zipfile writes, so the archive can be streamed out in pieces.
+    Not seekable, which makes zipfile write sizes after each entry instead of seeking back.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None: ...
+
+    def pop(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def stream_invoices_zip(
+    invoices: QuerySet[Invoice], workers: int | None = None, on_progress: ExportProgressCallback | None = None
+) -> Iterator[bytes]:
+    """
+    A ZIP of the invoices' PDFs, yielded a file at a time so the archive is never held in memory.
+    Invoices whose PDF failed to render are listed in failed.txt.
+    """
+    total = invoices.count()
+    failed: list[int] = []
+    stream = _ZipStream()
+
+    if on_progress:
+        on_progress(0, total)
+
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:  # type: ignore[arg-type]
+        done = 0
+        for done, (invoice, content) in enumerate(iter_invoice_pdfs(invoices, workers), start=1):
+            if content is None:
+                failed.append(invoice.id)
+            else:
+                archive.writestr(f"invoice_{invoice.id}.pdf", content)
+
+            if on_progress and done % EXPORT_BATCH_SIZE == 0:
+                on_progress(done, total)
+            if data := stream.pop():
+                yield data
+
+        if failed:
+            archive.writestr("failed.txt", "Invoices that could not be rendered:\n" + "".join(f"#{invoice_id}\n" for invoice_id in failed))
+
+    if on_progress:
+        on_progress(done, max(done, total))
+    yield stream.pop()
+
+
+def _delete_expired_exports(storage) -> None:
+    cutoff = timezone.now() - timedelta(seconds=EXPORT_TIMEOUT)
+    expired = InvoiceExport.objects.filter(created_at__lt=cutoff)
+
+    for file_path in expired.exclude(file_path="").values_list("file_path", flat=True):
+        storage.delete(file_path)
+    expired.delete()
+
+
+def export_invoices_task(
+    export_id: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    statuses: list[str] | None = None,
+    client_id: int | None = None,
+) -> None:
+    """
+    Queued by the export endpoint: writes the ZIP to private storage, recording progress on the InvoiceExport.
+    Takes plain values only, so the task can be sent through SQS.
+    """
+    try:
+        export = InvoiceExport.objects.select_related("user", "organization").get(pk=export_id)
+        invoices = export_invoices_queryset(
+            export.owner,
+            date.fromisoformat(start_date) if start_date else None,
+            date.fromisoformat(end_date) if end_date else None,
+            statuses or [],
+            client_id,
+        )
+        storage = _private_storage()
+        _delete_expired_exports(storage)
+
+        with tempfile.TemporaryFile() as archive:
+            for chunk in stream_invoices_zip(
+                invoices, on_progress=lambda done, total: set_export_progress(export_id, done=done, total=total)
+            ):
+                archive.write(chunk)
+            archive.seek(0)
+            name = storage.save(f"{EXPORT_FOLDER}/{export_id}.zip", File(archive))
+    except Exception:
+        set_export_progress(export_id, failed=True)
+        raise
+
+    set_export_progress(export_id, file_path=name)
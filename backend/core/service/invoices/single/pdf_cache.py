@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db.models import Model, Sum
+from django.utils import timezone
+
+from backend.finance.models import Invoice, InvoicePDF
+
+# bump whenever the PDF template (or anything it includes) changes, so every cached file is re-rendered
+INVOICE_PDF_TEMPLATE_VERSION = 1
+# a cache hit only records its access time when the last one is older than this, keeping reads mostly read-only
+ACCESS_RESOLUTION = timedelta(minutes=5)
+
+
+def _field_values(obj: Model) -> dict:
+    return {field.attname: getattr(obj, field.attname) for field in obj._meta.concrete_fields}
+
+
+def invoice_render_hash(invoice: Invoice, currency_symbol: str) -> str:
+    """
+    Hash of everything the PDF render reads: the invoice, its items and client, the logo and the template version
+    """
+    inputs = {
+        "version": INVOICE_PDF_TEMPLATE_VERSION,
+        "currency_symbol": currency_symbol,
+        "invoice": _field_values(invoice),
+        "items": [_field_values(item) for item in sorted(invoice.items.all(), key=lambda item: item.pk)],
+        "client": _field_values(invoice.client_to) if invoice.client_to else None,
+    }
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_cached_invoice_pdf(invoice: Invoice, render_hash: str) -> InvoicePDF | None:
+    cached = InvoicePDF.objects.filter(invoice=invoice, render_hash=render_hash).first()
+    if not cached or not cached.file.storage.exists(cached.file.name):
+        return None
+
+    now = timezone.now()
+    if now - cached.last_accessed > ACCESS_RESOLUTION:
+        InvoicePDF.objects.filter(pk=cached.pk).update(last_accessed=now)
+        cached.last_accessed = now
+    return cached
+
+
+def store_invoice_pdf(invoice: Invoice, render_hash: str, content: bytes) -> InvoicePDF:
+    """
+    Replaces the invoice's cached PDF with a freshly rendered one, then evicts old files if the cache is over its limit
+    """
+    discard_invoice_pdf(invoice.pk)
+
+    now = timezone.now()
+    cached = InvoicePDF(invoice=invoice, render_hash=render_hash, size=len(content), rendered_at=now, last_accessed=now)
+    cached.file.save(f"invoice_{invoice.pk}_{render_hash[:16]}.pdf", ContentFile(content), save=False)
+    cached.save()
+
+    evict_invoice_pdfs()
+    return cached
+
+
+def discard_invoice_pdf(invoice_id: int) -> None:
+    # deleted one by one so the post_delete signal removes each file from storage
+    for cached in InvoicePDF.objects.filter(invoice_id=invoice_id):
+        cached.delete()
+
+
+def evict_invoice_pdfs(max_bytes: int | None = None) -> int:
+    """
+    Deletes the least recently used PDFs until the cache fits in max_bytes, returns how many were evicted
+    """
+    max_bytes = settings.INVOICE_PDF_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    total = InvoicePDF.objects.aggregate(total=Sum("size", default=0))["total"]
+    evicted = 0
+
+    for cached in InvoicePDF.objects.order_by("last_accessed").iterator():
+        if total <= max_bytes:
+            break
+        total -= cached.size
+        cached.delete()
+        evicted += 1
+
+    return evicted
@@ -0,0 +1,15 @@
+from io import BytesIO
+
+from xhtml2pdf import pisa
+
+
+def html_to_pdf(html: str) -> bytes | None:
+    """
+    Converts rendered invoice HTML to a PDF, None if it failed. Imports nothing from Django,
+    so it can run in a spawned worker process that never sets Django up.
+    """
+    result = BytesIO()
+    pdf = pisa.pisaDocument(BytesIO(html.encode("UTF-8")), result)
+    if not pdf.err:
+        return result.getvalue()
+    return None
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from backend.finance.models import Invoice, InvoiceURL
+
+
+@dataclass(frozen=True)
+class PublicInvoiceURL:
+    invoice_id: int
+    expires: datetime | None
+
+    @property
+    def has_expired(self) -> bool:
+        return bool(self.expires and self.expires <= timezone.now())
+
+
+@dataclass(frozen=True)
+class PublicInvoiceVersion:
+    """
+    Changes whenever anything shown on the invoice's public page does, so it keys the cached invoice and the ETag
+    """
+
+    token: str
+    changed_at: datetime
+
+    def etag(self, variant: str = "") -> str:
+        return f'"{self.token}{"-" + variant if variant else ""}"'
+
+
+def _url_key(uuid: str) -> str:
+    return f"myfinances:invoices:public:url:{uuid}"
+
+
+def _version_key(invoice_id: int) -> str:
+    return f"myfinances:invoices:public:version:{invoice_id}"
+
+
+def _invoice_key(invoice_id: int, version: PublicInvoiceVersion) -> str:
+    return f"myfinances:invoices:public:invoice:{invoice_id}:{version.token}"
+
+
+def get_public_invoice_url(uuid: str) -> PublicInvoiceURL | None:
+    """
+    The invoice an active share link points to. Cached until the link expires, a miss is one query without joins.
+    """
+    if (url := cache.get(_url_key(uuid))) is not None:
+        return url
+
+    row = InvoiceURL.objects.filter(uuid=uuid, invoice__isnull=False).values("invoice_id", "expires").first()
+    if not row:
+        return None
+
+    url = PublicInvoiceURL(invoice_id=row["invoice_id"], expires=row["expires"])
+    timeout = settings.PUBLIC_INVOICE_CACHE_TIMEOUT
+    if url.expires:
+        timeout = min(timeout, max(int((url.expires - timezone.now()).total_seconds()), 1))
+    cache.set(_url_key(uuid), url, timeout)
+    return url
+
+
+def get_public_invoice_version(invoice_id: int) -> PublicInvoiceVersion:
+    # add() so concurrent first hits agree on one version
+    cache.add(_version_key(invoice_id), PublicInvoiceVersion(uuid4().hex, timezone.now()), settings.PUBLIC_INVOICE_CACHE_TIMEOUT)
+    return cache.get(_version_key(invoice_id)) or PublicInvoiceVersion(uuid4().hex, timezone.now())
+
+
+def get_public_invoice(invoice_id: int, version: PublicInvoiceVersion) -> Invoice | None:
+    """
+    The invoice with its items and client loaded, cached for as long as its version stays current
+    """
+    if (invoice := cache.get(_invoice_key(invoice_id, version))) is not None:
+        return invoice
+
+    invoice = Invoice.objects.select_related("client_to").prefetch_related("items").filter(pk=invoice_id).first()
+    if invoice:
+        cache.set(_invoice_key(invoice_id, version), invoice, settings.PUBLIC_INVOICE_CACHE_TIMEOUT)
+    return invoice
+
+
+def invalidate_public_invoices(invoice_ids: Iterable[int]) -> None:
+    """
+    Moves the invoices to a new version: their cached copies are no longer read and browsers' ETags stop matching
+    """
+    cache.delete_many([_version_key(invoice_id) for invoice_id in set(invoice_ids)])
+
+
+def invalidate_public_invoice_url(uuid: str) -> None:
+    cache.delete(_url_key(uuid))
@@ -0,0 +1,146 @@
+import io
+import os
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from model_bakery import baker
+
+from backend.core.management.commands.export_invoice_pdfs import Command as ExportInvoicePDFsCommand
+from backend.core.service.invoices.single import export_pdfs
+from backend.core.service.invoices.single.export_pdfs import (
+    export_invoices_queryset,
+    export_invoices_task,
+    get_export,
+    get_render_pool,
+    open_export_file,
+    stream_invoices_zip,
+)
+from backend.models import Client, Invoice, InvoiceExport, InvoicePDF, User
+from tests.handler import make_invoice
+
+
+class InvoicePDFExportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        self.storage = FileSystemStorage(location=self.media.name)
+        for storage_patch in (
+            mock.patch.object(InvoicePDF._meta.get_field("file"), "storage", self.storage),
+            mock.patch.object(export_pdfs, "_private_storage", return_value=self.storage),
+        ):
+            storage_patch.start()
+            self.addCleanup(storage_patch.stop)
+
+    def make_invoice(self, issued: date, **kwargs) -> Invoice:
+        return make_invoice(self.user, date_issued=issued, **kwargs)
+
+    def export(self, invoices, **kwargs) -> zipfile.ZipFile:
+        return zipfile.ZipFile(io.BytesIO(b"".join(stream_invoices_zip(invoices, **kwargs))))
+
+    def test_filters(self):
+        client = baker.make(Client, user=self.user, name="Globex")
+        match = self.make_invoice(date(2024, 2, 1), status="paid", client_to=client)
+        self.make_invoice(date(2024, 2, 1), status="draft", client_to=client)
+        self.make_invoice(date(2023, 2, 1), status="paid", client_to=client)
+        self.make_invoice(date(2024, 2, 1), status="paid")
+
+        invoices = export_invoices_queryset(self.user, date(2024, 1, 1), date(2024, 12, 31), ["paid"], client.pk)
+
+        self.assertEqual(list(invoices), [match])
+
+    @mock.patch.object(export_pdfs, "html_to_pdf", return_value=b"%PDF-1.4")
+    def test_zip_contains_every_invoice_and_reuses_the_cache(self, html_to_pdf):
+        invoices = [self.make_invoice(date(2024, 1, day)) for day in (3, 1, 2)]
+        progress = []
+
+        archive = self.export(
+            export_invoices_queryset(self.user), workers=1, on_progress=lambda done, total: progress.append((done, total))
+        )
+
+        ordered = sorted(invoices, key=lambda invoice: invoice.date_issued)
+        self.assertEqual(archive.namelist(), [f"invoice_{invoice.id}.pdf" for invoice in ordered])
+        self.assertEqual(archive.read(f"invoice_{ordered[0].id}.pdf"), b"%PDF-1.4")
+        self.assertEqual(progress, [(0, 3), (3, 3)])
+
+        self.export(export_invoices_queryset(self.user), workers=1)
+        self.assertEqual(html_to_pdf.call_count, 3)
+
+    @mock.patch.object(export_pdfs, "html_to_pdf", return_value=None)
+    def test_failed_renders_are_listed(self, html_to_pdf):
+        invoice = self.make_invoice(date(2024, 1, 1))
+
+        archive = self.export(export_invoices_queryset(self.user), workers=1)
+
+        self.assertEqual(archive.namelist(), ["failed.txt"])
+        self.assertIn(f"#{invoice.id}", archive.read("failed.txt").decode())
+
+    def test_renders_in_a_process_pool(self):
+        invoices = [self.make_invoice(date(2024, 1, day)) for day in (1, 2)]
+
+        archive = self.export(export_invoices_queryset(self.user), workers=2)
+
+        self.assertEqual(archive.namelist(), [f"invoice_{invoice.id}.pdf" for invoice in invoices])
+        self.assertTrue(archive.read(f"invoice_{invoices[0].id}.pdf").startswith(b"%PDF"))
+        self.assertEqual(InvoicePDF.objects.count(), 2)
+
+    def test_exports_share_one_pool(self):
+        self.assertIs(get_render_pool(2), get_render_pool(2))
+
+    @mock.patch.object(export_pdfs, "html_to_pdf", return_value=b"%PDF-1.4")
+    def test_task_stores_the_zip_and_records_it(self, html_to_pdf):
+        invoice = self.make_invoice(date(2024, 3, 1))
+        self.make_invoice(date(2023, 3, 1))
+        export_id = str(InvoiceExport.objects.create(owner=self.user, filename="invoices.zip").pk)
+
+        export_invoices_task(export_id, start_date="2024-01-01")
+
+        export = get_export(export_id, self.user)
+        self.assertEqual((export.done, export.total, export.finished), (1, 1, True))
+        with open_export_file(export) as file:
+            self.assertEqual(zipfile.ZipFile(file).namelist(), [f"invoice_{invoice.id}.pdf"])
+
+        other = User.objects.create_user(username="other", email="other@example.com", password="password")
+        self.assertIsNone(get_export(export_id, other))
+        self.assertIsNone(get_export("not-a-uuid", self.user))
+
+    @mock.patch.object(export_pdfs, "html_to_pdf", side_effect=RuntimeError)
+    def test_task_records_failures(self, html_to_pdf):
+        self.make_invoice(date(2024, 3, 1))
+        export = InvoiceExport.objects.create(owner=self.user, filename="invoices.zip")
+
+        with self.assertRaises(RuntimeError):
+            export_invoices_task(str(export.pk))
+
+        export.refresh_from_db()
+        self.assertTrue(export.failed)
+
+    @mock.patch.object(export_pdfs, "html_to_pdf", return_value=b"%PDF-1.4")
+    def test_expired_exports_are_deleted(self, html_to_pdf):
+        expired = InvoiceExport.objects.create(owner=self.user, filename="invoices.zip")
+        expired.file_path = self.storage.save(f"{export_pdfs.EXPORT_FOLDER}/{expired.pk}.zip", io.BytesIO(b"zip"))
+        expired.save()
+        InvoiceExport.objects.filter(pk=expired.pk).update(created_at=timezone.now() - timedelta(seconds=export_pdfs.EXPORT_TIMEOUT + 1))
+        export = InvoiceExport.objects.create(owner=self.user, filename="invoices.zip")
+
+        export_invoices_task(str(export.pk))
+
+        self.assertEqual(list(InvoiceExport.objects.values_list("pk", flat=True)), [export.pk])
+        self.assertFalse(self.storage.exists(expired.file_path))
+
+    @mock.patch.object(export_pdfs, "html_to_pdf", return_value=b"%PDF-1.4")
+    def test_command_writes_the_zip(self, html_to_pdf):
+        invoice = self.make_invoice(date(2024, 1, 1), status="paid")
+        self.make_invoice(date(2024, 1, 1), status="draft")
+        output = os.path.join(self.media.name, "export.zip")
+
+        call_command(ExportInvoicePDFsCommand(), user=self.user.pk, output=output, status=["paid"], workers=1, stdout=io.StringIO())
+
+        self.assertEqual(zipfile.ZipFile(output).namelist(), [f"invoice_{invoice.id}.pdf"])
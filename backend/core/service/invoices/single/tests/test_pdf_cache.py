@@ -0,0 +1,75 @@
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, TestCase, override_settings
+
+from backend.core.service.invoices.single import create_pdf
+from backend.core.service.invoices.single.pdf_cache import evict_invoice_pdfs
+from backend.models import InvoiceItem, InvoicePDF, User
+from tests.handler import make_invoice
+
+
+class InvoicePDFCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+        self.invoice = make_invoice(self.user, client_name="Globex")
+
+        self.media = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media.cleanup)
+        storage_patch = mock.patch.object(InvoicePDF._meta.get_field("file"), "storage", FileSystemStorage(location=self.media.name))
+        storage_patch.start()
+        self.addCleanup(storage_patch.stop)
+
+        render_patch = mock.patch.object(create_pdf, "render_pdf_bytes", return_value=b"%PDF-1.4 rendered")
+        self.render = render_patch.start()
+        self.addCleanup(render_patch.stop)
+
+    def download(self, **headers):
+        self.invoice.refresh_from_db()
+        return create_pdf.generate_pdf(self.invoice, "attachment", RequestFactory().get("/", **headers))
+
+    def test_unchanged_invoice_is_rendered_once(self):
+        first = self.download()
+        second = self.download()
+
+        self.assertEqual(self.render.call_count, 1)
+        self.assertEqual(first.content, b"%PDF-1.4 rendered")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_changes_invalidate_the_cached_pdf(self):
+        first = self.download()
+
+        self.invoice.items.add(InvoiceItem.objects.create(name="extra", description="extra", is_service=False, price=Decimal("5")))
+        second = self.download()
+
+        self.invoice.notes = "Thanks!"
+        self.invoice.save()
+        self.assertFalse(InvoicePDF.objects.exists())
+        self.download()
+
+        self.assertEqual(self.render.call_count, 3)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertEqual(InvoicePDF.objects.count(), 1)
+
+    def test_conditional_requests_get_not_modified(self):
+        first = self.download()
+
+        self.assertEqual(self.download(HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        self.assertEqual(self.download(HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code, 304)
+        self.assertEqual(self.download(HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    @override_settings(INVOICE_PDF_CACHE_MAX_BYTES=20)
+    def test_least_recently_used_pdfs_are_evicted(self):
+        self.download()
+        older_file = InvoicePDF.objects.get().file.name
+
+        self.invoice = make_invoice(self.user, price=None)
+        self.download()
+
+        self.assertEqual(list(InvoicePDF.objects.values_list("invoice_id", flat=True)), [self.invoice.pk])
+        self.assertFalse(os.path.exists(os.path.join(self.media.name, older_file)))
+        self.assertEqual(evict_invoice_pdfs(0), 1)
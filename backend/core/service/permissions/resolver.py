@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCacheClient
+
+from backend.core.api.public.permissions import SCOPES, SCOPES_TREE
+from backend.models import Organization, TeamMemberPermission
+
+cache: RedisCacheClient = cache  # type: ignore[no-redef]
+
+TEAM_SCOPES_TIMEOUT = 60 * 60
+
+# cached when a member has no TeamMemberPermission row, so "no permissions" is remembered too
+_NO_PERMISSIONS = "-"
+
+
+@lru_cache(maxsize=512)
+def _expand(scopes: frozenset[str]) -> frozenset[str]:
+    expanded: set[str] = set()
+    for scope in scopes:
+        expanded |= SCOPES_TREE.get(scope, {scope})
+    return frozenset(expanded)
+
+
+def expand_scopes(scopes: Iterable[str]) -> frozenset[str]:
+    """
+    Returns every scope granted by `scopes` once SCOPES_TREE implications are applied (e.g. invoices:write -> invoices:read)
+    """
+    return _expand(frozenset(scopes))
+
+
+def normalize_required_scopes(scopes: str | Iterable[str]) -> frozenset[str]:
+    return frozenset([scopes]) if isinstance(scopes, str) else frozenset(scopes)
+
+
+def _cache_key(team_id: int, user_id: int) -> str:
+    return f"myfinances:permissions:team:{team_id}:user:{user_id}"
+
+
+def get_team_member_scopes(team: Organization, user_id: int | None) -> frozenset[str] | None:
+    """
+    The effective scopes the user has inside `team`, or None if they have no permission entry at all.
+
+    The team leader holds every scope. Members are read from the shared cache, so steady-state checks cost no queries;
+    the cache is invalidated whenever a TeamMemberPermission row is saved or deleted.
+    """
+    if user_id is None:
+        return None
+
+    if team.leader_id == user_id:
+        return frozenset(SCOPES)
+
+    key = _cache_key(team.pk, user_id)
+    cached = cache.get(key)
+
+    if cached is None:
+        permission = TeamMemberPermission.objects.filter(team_id=team.pk, user_id=user_id).values_list("scopes", flat=True).first()
+        cached = tuple(sorted(expand_scopes(permission))) if permission is not None else _NO_PERMISSIONS
+        cache.set(key, cached, timeout=TEAM_SCOPES_TIMEOUT)
+
+    return None if cached == _NO_PERMISSIONS else frozenset(cached)
+
+
+def missing_team_scopes(team: Organization, user_id: int | None, scopes: str | Iterable[str]) -> frozenset[str] | None:
+    """
+    Returns the required scopes the member lacks (empty when allowed), or None if they have no permissions in the team
+    """
+    granted = get_team_member_scopes(team, user_id)
+    if granted is None:
+        return None
+    return normalize_required_scopes(scopes) - granted
+
+
+def has_team_scopes(team: Organization, user_id: int | None, scopes: str | Iterable[str]) -> bool:
+    return missing_team_scopes(team, user_id, scopes) == frozenset()
+
+
+def invalidate_team_member_scopes(team_id: int | None, user_id: int | None) -> None:
+    if team_id is not None and user_id is not None:
+        cache.delete(_cache_key(team_id, user_id))
@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from backend.core.api.public.permissions import SCOPES
+from backend.core.service.permissions.resolver import expand_scopes, get_team_member_scopes, has_team_scopes, missing_team_scopes
+from backend.core.service.teams.permissions import edit_member_permissions
+from backend.models import Organization, TeamMemberPermission, User
+
+
+class PermissionResolverTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.leader = User.objects.create_user(username="leader", email="leader@example.com", password="password")
+        self.member = User.objects.create_user(username="member", email="member@example.com", password="password")
+        self.team = Organization.objects.create(name="Team", leader=self.leader)
+        self.team.members.add(self.member)
+
+    def test_expand_scopes_applies_scopes_tree(self):
+        self.assertEqual(expand_scopes(["invoices:write", "team:kick"]), {"invoices:read", "invoices:write", "team:kick", "team:invite"})
+
+    def test_leader_has_every_scope_without_queries(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(get_team_member_scopes(self.team, self.leader.pk), frozenset(SCOPES))
+
+    def test_member_scopes_are_cached(self):
+        TeamMemberPermission.objects.create(team=self.team, user=self.member, scopes=["clients:write"])
+
+        with self.assertNumQueries(1):
+            self.assertTrue(has_team_scopes(self.team, self.member.pk, "clients:read"))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(has_team_scopes(self.team, self.member.pk, ["clients:read", "clients:write"]))
+            self.assertEqual(missing_team_scopes(self.team, self.member.pk, ["clients:write", "invoices:read"]), {"invoices:read"})
+
+    def test_missing_permission_row_is_cached(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(get_team_member_scopes(self.team, self.member.pk))
+
+        with self.assertNumQueries(0):
+            self.assertFalse(has_team_scopes(self.team, self.member.pk, "clients:read"))
+
+    def test_editing_permissions_invalidates_cache(self):
+        self.assertFalse(has_team_scopes(self.team, self.member.pk, "invoices:read"))
+
+        self.assertTrue(edit_member_permissions(self.member, self.team, ["invoices:read"]).success)
+        self.assertTrue(has_team_scopes(self.team, self.member.pk, "invoices:read"))
+
+        self.assertTrue(edit_member_permissions(self.member, self.team, []).success)
+        self.assertFalse(has_team_scopes(self.team, self.member.pk, "invoices:read"))
+
+    def test_deleting_permissions_invalidates_cache(self):
+        permission = TeamMemberPermission.objects.create(team=self.team, user=self.member, scopes=["clients:read"])
+        self.assertTrue(has_team_scopes(self.team, self.member.pk, "clients:read"))
+
+        permission.delete()
+
+        self.assertIsNone(get_team_member_scopes(self.team, self.member.pk))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from backend.core.models import OwnerBase
+from backend.models import User, Organization, Invoice, Receipt, MonthlyReport, ReportDayBucket
+
+# (owner field, owner id), e.g. ("user_id", 3) - lets signal handlers group rows without loading the owner
+OwnerKey = tuple[str, int]
+
+REPORT_HEADER_FIELDS = ("payments_in", "payments_out", "profit", "invoices_sent", "recurring_customers")
+
+
+def owner_key(obj: User | Organization | OwnerBase) -> OwnerKey:
+    if isinstance(obj, User):
+        return "user_id", obj.pk
+    if isinstance(obj, Organization):
+        return "organization_id", obj.pk
+    if obj.user_id:
+        return "user_id", obj.user_id
+    return "organization_id", obj.organization_id
+
+
+@transaction.atomic
+def refresh_report_buckets(owner: OwnerKey, days: Iterable[date | None]) -> None:
+    """
+    Recomputes the buckets of the given days from their invoices and receipts.
+    A constant four queries however many days are passed; days without activity lose their bucket.
+    Buckets are upserted, so concurrent refreshes of the same day never both insert it.
+    """
+    days = {day for day in days if day}
+    if not days:
+        return
+
+    owner_filter = {owner[0]: owner[1]}
+    buckets: dict[date, ReportDayBucket] = {}
+
+    def bucket(day: date) -> ReportDayBucket:
+        if day not in buckets:
+            buckets[day] = ReportDayBucket(date=day, **owner_filter)
+        return buckets[day]
+
+    invoice_days = (
+        Invoice.objects.filter(date_issued__in=days, **owner_filter)
+        .values("date_issued")
+        .annotate(
+            payments_in=Sum("total", filter=Q(total__gt=0), default=Decimal(0)),
+            invoices_sent=Count("id"),
+            recurring_invoices=Count("id", filter=Q(invoice_recurring_profile__isnull=False)),
+        )
+    )
+    for row in invoice_days:
+        day = bucket(row["date_issued"])
+        day.payments_in, day.invoices_sent, day.recurring_invoices = row["payments_in"], row["invoices_sent"], row["recurring_invoices"]
+
+    receipt_days = Receipt.objects.filter(date__in=days, **owner_filter).values("date").annotate(payments_out=Sum("total_price"))
+    for row in receipt_days:
+        bucket(row["date"]).payments_out = round(Decimal(row["payments_out"] or 0), 2)
+
+    ReportDayBucket.objects.bulk_create(
+        buckets.values(),
+        update_conflicts=True,
+        unique_fields=[owner[0].removesuffix("_id"), "date"],
+        update_fields=["payments_in", "payments_out", "invoices_sent", "recurring_invoices"],
+    )
+    if empty_days := days - buckets.keys():
+        ReportDayBucket.objects.filter(date__in=empty_days, **owner_filter).delete()
+
+
+def refresh_report_buckets_for(objects: Iterable[Invoice | Receipt], date_field: str) -> None:
+    days_by_owner: dict[OwnerKey, set[date]] = defaultdict(set)
+    for obj in objects:
+        days_by_owner[owner_key(obj)].add(getattr(obj, date_field))
+
+    for owner, days in days_by_owner.items():
+        refresh_report_buckets(owner, days)
+
+
+def rebuild_report_buckets(owner: User | Organization) -> None:
+    owner_filter = dict([owner_key(owner)])
+    days = {
+        *Invoice.objects.filter(date_issued__isnull=False, **owner_filter).values_list("date_issued", flat=True).distinct(),
+        *Receipt.objects.filter(date__isnull=False, **owner_filter).values_list("date", flat=True).distinct(),
+    }
+
+    with transaction.atomic():
+        ReportDayBucket.objects.filter(**owner_filter).exclude(date__in=days).delete()
+        refresh_report_buckets(owner_key(owner), days)
+
+
+def sum_report_buckets(owner: User | Organization | OwnerBase, start_date: date | str, end_date: date | str) -> dict[str, Decimal | int]:
+    """
+    Report header figures for any date range, in one query over the day buckets
+    """
+    owner_filter = dict([owner_key(owner)])
+    totals = ReportDayBucket.objects.filter(date__gte=start_date, date__lte=end_date, **owner_filter).aggregate(
+        payments_in=Sum("payments_in", default=Decimal(0)),
+        payments_out=Sum("payments_out", default=Decimal(0)),
+        invoices_sent=Sum("invoices_sent", default=0),
+        recurring_customers=Sum("recurring_invoices", default=0),
+    )
+    totals["profit"] = totals["payments_in"] - totals["payments_out"]
+    return totals
+
+
+def refresh_live_report(report: MonthlyReport) -> MonthlyReport:
+    """
+    Brings a live report's header up to date from the buckets, only writing when a figure changed
+    """
+    if not report.live:
+        return report
+
+    totals = sum_report_buckets(report, report.start_date, report.end_date)
+    if changed := [field for field in REPORT_HEADER_FIELDS if getattr(report, field) != totals[field]]:
+        for field in changed:
+            setattr(report, field, totals[field])
+        report.save(update_fields=changed)
+
+    return report
@@ -2,50 +2,105 @@ from datetime import date
 from decimal import Decimal
 
 from django.db import transaction
+from django.db.models import Count, Q, QuerySet, Sum
 
-from backend.models import User, Organization, Invoice, MonthlyReport, MonthlyReportRow
+from backend.models import User, Organization, Invoice, MonthlyReport, MonthlyReportRow, Receipt
+from backend.core.service.reports.buckets import sum_report_buckets
 from backend.core.utils.dataclasses import BaseServiceResponse
 
+# rows (and their M2M links) are inserted this many at a time
+REPORT_ROW_BATCH_SIZE = 1000
+
+REPORT_ROW_FIELDS = ("id", "date_issued", "date_created", "reference", "client_to_id", "client_name", "total")
+REPORT_RECEIPT_ROW_FIELDS = ("id", "date", "name", "merchant_store", "total_price")
+
 
 class GenerateReportServiceResponse(BaseServiceResponse[MonthlyReport]): ...
 
 
-@transaction.atomic
-def generate_report(
-    actor: User | Organization, start_date: date | str, end_date: date | str, name: str | None = None
-) -> GenerateReportServiceResponse:
-    all_invoices = Invoice.filter_by_owner(actor).filter(date_issued__gte=start_date, date_issued__lte=end_date).all()
+def report_invoices(actor: User | Organization, start_date: date | str, end_date: date | str) -> QuerySet[Invoice]:
+    return Invoice.filter_by_owner(actor).filter(date_issued__gte=start_date, date_issued__lte=end_date)
 
-    created_report = MonthlyReport.objects.create(owner=actor, start_date=start_date, end_date=end_date, name=name)  # type: ignore[misc]
 
-    report_items = []
+def report_receipts(actor: User | Organization, start_date: date | str, end_date: date | str) -> QuerySet[Receipt]:
+    return Receipt.filter_by_owner(actor).filter(date__gte=start_date, date__lte=end_date)
 
-    for invoice in all_invoices:
-        row = MonthlyReportRow(
-            date=invoice.date_issued or invoice.date_created,
-            reference_number=invoice.reference or invoice.id,
-            item_type="invoice",
-            paid_in=invoice.get_total_price(),
-        )
 
-        if invoice.client_to:
-            row.client = invoice.client_to
-        else:
-            row.client_name = invoice.client_name
+def aggregate_report_totals(invoices: QuerySet[Invoice], receipts: QuerySet[Receipt]) -> dict[str, Decimal | int]:
+    """
+    Header figures of a report in one grouped query each for invoices and receipts.
+    Receipts are paid out, the same as in the day buckets live reports are summed from.
+    """
+    totals = invoices.aggregate(
+        payments_in=Sum("total", filter=Q(total__gt=0), default=Decimal(0)),
+        profit=Sum("total", default=Decimal(0)),
+        invoices_sent=Count("id"),
+        recurring_customers=Count("id", filter=Q(invoice_recurring_profile__isnull=False)),
+    )
+    totals["payments_out"] = round(Decimal(receipts.aggregate(total=Sum("total_price"))["total"] or 0), 2)
+    totals["profit"] -= totals["payments_out"]
+    return totals
+
 
-        created_report.payments_in += max(row.paid_in, Decimal(0))
-        created_report.profit += row.paid_in - row.paid_out
-        created_report.invoices_sent += 1
+def build_report_row(invoice: dict) -> MonthlyReportRow:
+    row = MonthlyReportRow(
+        date=invoice["date_issued"] or invoice["date_created"],
+        reference_number=invoice["reference"] or invoice["id"],
+        item_type="invoice",
+        paid_in=invoice["total"],
+    )
 
-        if invoice.invoice_recurring_profile_id:
-            created_report.recurring_customers += 1
+    if invoice["client_to_id"]:
+        row.client_id = invoice["client_to_id"]
+    else:
+        row.client_name = invoice["client_name"]
 
-        report_items.append(row)
+    return row
 
-    report_item_objs: list[MonthlyReportRow] = MonthlyReportRow.objects.bulk_create(report_items, batch_size=30)
 
-    created_report.save()
-    created_report.items.set(report_item_objs)
-    created_report.save()
+def build_receipt_report_row(receipt: dict) -> MonthlyReportRow:
+    return MonthlyReportRow(
+        date=receipt["date"],
+        reference_number=receipt["name"] or receipt["id"],
+        item_type="receipt",
+        client_name=(receipt["merchant_store"] or "")[:64] or None,
+        paid_out=round(Decimal(receipt["total_price"] or 0), 2),
+    )
+
+
+@transaction.atomic
+def generate_report(
+    actor: User | Organization, start_date: date | str, end_date: date | str, name: str | None = None, live: bool = False
+) -> GenerateReportServiceResponse:
+    if live:
+        # live reports keep no rows, their header is summed from the day buckets whenever they're opened
+        totals = sum_report_buckets(actor, start_date, end_date)
+        created_report = MonthlyReport.objects.create(
+            owner=actor, start_date=start_date, end_date=end_date, name=name, live=True, **totals  # type: ignore[misc]
+        )
+        return GenerateReportServiceResponse(success=True, response=created_report)
+
+    invoices = report_invoices(actor, start_date, end_date)
+    receipts = report_receipts(actor, start_date, end_date)
+
+    created_report = MonthlyReport.objects.create(
+        owner=actor, start_date=start_date, end_date=end_date, name=name, **aggregate_report_totals(invoices, receipts)  # type: ignore[misc]
+    )
+
+    report_items = [
+        build_report_row(invoice)
+        for invoice in invoices.order_by("date_issued", "id").values(*REPORT_ROW_FIELDS).iterator(chunk_size=REPORT_ROW_BATCH_SIZE)
+    ]
+    report_items += [
+        build_receipt_report_row(receipt)
+        for receipt in receipts.order_by("date", "id").values(*REPORT_RECEIPT_ROW_FIELDS).iterator(chunk_size=REPORT_ROW_BATCH_SIZE)
+    ]
+    report_item_objs: list[MonthlyReportRow] = MonthlyReportRow.objects.bulk_create(report_items, batch_size=REPORT_ROW_BATCH_SIZE)
+
+    ReportItemLink = MonthlyReport.items.through
+    ReportItemLink.objects.bulk_create(
+        [ReportItemLink(monthlyreport_id=created_report.pk, monthlyreportrow_id=row.pk) for row in report_item_objs],
+        batch_size=REPORT_ROW_BATCH_SIZE,
+    )
 
     return GenerateReportServiceResponse(success=True, response=created_report)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+from typing import Literal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from backend.core.models import OwnerBase
+from backend.core.service.reports.buckets import OwnerKey, owner_key
+from backend.models import User, Organization, Invoice, RevenueRollup
+
+REVENUE_FIELDS = ("invoiced", "paid", "outstanding", "overdue", "invoice_count")
+RevenueInterval = Literal["day", "month"]
+
+
+@transaction.atomic
+def refresh_revenue_rollup(owner: OwnerKey, days: Iterable[date | None]) -> None:
+    """
+    Recomputes the rollup rows of the given issue days, at most four queries however many days are passed.
+    Rows are upserted, so concurrent refreshes of the same day never both insert it.
+    """
+    days = {day for day in days if day}
+    if not days:
+        return
+
+    owner_filter = {owner[0]: owner[1]}
+    today = timezone.now().date()
+
+    rows = (
+        Invoice.objects.filter(date_issued__in=days, **owner_filter)
+        .values("date_issued", "currency", "status")
+        .annotate(
+            invoiced=Sum("total", default=Decimal(0)),
+            invoice_count=Count("id"),
+            overdue=Sum("total", filter=Q(status="pending", date_due__lt=today), default=Decimal(0)),
+        )
+    )
+
+    rollups = RevenueRollup.objects.bulk_create(
+        [
+            RevenueRollup(
+                day=row["date_issued"],
+                currency=row["currency"],
+                status=row["status"],
+                invoiced=row["invoiced"],
+                paid=row["invoiced"] if row["status"] == "paid" else Decimal(0),
+                outstanding=row["invoiced"] if row["status"] == "pending" else Decimal(0),
+                overdue=row["overdue"],
+                invoice_count=row["invoice_count"],
+                **owner_filter,
+            )
+            for row in rows
+        ],
+        update_conflicts=True,
+        unique_fields=[owner[0].removesuffix("_id"), "day", "currency", "status"],
+        update_fields=["invoiced", "paid", "outstanding", "overdue", "invoice_count"],
+    )
+
+    # currencies and statuses no longer issued on these days
+    kept = {(rollup.day, rollup.currency, rollup.status) for rollup in rollups}
+    existing = RevenueRollup.objects.filter(day__in=days, **owner_filter).values_list("pk", "day", "currency", "status")
+    if stale := [pk for pk, *key in existing if tuple(key) not in kept]:
+        RevenueRollup.objects.filter(pk__in=stale).delete()
+
+
+def refresh_revenue_rollup_for(invoices: Iterable[Invoice]) -> None:
+    days_by_owner: dict[OwnerKey, set[date]] = defaultdict(set)
+    for invoice in invoices:
+        days_by_owner[owner_key(invoice)].add(invoice.date_issued)
+
+    for owner, days in days_by_owner.items():
+        refresh_revenue_rollup(owner, days)
+
+
+def rebuild_revenue_rollup(owner: User | Organization) -> None:
+    owner_filter = dict([owner_key(owner)])
+    days = set(Invoice.objects.filter(date_issued__isnull=False, **owner_filter).values_list("date_issued", flat=True).distinct())
+
+    with transaction.atomic():
+        RevenueRollup.objects.filter(**owner_filter).exclude(day__in=days).delete()
+        refresh_revenue_rollup(owner_key(owner), days)
+
+
+def refresh_overdue_revenue_rollups() -> int:
+    """
+    Invoices become overdue with time rather than with a save, so this recomputes the days that still have pending
+    invoices not yet counted as overdue. Meant to be run daily, returns how many owner days were refreshed.
+    """
+    today = timezone.now().date()
+    stale = (
+        Invoice.objects.filter(status="pending", date_due__lt=today, date_issued__isnull=False)
+        .values_list("user_id", "organization_id", "date_issued", "currency")
+        .distinct()
+    )
+    already_overdue = set(
+        RevenueRollup.objects.filter(status="pending", overdue=F("outstanding")).values_list(
+            "user_id", "organization_id", "day", "currency"
+        )
+    )
+
+    days_by_owner: dict[OwnerKey, set[date]] = defaultdict(set)
+    for user_id, organization_id, day, currency in stale:
+        if (user_id, organization_id, day, currency) in already_overdue:
+            continue
+        days_by_owner[("user_id", user_id) if user_id else ("organization_id", organization_id)].add(day)
+
+    for owner, days in days_by_owner.items():
+        refresh_revenue_rollup(owner, days)
+
+    return sum(len(days) for days in days_by_owner.values())
+
+
+def revenue_series(
+    owner: User | Organization | OwnerBase,
+    start_date: date,
+    end_date: date,
+    interval: RevenueInterval = "month",
+    currency: str | None = None,
+) -> dict[str, list[dict]]:
+    """
+    Time series of the revenue figures per currency, one query over the rollup
+    """
+    rollups = RevenueRollup.objects.filter(day__gte=start_date, day__lte=end_date, **dict([owner_key(owner)]))
+    if currency:
+        rollups = rollups.filter(currency=currency)
+
+    period = TruncMonth("day") if interval == "month" else F("day")
+    rows = (
+        rollups.annotate(period=period)
+        .values("currency", "period")
+        .annotate(**{field: Sum(field) for field in REVENUE_FIELDS})
+        .order_by("currency", "period")
+    )
+
+    series: dict[str, list[dict]] = defaultdict(list)
+    for row in rows:
+        series[row.pop("currency")].append(row)
+    return dict(series)
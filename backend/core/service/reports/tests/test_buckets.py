@@ -0,0 +1,113 @@
+from datetime import date
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+from model_bakery import baker
+
+from backend.core.service.reports.buckets import (
+    owner_key,
+    rebuild_report_buckets,
+    refresh_live_report,
+    refresh_report_buckets,
+    sum_report_buckets,
+)
+from backend.core.service.reports.generate import generate_report
+from backend.models import Invoice, Receipt, ReportDayBucket, User
+from tests.handler import make_invoice
+
+
+class ReportBucketTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+
+    def make_invoice(self, price: str, issued: date, **kwargs) -> Invoice:
+        return make_invoice(self.user, price, date_issued=issued, **kwargs)
+
+    def bucket(self, day: date) -> ReportDayBucket | None:
+        return ReportDayBucket.filter_by_owner(self.user).filter(date=day).first()
+
+    def test_invoices_and_receipts_fill_day_buckets(self):
+        self.make_invoice("100", date(2024, 1, 5))
+        self.make_invoice("50", date(2024, 1, 5))
+        baker.make(Receipt, user=self.user, date=date(2024, 1, 5), total_price=30.5)
+
+        bucket = self.bucket(date(2024, 1, 5))
+        self.assertEqual((bucket.payments_in, bucket.payments_out, bucket.invoices_sent), (Decimal("150"), Decimal("30.50"), 2))
+
+    def test_editing_moving_and_deleting_invoices_updates_buckets(self):
+        invoice = self.make_invoice("100", date(2024, 1, 5))
+
+        item = invoice.items.get()
+        item.price = Decimal("80")
+        item.save()
+        self.assertEqual(self.bucket(date(2024, 1, 5)).payments_in, Decimal("80"))
+
+        invoice.refresh_from_db()
+        invoice.date_issued = date(2024, 1, 6)
+        invoice.save()
+        self.assertIsNone(self.bucket(date(2024, 1, 5)))
+        self.assertEqual(self.bucket(date(2024, 1, 6)).payments_in, Decimal("80"))
+
+        invoice.delete()
+        self.assertFalse(ReportDayBucket.filter_by_owner(self.user).exists())
+
+    def test_refresh_updates_a_bucket_written_concurrently(self):
+        self.make_invoice("100", date(2024, 1, 5))
+        # as if another transaction had inserted the day's bucket first
+        ReportDayBucket.objects.filter(user=self.user).update(payments_in=Decimal("1"))
+
+        refresh_report_buckets(owner_key(self.user), [date(2024, 1, 5), date(2024, 1, 6)])
+
+        self.assertEqual(
+            list(ReportDayBucket.filter_by_owner(self.user).values_list("date", "payments_in")), [(date(2024, 1, 5), Decimal("100"))]
+        )
+
+    def test_sum_is_one_query(self):
+        self.make_invoice("100", date(2024, 1, 5))
+        self.make_invoice("40", date(2024, 2, 5), invoice_recurring_profile=baker.make("backend.InvoiceRecurringProfile", user=self.user))
+        baker.make(Receipt, user=self.user, date=date(2024, 2, 1), total_price=15)
+
+        with self.assertNumQueries(1):
+            totals = sum_report_buckets(self.user, "2024-01-01", "2024-12-31")
+
+        self.assertEqual(totals["payments_in"], Decimal("140"))
+        self.assertEqual(totals["profit"], Decimal("125"))
+        self.assertEqual((totals["invoices_sent"], totals["recurring_customers"]), (2, 1))
+
+    def test_live_report_follows_changes(self):
+        self.make_invoice("100", date(2024, 1, 5))
+        report = generate_report(self.user, "2024-01-01", "2024-01-31", live=True).response
+        self.assertEqual(report.payments_in, Decimal("100"))
+
+        self.make_invoice("25", date(2024, 1, 9))
+        refresh_live_report(report)
+
+        report.refresh_from_db()
+        self.assertEqual((report.payments_in, report.invoices_sent), (Decimal("125"), 2))
+        self.assertFalse(report.items.exists())
+
+    def test_rebuild_restores_buckets(self):
+        self.make_invoice("100", date(2024, 1, 5))
+        ReportDayBucket.objects.all().delete()
+
+        rebuild_report_buckets(self.user)
+
+        self.assertEqual(self.bucket(date(2024, 1, 5)).payments_in, Decimal("100"))
+
+    def test_migration_backfills_existing_buckets(self):
+        backfill = import_module("backend.migrations.0075_report_day_buckets").backfill_report_buckets
+        self.make_invoice("100", date(2024, 1, 5))
+        self.make_invoice("50", date(2024, 1, 5))
+        baker.make(Receipt, user=self.user, date=date(2024, 1, 5), total_price=30.5)
+        baker.make(Receipt, user=self.user, date=date(2024, 1, 6), total_price=10)
+        expected = list(ReportDayBucket.objects.order_by("date").values("date", "payments_in", "payments_out", "invoices_sent"))
+        ReportDayBucket.objects.all().delete()
+
+        backfill(django_apps, None)
+
+        self.assertEqual(
+            list(ReportDayBucket.objects.order_by("date").values("date", "payments_in", "payments_out", "invoices_sent")), expected
+        )
+        self.assertEqual(len(expected), 2)
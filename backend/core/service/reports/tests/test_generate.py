@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from model_bakery import baker
+
+from backend.core.service.reports.buckets import REPORT_HEADER_FIELDS
+from backend.core.service.reports.generate import generate_report
+from backend.models import Invoice, Receipt, User
+from tests.handler import make_invoice
+
+
+class GenerateReportTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+        self.client_obj = baker.make("backend.Client", user=self.user)
+
+    def make_invoice(self, price: str, issued: date, **kwargs) -> Invoice:
+        return make_invoice(self.user, price, date_issued=issued, **kwargs)
+
+    def test_rows_and_totals(self):
+        self.make_invoice("100", date(2024, 1, 5), client_to=self.client_obj, reference="INV-1")
+        self.make_invoice(
+            "50",
+            date(2024, 1, 20),
+            client_name="Walk in",
+            invoice_recurring_profile=baker.make("backend.InvoiceRecurringProfile", user=self.user),
+        )
+        self.make_invoice("999", date(2024, 3, 1))
+        baker.make(Receipt, user=self.user, date=date(2024, 1, 10), total_price=30.5, name="Paper", merchant_store="Staples")
+
+        report = generate_report(self.user, "2024-01-01", "2024-01-31", "January").response
+        report.refresh_from_db()
+
+        self.assertEqual((report.payments_in, report.payments_out, report.profit), (Decimal("150"), Decimal("30.50"), Decimal("119.50")))
+        self.assertEqual((report.invoices_sent, report.recurring_customers), (2, 1))
+
+        rows = list(report.items.order_by("date"))
+        self.assertEqual(
+            [(row.item_type, row.paid_in, row.paid_out) for row in rows],
+            [
+                ("invoice", Decimal("100"), Decimal("0")),
+                ("receipt", Decimal("0"), Decimal("30.50")),
+                ("invoice", Decimal("50"), Decimal("0")),
+            ],
+        )
+        self.assertEqual(rows[0].reference_number, "INV-1")
+        self.assertEqual(rows[0].client_id, self.client_obj.pk)
+        self.assertEqual((rows[1].reference_number, rows[1].client_name), ("Paper", "Staples"))
+        self.assertEqual(rows[2].client_name, "Walk in")
+
+    def test_snapshot_and_live_reports_agree(self):
+        self.make_invoice("100", date(2024, 1, 5), client_to=self.client_obj)
+        baker.make(Receipt, user=self.user, date=date(2024, 1, 6), total_price=12.25)
+
+        snapshot = generate_report(self.user, "2024-01-01", "2024-01-31").response
+        live = generate_report(self.user, "2024-01-01", "2024-01-31", live=True).response
+
+        self.assertEqual(
+            [getattr(snapshot, field) for field in REPORT_HEADER_FIELDS], [getattr(live, field) for field in REPORT_HEADER_FIELDS]
+        )
+
+    def test_query_count_does_not_grow_with_invoices(self):
+        for day in range(1, 4):
+            self.make_invoice("10", date(2024, 1, day), client_to=self.client_obj)
+
+        with self.assertNumQueries(9):
+            generate_report(self.user, "2024-01-01", "2024-01-31")
+
+        for day in range(4, 28):
+            self.make_invoice("10", date(2024, 1, day), client_to=self.client_obj)
+
+        with self.assertNumQueries(9):
+            report = generate_report(self.user, "2024-01-01", "2024-01-31").response
+
+        self.assertEqual(report.items.count(), 27)
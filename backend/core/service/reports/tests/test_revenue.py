@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+from django.utils import timezone
+
+from backend.core.service.reports.buckets import owner_key
+from backend.core.service.reports.revenue import (
+    REVENUE_FIELDS,
+    rebuild_revenue_rollup,
+    refresh_overdue_revenue_rollups,
+    refresh_revenue_rollup,
+    revenue_series,
+)
+from backend.models import Invoice, RevenueRollup, User
+from tests.handler import make_invoice
+
+
+class RevenueRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+
+    def make_invoice(self, price: str, issued: date, **kwargs) -> Invoice:
+        kwargs.setdefault("currency", "GBP")
+        return make_invoice(self.user, price, date_issued=issued, **kwargs)
+
+    def test_rollup_follows_invoice_changes(self):
+        invoice = self.make_invoice("100", date(2024, 1, 5), status="pending", date_due=date(2099, 1, 1))
+        self.make_invoice("40", date(2024, 1, 5), status="paid")
+
+        rows = {row.status: row for row in RevenueRollup.filter_by_owner(self.user)}
+        self.assertEqual((rows["pending"].outstanding, rows["paid"].paid), (Decimal("100"), Decimal("40")))
+
+        invoice.refresh_from_db()
+        invoice.set_status("paid")
+
+        self.assertEqual(RevenueRollup.filter_by_owner(self.user).get(status="paid").paid, Decimal("140"))
+        self.assertFalse(RevenueRollup.filter_by_owner(self.user).filter(status="pending").exists())
+
+    def test_refresh_updates_a_row_written_concurrently(self):
+        self.make_invoice("100", date(2024, 1, 5), status="paid")
+        # as if another transaction had inserted the day's row first
+        RevenueRollup.objects.filter(user=self.user).update(paid=Decimal("1"), invoice_count=5)
+
+        refresh_revenue_rollup(owner_key(self.user), [date(2024, 1, 5)])
+
+        row = RevenueRollup.filter_by_owner(self.user).get()
+        self.assertEqual((row.paid, row.invoice_count), (Decimal("100"), 1))
+
+    def test_series_groups_by_month_and_currency_in_one_query(self):
+        self.make_invoice("100", date(2024, 1, 5), status="paid")
+        self.make_invoice("50", date(2024, 1, 20), status="pending", date_due=date(2024, 2, 1))
+        self.make_invoice("10", date(2024, 2, 3), status="draft")
+        self.make_invoice("70", date(2024, 2, 3), status="paid", currency="USD")
+
+        with self.assertNumQueries(1):
+            series = revenue_series(self.user, date(2024, 1, 1), date(2024, 12, 31))
+
+        january, february = series["GBP"]
+        self.assertEqual(january["period"], date(2024, 1, 1))
+        self.assertEqual((january["invoiced"], january["paid"], january["overdue"]), (Decimal("150"), Decimal("100"), Decimal("50")))
+        self.assertEqual((february["invoiced"], february["invoice_count"]), (Decimal("10"), 1))
+        self.assertEqual(series["USD"][0]["paid"], Decimal("70"))
+
+    def test_invoices_becoming_overdue_are_picked_up(self):
+        tomorrow = timezone.now().date() + timedelta(days=1)
+        self.make_invoice("100", date(2024, 1, 5), status="pending", date_due=tomorrow)
+        self.assertEqual(RevenueRollup.filter_by_owner(self.user).get().overdue, Decimal("0"))
+
+        Invoice.objects.update(date_due=date(2024, 1, 6))  # as if time had passed
+
+        self.assertEqual(refresh_overdue_revenue_rollups(), 1)
+        self.assertEqual(RevenueRollup.filter_by_owner(self.user).get().overdue, Decimal("100"))
+        self.assertEqual(refresh_overdue_revenue_rollups(), 0)
+
+    def test_rebuild_restores_rollup(self):
+        self.make_invoice("100", date(2024, 1, 5), status="paid")
+        RevenueRollup.objects.all().delete()
+
+        rebuild_revenue_rollup(self.user)
+
+        self.assertEqual(RevenueRollup.filter_by_owner(self.user).get().paid, Decimal("100"))
+
+    def test_migration_backfills_existing_rollup(self):
+        backfill = import_module("backend.migrations.0076_revenue_rollup").backfill_revenue_rollup
+        self.make_invoice("100", date(2024, 1, 5), status="paid")
+        self.make_invoice("40", date(2024, 1, 5), status="pending", date_due=date(2024, 2, 5))
+        self.make_invoice("25", date(2024, 1, 5), status="paid", currency="USD")
+        fields = ("day", "currency", "status", *REVENUE_FIELDS)
+        expected = list(RevenueRollup.objects.order_by("currency", "status").values(*fields))
+        RevenueRollup.objects.all().delete()
+
+        backfill(django_apps, None)
+
+        self.assertEqual(list(RevenueRollup.objects.order_by("currency", "status").values(*fields)), expected)
+        self.assertEqual(len(expected), 3)
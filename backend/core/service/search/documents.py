@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+
+from django.db.models import Model, QuerySet
+
+from backend.models import Client, Invoice, InvoiceProduct, Receipt, SearchEntry
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    title: str
+    body: str
+
+
+@dataclass(frozen=True)
+class SearchKind:
+    model: type[Model]
+    build: Callable[[Model], SearchDocument]
+    # used when (re)indexing many rows, so building documents doesn't query per row
+    queryset: Callable[[], QuerySet]
+
+
+def _join(*values) -> str:
+    return " ".join(str(value) for value in values if value not in (None, ""))
+
+
+def _dates(*values: date | str | None) -> str:
+    # the ISO and dd/mm/YYYY forms the UI displays, plus an unpadded d/m/YYYY so "6" finds June
+    dates = [date.fromisoformat(value) if isinstance(value, str) else value for value in values if value]
+    return _join(*(f"{value.isoformat()} {value:%d/%m/%Y} {value.day}/{value.month}/{value.year}" for value in dates))
+
+
+def invoice_document(invoice: Invoice) -> SearchDocument:
+    client = invoice.client_to
+    client_name = (client.name if client else None) or invoice.client_name or "No Client"
+    return SearchDocument(
+        title=client_name,
+        body=_join(
+            f"Invoice {invoice.id}",
+            invoice.reference,
+            invoice.client_email,
+            invoice.client_company,
+            client and client.email,
+            client and client.company,
+            invoice.status,
+            _dates(invoice.date_issued, invoice.date_due),
+        ),
+    )
+
+
+def client_document(client: Client) -> SearchDocument:
+    return SearchDocument(
+        title=client.name,
+        body=_join(f"Client {client.id}", client.email, client.company, client.phone_number, client.city, client.country),
+    )
+
+
+def receipt_document(receipt: Receipt) -> SearchDocument:
+    return SearchDocument(
+        title=receipt.name,
+        body=_join(f"Receipt {receipt.id}", receipt.merchant_store, receipt.purchase_category, _dates(receipt.date)),
+    )
+
+
+def product_document(product: InvoiceProduct) -> SearchDocument:
+    return SearchDocument(title=product.name, body=_join(product.description, product.rate))
+
+
+SEARCH_KINDS: dict[str, SearchKind] = {
+    SearchEntry.Kinds.INVOICE: SearchKind(Invoice, invoice_document, lambda: Invoice.objects.select_related("client_to")),
+    SearchEntry.Kinds.CLIENT: SearchKind(Client, client_document, lambda: Client.objects.filter(active=True)),
+    SearchEntry.Kinds.RECEIPT: SearchKind(Receipt, receipt_document, lambda: Receipt.objects.all()),
+    SearchEntry.Kinds.PRODUCT: SearchKind(InvoiceProduct, product_document, lambda: InvoiceProduct.objects.all()),
+}
+
+SEARCH_KIND_BY_MODEL: dict[type[Model], str] = {kind.model: name for name, kind in SEARCH_KINDS.items()}
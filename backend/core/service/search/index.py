@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db import transaction
+from django.db.models import Model
+
+from backend.core.service.search.documents import SEARCH_KIND_BY_MODEL, SEARCH_KINDS
+from backend.models import Organization, SearchEntry, User
+
+REINDEX_BATCH_SIZE = 500
+
+
+@transaction.atomic
+def index_objects(objects: Iterable[Model]) -> None:
+    """
+    Writes the search entries of the given objects (all of one model), replacing any previous ones
+    """
+    objects = list(objects)
+    if not objects:
+        return
+
+    kind_name = SEARCH_KIND_BY_MODEL[type(objects[0])]
+    kind = SEARCH_KINDS[kind_name]
+    entries = []
+
+    for obj in objects:
+        document = kind.build(obj)
+        entries.append(
+            SearchEntry(
+                kind=kind_name,
+                object_id=obj.pk,
+                user_id=obj.user_id,
+                organization_id=obj.organization_id,
+                title=document.title[:200],
+                body=document.body,
+            )
+        )
+
+    SearchEntry.objects.filter(kind=kind_name, object_id__in=[obj.pk for obj in objects]).delete()
+    SearchEntry.objects.bulk_create(entries, batch_size=REINDEX_BATCH_SIZE)
+
+
+def remove_objects(kind: str, ids: Iterable[int]) -> None:
+    SearchEntry.objects.filter(kind=kind, object_id__in=list(ids)).delete()
+
+
+def rebuild_search_index(owner: User | Organization | None = None) -> int:
+    """
+    Re-indexes every searchable object (of one owner, or everyone), returns how many entries were written
+    """
+    written = 0
+
+    for kind_name, kind in SEARCH_KINDS.items():
+        objects = kind.queryset()
+        entries = SearchEntry.objects.filter(kind=kind_name)
+        if owner is not None:
+            owner_filter = {"user": owner} if isinstance(owner, User) else {"organization": owner}
+            objects, entries = objects.filter(**owner_filter), entries.filter(**owner_filter)
+
+        with transaction.atomic():
+            entries.delete()
+            batch: list[Model] = []
+            for obj in objects.iterator(chunk_size=REINDEX_BATCH_SIZE):
+                batch.append(obj)
+                if len(batch) == REINDEX_BATCH_SIZE:
+                    index_objects(batch)
+                    written, batch = written + len(batch), []
+            index_objects(batch)
+            written += len(batch)
+
+    return written
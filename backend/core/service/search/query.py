@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+from django.db import connection
+from django.db.models import Q
+
+from backend.models import Organization, SearchEntry, User
+
+DEFAULT_SEARCH_LIMIT = 20
+# per page search boxes filter their own querysets by the matching ids, this caps how many they pass to IN (...)
+MAX_FILTER_RESULTS = 1000
+# a search box never needs more than this many words, and it keeps the MATCH expression small
+MAX_SEARCH_TERMS = 8
+# titles (names) rank above matches that are only in the body
+TITLE_WEIGHT, BODY_WEIGHT = 10.0, 1.0
+
+
+def search_terms(text: str) -> list[str]:
+    return re.findall(r"\w+", text.lower())[:MAX_SEARCH_TERMS]
+
+
+def _owner_sql(owner: User | Organization) -> tuple[str, int]:
+    return ("e.user_id = %s", owner.pk) if isinstance(owner, User) else ("e.organization_id = %s", owner.pk)
+
+
+def _limit_sql(limit: int | None) -> str:
+    return f"LIMIT {int(limit)}" if limit is not None else ""
+
+
+def _sqlite_search(owner, terms, kinds, title_only, limit, column) -> list[int]:
+    # every term must match, as a prefix so results show up while typing
+    match = " ".join(f'"{term}"*' for term in terms)
+    if title_only:
+        match = f"title : ({match})"
+
+    owner_sql, owner_id = _owner_sql(owner)
+    sql = f"""
+        SELECT e.{column} FROM backend_searchentry_fts f JOIN backend_searchentry e ON e.id = f.rowid
+        WHERE backend_searchentry_fts MATCH %s AND {owner_sql} AND e.kind IN ({", ".join(["%s"] * len(kinds))})
+        ORDER BY bm25(backend_searchentry_fts, {TITLE_WEIGHT}, {BODY_WEIGHT}) {_limit_sql(limit)}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, owner_id, *kinds])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _postgres_search(owner, terms, kinds, title_only, limit, column) -> list[int]:
+    # must match the expressions of the GIN indexes in migration 0078
+    document = (
+        "to_tsvector('simple', e.title)"
+        if title_only
+        else "(setweight(to_tsvector('simple', e.title), 'A') || setweight(to_tsvector('simple', e.body), 'B'))"
+    )
+    query = " & ".join(f"{term}:*" for term in terms)
+
+    owner_sql, owner_id = _owner_sql(owner)
+    sql = f"""
+        SELECT e.{column} FROM backend_searchentry e
+        WHERE {document} @@ to_tsquery('simple', %s) AND {owner_sql} AND e.kind IN ({", ".join(["%s"] * len(kinds))})
+        ORDER BY ts_rank({document}, to_tsquery('simple', %s)) DESC {_limit_sql(limit)}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [query, owner_id, *kinds, query])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _fallback_search(owner, terms, kinds, title_only, limit, column) -> list[int]:
+    entries = SearchEntry.objects.filter(owner=owner, kind__in=kinds)
+    for term in terms:
+        entries = entries.filter(Q(title__icontains=term) if title_only else Q(title__icontains=term) | Q(body__icontains=term))
+    return list(entries.values_list(column, flat=True)[:limit])
+
+
+def _search(owner, text, kinds, title_only, limit, column) -> list[int]:
+    terms = search_terms(text)
+    if not terms:
+        return []
+
+    kinds = list(kinds or SearchEntry.Kinds.values)
+    search = {"sqlite": _sqlite_search, "postgresql": _postgres_search}.get(connection.vendor, _fallback_search)
+    return search(owner, terms, kinds, title_only, limit, column)
+
+
+def search_object_ids(
+    owner: User | Organization, text: str, kind: str, *, title_only: bool = False, limit: int | None = DEFAULT_SEARCH_LIMIT
+) -> list[int]:
+    """
+    Ranked ids of the owner's objects of one kind matching every word of the text (as prefixes), best match first.
+    Used by the per page search boxes to filter their own querysets.
+    """
+    return _search(owner, text, [kind], title_only, limit, "object_id")
+
+
+def search_entries(
+    owner: User | Organization, text: str, kinds: Iterable[str] | None = None, limit: int = DEFAULT_SEARCH_LIMIT
+) -> list[SearchEntry]:
+    """
+    Matching search entries across kinds, best match first (the global search). Two queries.
+    """
+    entry_ids = _search(owner, text, kinds, False, limit, "id")
+    entries = SearchEntry.objects.in_bulk(entry_ids)
+    return [entries[entry_id] for entry_id in entry_ids if entry_id in entries]
@@ -0,0 +1,92 @@
+from datetime import date
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from backend.core.management.commands.rebuild_search_index import Command as RebuildSearchIndexCommand
+from backend.core.service.search.query import search_entries, search_object_ids
+from backend.models import Client, Invoice, Receipt, SearchEntry, User
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+
+    def make_receipt(self, name: str, **kwargs) -> Receipt:
+        kwargs = {"date": date(2024, 6, 1), "merchant_store": None, "purchase_category": None, **kwargs}
+        return baker.make(Receipt, user=self.user, name=name, **kwargs)
+
+    def test_prefix_matching_and_every_word_required(self):
+        groceries = self.make_receipt("Weekly groceries", merchant_store="Corner Shop")
+        self.make_receipt("Weekly fuel")
+
+        kind = SearchEntry.Kinds.RECEIPT
+        self.assertEqual(search_object_ids(self.user, "groc", kind), [groceries.pk])
+        self.assertEqual(search_object_ids(self.user, "weekly corner", kind), [groceries.pk])
+        self.assertEqual(search_object_ids(self.user, "weekly nothing", kind), [])
+        self.assertEqual(search_object_ids(self.user, "  ", kind), [])
+
+    def test_title_matches_rank_above_body_matches(self):
+        in_body = self.make_receipt("Lunch", merchant_store="Acme")
+        in_title = self.make_receipt("Acme")
+
+        self.assertEqual(search_object_ids(self.user, "acme", SearchEntry.Kinds.RECEIPT), [in_title.pk, in_body.pk])
+
+    def test_results_are_scoped_to_the_owner(self):
+        other = User.objects.create_user(username="other", email="other@example.com", password="password")
+        baker.make(Receipt, user=other, name="Stationery", date=date(2024, 6, 1))
+
+        self.assertEqual(search_entries(self.user, "stationery"), [])
+        self.assertEqual(len(search_entries(other, "stationery")), 1)
+
+    def test_entries_follow_saves_and_deletes(self):
+        receipt = self.make_receipt("Train ticket")
+        receipt.name = "Bus ticket"
+        receipt.save()
+
+        self.assertEqual(search_object_ids(self.user, "train", SearchEntry.Kinds.RECEIPT), [])
+        self.assertEqual(search_object_ids(self.user, "bus", SearchEntry.Kinds.RECEIPT), [receipt.pk])
+
+        receipt.delete()
+        self.assertFalse(SearchEntry.objects.filter(kind=SearchEntry.Kinds.RECEIPT).exists())
+
+    def test_client_changes_reindex_their_invoices(self):
+        client = baker.make(Client, user=self.user, name="Globex", active=True)
+        invoice = baker.make(Invoice, user=self.user, client_to=client, vat_number=None, discount_amount=0, discount_percentage=0)
+
+        self.assertEqual(search_object_ids(self.user, "globex", SearchEntry.Kinds.INVOICE, title_only=True), [invoice.pk])
+
+        client.name = "Initech"
+        client.active = False
+        client.save()
+
+        self.assertEqual(search_object_ids(self.user, "initech", SearchEntry.Kinds.INVOICE, title_only=True), [invoice.pk])
+        self.assertEqual(search_object_ids(self.user, "initech", SearchEntry.Kinds.CLIENT), [])
+
+    def test_rebuild_command_restores_missing_entries(self):
+        receipt = self.make_receipt("Printer ink")
+        SearchEntry.objects.all().delete()
+
+        call_command(RebuildSearchIndexCommand(), stdout=StringIO())
+
+        self.assertEqual(search_object_ids(self.user, "printer", SearchEntry.Kinds.RECEIPT), [receipt.pk])
+
+    def test_migration_backfills_existing_objects(self):
+        backfill = import_module("backend.migrations.0078_search_index").backfill_search_index
+        receipt = self.make_receipt("Printer ink")
+        client = baker.make(Client, user=self.user, name="Initech")
+        baker.make(Invoice, user=self.user, client_to=client, reference="INV-7", date_issued=date(2024, 6, 1), date_due=date(2024, 7, 1))
+        fields = ("kind", "object_id", "title", "body")
+        indexed = list(SearchEntry.objects.order_by("kind", "object_id").values_list(*fields))
+        SearchEntry.objects.all().delete()
+
+        backfill(django_apps, None)
+
+        self.assertEqual(search_object_ids(self.user, "printer", SearchEntry.Kinds.RECEIPT), [receipt.pk])
+        self.assertEqual(search_object_ids(self.user, "initech", SearchEntry.Kinds.CLIENT), [client.pk])
+        # the migration's frozen document builders index the same text as the live ones
+        self.assertEqual(list(SearchEntry.objects.order_by("kind", "object_id").values_list(*fields)), indexed)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCacheClient
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.utils.crypto import constant_time_compare
+
+from backend.models import User, UserSettings, Organization
+
+cache: RedisCacheClient = cache  # type: ignore[no-redef]
+
+SNAPSHOT_TIMEOUT = 60 * 30
+
+
+def _field_values(instance: models.Model, exclude: tuple[str, ...] = ()) -> dict[str, Any]:
+    values = {}
+    for field in instance._meta.concrete_fields:
+        if field.attname in exclude:
+            continue
+        value = getattr(instance, field.attname)
+        values[field.attname] = value.name if isinstance(value, FieldFile) else value
+    return values
+
+
+def _from_values(model: type[models.Model], values: dict[str, Any]):
+    field_names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+    return model.from_db("default", field_names, [values[name] for name in field_names])
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """
+    Everything the request cycle needs about the logged-in user, their settings and the team they're acting as.
+
+    The password is never stored; it stays deferred on the rebuilt user and only the session auth hash is kept, so
+    sessions are still verified the same way django.contrib.auth.get_user does.
+    """
+
+    user_values: dict[str, Any]
+    session_auth_hash: str
+    profile_values: dict[str, Any] | None
+    team_values: dict[str, Any] | None
+
+    @classmethod
+    def from_user(cls, user: User) -> UserSnapshot:
+        try:
+            profile: UserSettings | None = user.user_profile
+        except UserSettings.DoesNotExist:
+            profile = None
+
+        team: Organization | None = user.logged_in_as_team
+
+        return cls(
+            user_values=_field_values(user, exclude=("password",)),
+            session_auth_hash=user.get_session_auth_hash(),
+            profile_values=_field_values(profile) if profile else None,
+            team_values=_field_values(team) if team else None,
+        )
+
+    @property
+    def user_id(self) -> int:
+        return self.user_values["id"]
+
+    @property
+    def team_id(self) -> int | None:
+        return self.team_values["id"] if self.team_values else None
+
+    def build_team(self) -> Organization | None:
+        return _from_values(Organization, self.team_values) if self.team_values else None
+
+    def build_user(self, team: Organization | None = None) -> User:
+        user: User = _from_values(User, self.user_values)
+
+        User.logged_in_as_team.field.set_cached_value(user, team if team is not None else self.build_team())
+
+        if self.profile_values:
+            profile: UserSettings = _from_values(UserSettings, self.profile_values)
+            UserSettings.user.field.set_cached_value(profile, user)
+            User.user_profile.related.set_cached_value(user, profile)
+
+        return user
+
+
+def _cache_key(user_id: int | str) -> str:
+    return f"myfinances:users:snapshot:{user_id}"
+
+
+def get_session_user_snapshot(request) -> UserSnapshot | None:
+    """
+    Returns the snapshot of the user logged into this session, or None for anonymous/invalid sessions.
+
+    Hits cost zero queries; misses load the user once (through django's get_user so the session is verified and
+    flushed exactly as before) and store a fresh snapshot.
+    """
+    user_id = request.session.get(SESSION_KEY)
+
+    if user_id is None or request.session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return None
+
+    snapshot: UserSnapshot | None = cache.get(_cache_key(user_id))
+
+    if snapshot and constant_time_compare(request.session.get(HASH_SESSION_KEY, ""), snapshot.session_auth_hash):
+        return snapshot
+
+    user = get_user(request)
+
+    if not user.is_authenticated:
+        return None
+
+    snapshot = UserSnapshot.from_user(user)  # type: ignore[arg-type]
+    cache.set(_cache_key(user.pk), snapshot, timeout=SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def invalidate_user_snapshot(user_id: int | None) -> None:
+    if user_id is not None:
+        cache.delete(_cache_key(user_id))
+
+
+def invalidate_team_user_snapshots(team: Organization) -> None:
+    """
+    Drops the snapshot of every user currently acting as this team (their snapshot embeds the team)
+    """
+    cache.delete_many([_cache_key(user_id) for user_id in User.objects.filter(logged_in_as_team=team).values_list("id", flat=True)])
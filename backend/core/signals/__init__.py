@@ -2,3 +2,4 @@ from __future__ import annotations
 
 from . import migrations
 from . import signals
+from . import search
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.core.service.search.documents import SEARCH_KIND_BY_MODEL
+from backend.core.service.search.index import index_objects, remove_objects
+from backend.models import Client, Invoice, InvoiceProduct, Receipt
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_save, sender=Receipt)
+@receiver(post_save, sender=InvoiceProduct)
+def index_saved_object(sender, instance, **kwargs):
+    index_objects([instance])
+
+
+@receiver(post_save, sender=Client)
+def index_saved_client(sender, instance: Client, **kwargs):
+    if instance.active:
+        index_objects([instance])
+    else:
+        # clients are soft deleted by deactivating them
+        remove_objects(SEARCH_KIND_BY_MODEL[Client], [instance.pk])
+
+    # invoices are found by their client's name and details too
+    if invoices := list(Invoice.objects.filter(client_to=instance).select_related("client_to")):
+        index_objects(invoices)
+
+
+@receiver(post_delete, sender=Invoice)
+@receiver(post_delete, sender=Receipt)
+@receiver(post_delete, sender=InvoiceProduct)
+@receiver(post_delete, sender=Client)
+def remove_deleted_object(sender, instance, **kwargs):
+    remove_objects(SEARCH_KIND_BY_MODEL[sender], [instance.pk])
@@ -5,12 +5,18 @@ from django.core.cache.backends.redis import RedisCacheClient
 
 cache: RedisCacheClient = cache
 from django.core.files.storage import default_storage
+from django.db import transaction
 from django.db.models.signals import pre_save, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.urls import reverse
 
 import settings.settings
-from backend.models import UserSettings, Receipt, User, FeatureFlags, VerificationCodes
+from backend.core.api.public import APIAuthToken
+from backend.core.service.api_keys.cache import invalidate_api_key_cache
+from backend.core.service.permissions.resolver import invalidate_team_member_scopes
+from backend.core.utils.feature_flags import feature_flags
+from backend.core.service.users.snapshot import invalidate_user_snapshot, invalidate_team_user_snapshots
+from backend.models import UserSettings, Receipt, User, FeatureFlags, VerificationCodes, Organization, TeamMemberPermission
 from settings.helpers import send_email
 
 
@@ -58,14 +64,57 @@ def user_account_create_make_usersettings(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=FeatureFlags)
+@receiver(post_delete, sender=FeatureFlags)
 def refresh_feature_cache(sender, instance: FeatureFlags, **kwargs):
-    feature = instance.name
-    key = f"myfinances:feature_flag:{feature}"
+    feature_flags.invalidate()
 
-    cached_value = cache.get(key)
 
-    if cached_value:
-        return cache.delete(key)
+@receiver(post_save, sender=APIAuthToken)
+def refresh_api_key_cache(sender, instance: APIAuthToken, update_fields=None, **kwargs):
+    # last_used bookkeeping doesn't change anything the cached snapshot holds
+    if update_fields and set(update_fields) == {"last_used"}:
+        return
+
+    invalidate_api_key_cache(instance)
+
+
+@receiver(post_delete, sender=APIAuthToken)
+def delete_api_key_cache(sender, instance: APIAuthToken, **kwargs):
+    invalidate_api_key_cache(instance)
+
+
+@receiver(post_save, sender=TeamMemberPermission)
+@receiver(post_delete, sender=TeamMemberPermission)
+def refresh_team_member_scopes(sender, instance: TeamMemberPermission, **kwargs):
+    # the edit paths (edit_member_permissions, create_user) both save the row; clear again on commit so other workers
+    # can't re-cache the old scopes in between
+    invalidate_team_member_scopes(instance.team_id, instance.user_id)
+    transaction.on_commit(lambda: invalidate_team_member_scopes(instance.team_id, instance.user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def refresh_user_snapshot(sender, instance: User, **kwargs):
+    # covers profile edits, password changes and team switches (logged_in_as_team)
+    invalidate_user_snapshot(instance.pk)
+
+
+@receiver(post_save, sender=UserSettings)
+@receiver(post_delete, sender=UserSettings)
+def refresh_user_snapshot_settings(sender, instance: UserSettings, **kwargs):
+    invalidate_user_snapshot(instance.user_id)
+
+
+@receiver(post_save, sender=Organization)
+def refresh_team_user_snapshots(sender, instance: Organization, created, **kwargs):
+    if not created:
+        invalidate_team_user_snapshots(instance)
+
+
+@receiver(pre_delete, sender=Organization)
+def delete_team_user_snapshots(sender, instance: Organization, **kwargs):
+    # logged_in_as_team is cleared with SET_NULL, which doesn't send User signals
+    invalidate_team_user_snapshots(instance)
 
 
 @receiver(post_save, sender=User)
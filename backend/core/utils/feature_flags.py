@@ -1,24 +1,84 @@
+from __future__ import annotations
+
+import threading
+import time
+
 from backend.models import FeatureFlags
 from django.core.cache import cache
+from django.db import transaction
 from django.core.cache.backends.redis import RedisCacheClient
 
 cache: RedisCacheClient = cache
 
+FEATURE_FLAGS_VERSION_KEY = "myfinances:feature_flags:version"
+
+
+class FeatureFlagRegistry:
+    """
+    Process-local snapshot of every FeatureFlags row, loaded in a single query.
+
+    The snapshot is tagged with a global version number kept in the shared cache. Saving or deleting a flag bumps that
+    version (see refresh_feature_cache), so every worker reloads its snapshot the next time it evaluates a flag.
+    In steady state evaluating a flag costs one cache read for the version and no queries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._flags: dict[str, bool] = {}
+
+    @staticmethod
+    def current_version() -> int:
+        version = cache.get(FEATURE_FLAGS_VERSION_KEY)
+        if version is None:
+            # the version was never set or was evicted; start from a fresh value so no worker keeps an old snapshot
+            cache.add(FEATURE_FLAGS_VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(FEATURE_FLAGS_VERSION_KEY)
+        return version
+
+    def bump_version(self) -> None:
+        try:
+            cache.incr(FEATURE_FLAGS_VERSION_KEY)
+        except ValueError:
+            cache.set(FEATURE_FLAGS_VERSION_KEY, time.time_ns(), timeout=None)
+        self.clear()
+
+    def invalidate(self) -> None:
+        """
+        Bumps the version now (so this worker sees its own uncommitted change) and again once the transaction commits,
+        so other workers can't reload the old rows under the new version.
+        """
+        self.bump_version()
+        transaction.on_commit(self.bump_version)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._flags = {}
+
+    def snapshot(self) -> dict[str, bool]:
+        version = self.current_version()
+
+        # read under the lock too, so the version and flags can't come from two different snapshots
+        with self._lock:
+            if self._version != version:
+                self._flags = dict(FeatureFlags.objects.values_list("name", "value"))
+                self._version = version
+            return self._flags
+
+    def is_enabled(self, feature: str) -> bool:
+        return self.snapshot().get(feature, False)
+
+
+feature_flags = FeatureFlagRegistry()
+
 
 def get_feature_status(feature, should_use_cache=True):
     if should_use_cache:
-        key = f"myfinances:feature_flag:{feature}"
-        cached_value = cache.get(key)
-        if cached_value:
-            return cached_value
+        return feature_flags.is_enabled(feature)
 
     value = FeatureFlags.objects.filter(name=feature).first()
-    if value:
-        if should_use_cache:
-            cache.set(key, value.value, timeout=300)
-        return value.value
-    else:
-        return False
+    return value.value if value else False
 
 
 def set_cache(key, value, timeout=300):
@@ -1,16 +1,14 @@
 from django.http import HttpResponseRedirect
 
+from backend.core.utils.navigation import get_last_visited
+
 
 def redirect_to_last_visited(request, fallback_url="dashboard"):
     """
-    Redirects user to the last visited URL stored in session.
+    Redirects user to the last visited URL recorded by LastVisitedMiddleware.
     If no previous URL is found, redirects to the fallback URL.
     :param request: HttpRequest object
     :param fallback_url: URL to redirect to if no previous URL found
     :return: HttpResponseRedirect object
     """
-    try:
-        last_visited_url = request.session.get("last_visited", fallback_url)
-        return HttpResponseRedirect(last_visited_url)
-    except KeyError:
-        return HttpResponseRedirect(fallback_url)
+    return HttpResponseRedirect(get_last_visited(request) or fallback_url)
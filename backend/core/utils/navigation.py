@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+NAVIGATION_COOKIE_NAME = "myfinances_nav"
+NAVIGATION_SIGNING_SALT = "backend.navigation"
+
+
+@dataclass
+class NavigationHistory:
+    last_visited: str | None = None
+    currently_visiting: str | None = None
+    changed: bool = False
+
+    def visit(self, url: str) -> None:
+        # reloading the same page keeps the previous page as "last visited" and doesn't need persisting
+        if url == self.currently_visiting:
+            return
+
+        self.last_visited = self.currently_visiting
+        self.currently_visiting = url
+        self.changed = True
+
+
+class NavigationStorage(ABC):
+    @abstractmethod
+    def load(self, request: HttpRequest) -> NavigationHistory: ...
+
+    @abstractmethod
+    def save(self, request: HttpRequest, response: HttpResponse, history: NavigationHistory) -> None: ...
+
+
+class SignedCookieNavigationStorage(NavigationStorage):
+    """
+    Keeps the history client side in a signed cookie, so page views never write to the server.
+    """
+
+    def load(self, request):
+        try:
+            last_visited, currently_visiting = signing.loads(request.COOKIES.get(NAVIGATION_COOKIE_NAME, ""), salt=NAVIGATION_SIGNING_SALT)
+        except (signing.BadSignature, ValueError, TypeError):
+            return NavigationHistory()
+        return NavigationHistory(last_visited, currently_visiting)
+
+    def save(self, request, response, history):
+        response.set_cookie(
+            NAVIGATION_COOKIE_NAME,
+            signing.dumps([history.last_visited, history.currently_visiting], salt=NAVIGATION_SIGNING_SALT, compress=True),
+            max_age=settings.SESSION_COOKIE_AGE,
+            secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True,
+            samesite="Lax",
+        )
+
+
+class CacheNavigationStorage(NavigationStorage):
+    """
+    Keeps the history in the shared cache, keyed by session. Sessions without a key yet just don't get a history.
+    """
+
+    @staticmethod
+    def _key(request) -> str | None:
+        session_key = request.session.session_key
+        return f"myfinances:navigation:{session_key}" if session_key else None
+
+    def load(self, request):
+        key = self._key(request)
+        values = cache.get(key) if key else None
+        return NavigationHistory(*values) if values else NavigationHistory()
+
+    def save(self, request, response, history):
+        if key := self._key(request):
+            cache.set(key, (history.last_visited, history.currently_visiting), timeout=settings.SESSION_COOKIE_AGE)
+
+
+class SessionNavigationStorage(NavigationStorage):
+    """
+    Original behaviour (session keys), but the session is only modified when the page actually changed.
+    """
+
+    def load(self, request):
+        return NavigationHistory(request.session.get("last_visited"), request.session.get("currently_visiting"))
+
+    def save(self, request, response, history):
+        request.session["last_visited"] = history.last_visited
+        request.session["currently_visiting"] = history.currently_visiting
+
+
+NAVIGATION_STORAGES: dict[str, type[NavigationStorage]] = {
+    "cookie": SignedCookieNavigationStorage,
+    "cache": CacheNavigationStorage,
+    "session": SessionNavigationStorage,
+}
+
+
+def get_navigation_storage() -> NavigationStorage:
+    return NAVIGATION_STORAGES.get(settings.NAVIGATION_HISTORY_STORAGE, SignedCookieNavigationStorage)()
+
+
+def get_last_visited(request: HttpRequest) -> str | None:
+    """
+    The previous page this visitor opened, as recorded by LastVisitedMiddleware (None if unknown)
+    """
+    history: NavigationHistory | None = getattr(request, "navigation", None)
+    return history.last_visited if history else None
@@ -3,6 +3,7 @@ from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import render
 from django.urls import reverse
 
+from backend.core.utils.navigation import get_last_visited
 from backend.models import QuotaLimit
 
 
@@ -23,13 +24,9 @@ def quota_usage_check_under(
     elif api:
         return HttpResponse(status=403, content=f"You have reached the quota limit for this service '{quota_limit.name}'")
     messages.error(request, f"You have reached the quota limit for this service '{quota_limit.name}'")
-    try:
-        last_visited_url = request.session["last_visited"]
-        current_url = request.build_absolute_uri()
-        if last_visited_url != current_url:
-            return HttpResponseRedirect(last_visited_url)
-    except KeyError:
-        pass
+    last_visited_url = get_last_visited(request)
+    if last_visited_url and last_visited_url != request.build_absolute_uri():
+        return HttpResponseRedirect(last_visited_url)
     return HttpResponseRedirect(reverse("dashboard"))
 
 
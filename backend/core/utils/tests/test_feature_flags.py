@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from backend.core.utils.feature_flags import FEATURE_FLAGS_VERSION_KEY, feature_flags, get_feature_status
+from backend.models import FeatureFlags
+
+
+class FeatureFlagRegistryTests(TestCase):
+    def setUp(self):
+        FeatureFlags.objects.all().delete()
+        self.enabled = FeatureFlags.objects.create(name="enabledFlag", value=True)
+        self.disabled = FeatureFlags.objects.create(name="disabledFlag", value=False)
+        feature_flags.clear()
+        self.addCleanup(feature_flags.clear)
+
+    def test_all_flags_load_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(get_feature_status("enabledFlag"))
+            self.assertFalse(get_feature_status("disabledFlag"))
+            self.assertFalse(get_feature_status("missingFlag"))
+
+    def test_disabled_flags_are_served_from_snapshot(self):
+        get_feature_status("disabledFlag")
+
+        with self.assertNumQueries(0):
+            for _ in range(5):
+                self.assertFalse(get_feature_status("disabledFlag"))
+
+    def test_saving_a_flag_bumps_the_version(self):
+        get_feature_status("disabledFlag")
+        version = cache.get(FEATURE_FLAGS_VERSION_KEY)
+
+        self.disabled.enable()
+
+        self.assertNotEqual(cache.get(FEATURE_FLAGS_VERSION_KEY), version)
+        self.assertTrue(get_feature_status("disabledFlag"))
+
+    def test_version_change_from_another_worker_reloads_snapshot(self):
+        get_feature_status("enabledFlag")
+        FeatureFlags.objects.filter(name="enabledFlag").update(value=False)  # bypasses signals
+
+        with self.assertNumQueries(0):
+            self.assertTrue(get_feature_status("enabledFlag"))
+
+        cache.incr(FEATURE_FLAGS_VERSION_KEY)
+
+        with self.assertNumQueries(1):
+            self.assertFalse(get_feature_status("enabledFlag"))
+
+    def test_deleting_a_flag_bumps_the_version(self):
+        get_feature_status("enabledFlag")
+        self.enabled.delete()
+
+        self.assertFalse(get_feature_status("enabledFlag"))
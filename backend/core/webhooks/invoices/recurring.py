@@ -1,11 +1,14 @@
-from datetime import datetime
+from datetime import date, datetime
 
 from django.http import JsonResponse
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from login_required import login_not_required
 
 from backend.finance.models import InvoiceRecurringProfile
+from backend.core.service.asyn_tasks.tasks import Task
+from backend.core.service.invoices.recurring.generation.batch import generate_due_recurring_invoices_task
 from backend.core.service.invoices.recurring.generation.next_invoice import safe_generate_next_invoice_service
 from backend.core.service.invoices.recurring.webhooks.webhook_apikey_auth import authenticate_api_key
 
@@ -25,6 +28,10 @@ def handle_recurring_invoice_webhook_endpoint(request: WebRequest):
 
     requires:
     - invoice_profile_id
+
+    optional:
+    - scheduled_time (ISO 8601, the schedule's <aws.scheduler.scheduled-time>): the day the delivery was scheduled for,
+      so retries delivered after midnight are still recognised. Defaults to today.
     """
 
     invoice_profile_id = request.POST.get("invoice_profile_id", "")
@@ -46,11 +53,65 @@ def handle_recurring_invoice_webhook_endpoint(request: WebRequest):
 
     DATE_TODAY = datetime.now().date()
 
-    svc_resp = safe_generate_next_invoice_service(invoice_recurring_profile=invoice_recurring_profile, issue_date=DATE_TODAY)
-
-    if svc_resp.success:
+    raw_scheduled_time = request.POST.get("scheduled_time")
+    try:
+        # parse_datetime rather than datetime.fromisoformat, which can't read the trailing "Z" before Python 3.11
+        scheduled_time = parse_datetime(raw_scheduled_time) if raw_scheduled_time else None
+    except ValueError:  # well formed, but out of range
+        scheduled_time = None
+    if raw_scheduled_time and not scheduled_time:
+        return JsonResponse({"message": "scheduled_time must be an ISO 8601 date time", "success": False}, status=400)
+
+    # the period is the profile's next_issue_date, as in the batch generation, so the ledger dedupes the two.
+    # Once generated it has moved on past the scheduled day, which is how a retried delivery is recognised
+    scheduled_day = scheduled_time.date() if scheduled_time else DATE_TODAY
+    period = invoice_recurring_profile.next_issue_date
+
+    if not period or period > scheduled_day:
+        logger.info(f"No invoice due on {scheduled_day}, the next is due on {period}")
+        return JsonResponse({"message": "No invoice due", "success": True})
+
+    svc_resp = safe_generate_next_invoice_service(invoice_recurring_profile=invoice_recurring_profile, issue_date=DATE_TODAY, period=period)
+
+    if svc_resp.already_generated:
+        # a retried delivery: answer with success so the scheduler stops retrying
+        logger.info(f"Invoice for {period} was already generated")
+        return JsonResponse({"message": "Invoice already generated", "success": True})
+    elif svc_resp.success:
         logger.info("Successfully generated next invoice")
         return JsonResponse({"message": "Invoice generated", "success": True})
     else:
         logger.info(svc_resp.error)
         return JsonResponse({"message": svc_resp.error, "success": False}, status=400)
+
+
+@require_POST
+@csrf_exempt
+@login_not_required
+def handle_recurring_invoice_batch_webhook_endpoint(request: WebRequest):
+    """
+    Queues the generation of every recurring invoice due on a date, instead of a webhook per profile.
+    Answers 202 straight away: the batch is sent to SQS, or without it runs in a background thread of this process
+    (lost if the process restarts mid batch, the next run catches the profiles up). The generate_recurring_invoices
+    command runs the same batch synchronously.
+
+    optional:
+    - issue_date (YYYY-MM-DD, defaults to today)
+    """
+
+    api_auth_response = authenticate_api_key(request)
+
+    if api_auth_response.failed:
+        logger.info(f"Webhook auth failed: {api_auth_response.error}")
+        return JsonResponse({"message": api_auth_response.error, "success": False}, status=api_auth_response.status_code or 400)
+
+    try:
+        issue_date = date.fromisoformat(request.POST["issue_date"]) if request.POST.get("issue_date") else datetime.now().date()
+    except ValueError:
+        return JsonResponse({"message": "issue_date must be a date in the format YYYY-MM-DD", "success": False}, status=400)
+
+    Task().queue_background_task(generate_due_recurring_invoices_task, issue_date.isoformat())
+
+    logger.info(f"Queued batch generation of recurring invoices for {issue_date}")
+
+    return JsonResponse({"message": "Generation queued", "success": True, "issue_date": issue_date}, status=202)
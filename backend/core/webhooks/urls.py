@@ -1,9 +1,17 @@
 from django.urls import path
 
-from backend.core.webhooks.invoices.recurring import handle_recurring_invoice_webhook_endpoint
+from backend.core.webhooks.invoices.recurring import (
+    handle_recurring_invoice_batch_webhook_endpoint,
+    handle_recurring_invoice_webhook_endpoint,
+)
 
 urlpatterns = [
     path("schedules/receive/recurring_invoices/", handle_recurring_invoice_webhook_endpoint, name="receive_recurring_invoices"),
+    path(
+        "schedules/receive/recurring_invoices/batch/",
+        handle_recurring_invoice_batch_webhook_endpoint,
+        name="receive_recurring_invoices_batch",
+    ),
 ]
 
 app_name = "webhooks"
@@ -11,9 +11,11 @@ from django.shortcuts import redirect
 from django.shortcuts import render
 from django.urls import reverse
 
-from backend.core.models import QuotaLimit, TeamMemberPermission
+from backend.core.models import QuotaLimit
+from backend.core.service.permissions.resolver import missing_team_scopes
 from backend.core.types.requests import WebRequest
 from backend.core.utils.feature_flags import get_feature_status
+from backend.core.utils.navigation import get_last_visited
 
 logger = logging.getLogger(__name__)
 
@@ -95,13 +97,9 @@ def feature_flag_check(flag, status=True, api=False, htmx=False):
             elif api:
                 return HttpResponse(status=403, content="This feature is currently disabled.")
             messages.error(request, "This feature is currently disabled.")
-            try:
-                last_visited_url = request.session["last_visited"]
-                current_url = request.build_absolute_uri()
-                if last_visited_url != current_url:
-                    return HttpResponseRedirect(last_visited_url)
-            except KeyError:
-                pass
+            last_visited_url = get_last_visited(request)
+            if last_visited_url and last_visited_url != request.build_absolute_uri():
+                return HttpResponseRedirect(last_visited_url)
             return HttpResponseRedirect(reverse("dashboard"))
 
         return wrapper
@@ -156,13 +154,9 @@ def quota_usage_check(limit: str | QuotaLimit, extra_data: str | int | None = No
             elif api:
                 return HttpResponse(status=403, content=f"You have reached the quota limit for this service '{quota_limit.slug}'")
             messages.error(request, f"You have reached the quota limit for this service '{quota_limit.slug}'")
-            try:
-                last_visited_url = request.session["last_visited"]
-                current_url = request.build_absolute_uri()
-                if last_visited_url != current_url:
-                    return HttpResponseRedirect(last_visited_url)
-            except KeyError:
-                pass
+            last_visited_url = get_last_visited(request)
+            if last_visited_url and last_visited_url != request.build_absolute_uri():
+                return HttpResponseRedirect(last_visited_url)
             return HttpResponseRedirect(reverse("dashboard"))
 
         return wrapper
@@ -186,22 +180,14 @@ def web_require_scopes(scopes: str | list[str], htmx=False, api=False, redirect_
                 return return_error(request, "Team not found")
 
             if request.team:
-                # Check for team permissions based on team_id and scopes
-                if not request.team.is_owner(request.user):
-                    team_permissions = TeamMemberPermission.objects.filter(team=request.team, user=request.user).first()
-
-                    if not team_permissions:
-                        return return_error(request, "You do not have permission to perform this action (no permissions for team)")
-
-                    # single scope
-                    if isinstance(scopes, str) and scopes not in team_permissions.scopes:
-                        return return_error(request, f"You do not have permission to perform this action ({scopes})")
-
-                    # scope list
-                    if isinstance(scopes, list):
-                        for scope in scopes:
-                            if scope not in team_permissions.scopes:
-                                return return_error(request, f"You do not have permission to perform this action ({scope})")
+                # Check for team permissions based on team_id and scopes (owners hold every scope)
+                missing_scopes = missing_team_scopes(request.team, request.user.pk, scopes)
+
+                if missing_scopes is None:
+                    return return_error(request, "You do not have permission to perform this action (no permissions for team)")
+
+                if missing_scopes:
+                    return return_error(request, f"You do not have permission to perform this action ({', '.join(sorted(missing_scopes))})")
             return view_func(request, *args, **kwargs)
 
         _wrapped_view.required_scopes = scopes
@@ -218,25 +204,17 @@ def web_require_scopes(scopes: str | list[str], htmx=False, api=False, redirect_
             messages.error(request, msg)
             resp = HttpResponse(status=200)
 
-            try:
-                last_visited_url = request.session["last_visited"]
-                current_url = request.build_absolute_uri()
-                if last_visited_url != current_url:
-                    resp["HX-Replace-Url"] = last_visited_url
-            except KeyError:
-                ...
+            last_visited_url = get_last_visited(request)
+            if last_visited_url and last_visited_url != request.build_absolute_uri():
+                resp["HX-Replace-Url"] = last_visited_url
             resp["HX-Refresh"] = "true"
             return resp
 
         messages.error(request, msg)
 
-        try:
-            last_visited_url = request.session["last_visited"]
-            current_url = request.build_absolute_uri()
-            if last_visited_url != current_url:
-                return HttpResponseRedirect(last_visited_url)
-        except KeyError:
-            pass
+        last_visited_url = get_last_visited(request)
+        if last_visited_url and last_visited_url != request.build_absolute_uri():
+            return HttpResponseRedirect(last_visited_url)
 
         if not redirect_url:
             return HttpResponseRedirect(reverse("dashboard"))
@@ -0,0 +1,95 @@
+from datetime import date
+
+from django.db import transaction
+from django.http import FileResponse, HttpResponseBadRequest, HttpResponseNotFound, JsonResponse
+from django.shortcuts import render
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods
+
+from backend.decorators import web_require_scopes
+from backend.core.service.asyn_tasks.tasks import Task
+from backend.core.service.invoices.common.filters import INVOICE_STATUS_FILTERS
+from backend.core.service.invoices.single.export_pdfs import export_invoices_task, get_export, open_export_file
+from backend.core.types.requests import WebRequest
+from backend.finance.models import InvoiceExport
+
+
+def _progress_response(request: WebRequest, export_id: str, export: InvoiceExport | None):
+    download_url = reverse("api:finance:invoices:single:export download", kwargs={"export_id": export_id})
+
+    if not request.htmx:
+        if not export:
+            return HttpResponseNotFound()
+        return JsonResponse(
+            {
+                "export_id": export_id,
+                "done": export.done,
+                "total": export.total,
+                "finished": export.finished,
+                "failed": export.failed,
+                "download_url": download_url if export.finished else None,
+            },
+            status=200 if export.finished else 202,
+        )
+
+    return render(
+        request,
+        "pages/invoices/single/dashboard/_export_progress.html",
+        {"export_id": export_id, "export": export},
+        # 286 tells htmx to stop polling
+        status=286 if not export or export.finished or export.failed else 200,
+    )
+
+
+@require_http_methods(["POST"])
+@web_require_scopes("invoices:read", True, True)
+def export_invoices_endpoint(request: WebRequest):
+    """
+    Queues the export as a background task writing the ZIP to private storage. Its progress is then polled,
+    and the ZIP downloaded once it's finished.
+    """
+    try:
+        start_date = date.fromisoformat(request.POST["start_date"]) if request.POST.get("start_date") else None
+        end_date = date.fromisoformat(request.POST["end_date"]) if request.POST.get("end_date") else None
+    except ValueError:
+        return HttpResponseBadRequest("start_date and end_date must be dates in the format YYYY-MM-DD")
+
+    statuses = request.POST.getlist("status")
+    if invalid := [status for status in statuses if status not in INVOICE_STATUS_FILTERS]:
+        return HttpResponseBadRequest(f"Invalid status: {', '.join(invalid)}")
+
+    client_id = request.POST.get("client") or None
+    if client_id and not client_id.isdigit():
+        return HttpResponseBadRequest("client must be a client id")
+
+    filename = "_".join(["invoices", *(str(day) for day in (start_date, end_date) if day)]) + ".zip"
+    export = InvoiceExport.objects.create(owner=request.actor, filename=filename)
+    export_id = str(export.pk)
+
+    # a request never waits on the export: without SQS it runs in a background thread of this process
+    task_args = (
+        export_id,
+        start_date.isoformat() if start_date else None,
+        end_date.isoformat() if end_date else None,
+        statuses,
+        int(client_id) if client_id else None,
+    )
+    transaction.on_commit(lambda: Task().queue_background_task(export_invoices_task, *task_args))
+
+    return _progress_response(request, export_id, export)
+
+
+@require_http_methods(["GET"])
+@web_require_scopes("invoices:read", True, True)
+def export_invoices_progress_endpoint(request: WebRequest, export_id: str):
+    return _progress_response(request, export_id, get_export(export_id, request.actor))
+
+
+@require_http_methods(["GET"])
+@web_require_scopes("invoices:read", False, True)
+def export_invoices_download_endpoint(request: WebRequest, export_id: str):
+    export = get_export(export_id, request.actor)
+    if not export or not export.finished:
+        return HttpResponseNotFound()
+
+    return FileResponse(open_export_file(export), as_attachment=True, filename=export.filename, content_type="application/zip")
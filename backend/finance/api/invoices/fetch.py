@@ -1,12 +1,19 @@
+from django.conf import settings
+from django.contrib import messages
 from django.shortcuts import render, redirect
 from django.views.decorators.http import require_http_methods
-from datetime import datetime
-from django.db.models import Q
 
 from backend.decorators import web_require_scopes
 from backend.finance.models import Invoice
+from backend.core.api.public.helpers.pagination import PaginationError, paginate_keyset
 from backend.core.types.htmx import HtmxHttpRequest
 from backend.core.service.invoices.common.fetch import get_context
+from backend.core.service.invoices.common.filters import filter_dashboard_invoices
+
+# each sort is backed by an (owner, ..., id) index, see Invoice.Meta.indexes
+INVOICE_TABLE_SORTS = ("id", "date_due", "total", "status")
+# the dashboard table names its columns differently
+INVOICE_TABLE_SORT_ALIASES = {"invoice-id": "id", "due_date": "date_due", "amount": "total"}
 
 
 @require_http_methods(["GET"])
@@ -16,39 +23,36 @@ def fetch_all_invoices(request: HtmxHttpRequest):
     if not request.htmx:
         return redirect("finance:invoices:single:dashboard")
 
-    due_date = request.GET.get("due_date")
-    invoice_id = request.GET.get("invoice-id")
-    client_name = request.GET.get("client_name")
-    amount = request.GET.get("amount")
-    status = request.GET.get("status")
-
-    query = Q()
-    if invoice_id:
-        query &= Q(id=invoice_id)
-    if client_name:
-        query &= Q(client_name__icontains=client_name)
-    if amount:
-        query &= Q(discount_amount__icontains=amount)
-    if status:
-        query &= Q(status=status)
-    if due_date:
-        date_range = due_date.split(",")
-        date_start = datetime.strptime(date_range[0], "%d/%m/%Y")
-        date_end = datetime.strptime(date_range[1], "%d/%m/%Y")
-        query &= Q(date_due__range=[date_start, date_end])
-
-    if request.user.logged_in_as_team:
-        invoices = Invoice.objects.filter(organization=request.user.logged_in_as_team).filter(query)
-    else:
-        invoices = Invoice.objects.filter(user=request.user).filter(query)
-
-    # Get filter and sort parameters from the request
-    # sort_by = request.GET.get("sort")
-    # sort_direction = request.GET.get("sort_direction", "")
-    # action_filter_type = request.GET.get("filter_type")
-    # action_filter_by = request.GET.get("filter")
-
-    context, invoices = get_context(invoices)
-
-    # Render the HTMX response
-    return render(request, "pages/invoices/dashboard/_fetch_body.html", context)
+    sort_by = request.GET.get("sort", "id")
+    sort_by = INVOICE_TABLE_SORT_ALIASES.get(sort_by, sort_by)
+    descending = request.GET.get("sort_direction") == "desc"
+
+    if sort_by not in INVOICE_TABLE_SORTS:
+        return _error(request, f"Invalid sort, choose from: {', '.join(INVOICE_TABLE_SORTS)}")
+
+    filtered = filter_dashboard_invoices(Invoice.filter_by_owner(request.actor), request.GET, request.actor)
+    if filtered.failed:
+        return _error(request, filtered.error)
+
+    context, invoices = get_context(filtered.response)
+
+    try:
+        page = paginate_keyset(invoices, sort_by, descending, cursor=request.GET.get("cursor"), page_size=settings.INVOICE_TABLE_PAGE_SIZE)
+    except PaginationError as error:
+        return _error(request, str(error))
+
+    next_params = request.GET.copy()
+    next_params["cursor"] = page.next_cursor or ""
+
+    context |= {"invoices": page.items, "next_cursor": page.next_cursor, "next_query": next_params.urlencode()}
+
+    # later pages of the infinite scroll are appended after the last row, so they don't re-render the tbody
+    template = "_fetch_rows.html" if request.GET.get("cursor") else "_fetch_body.html"
+    return render(request, f"pages/invoices/dashboard/{template}", context)
+
+
+def _error(request: HtmxHttpRequest, message: str):
+    messages.error(request, message)
+    response = render(request, "base/toast.html")
+    response["HX-Reswap"] = "none"
+    return response
@@ -10,7 +10,8 @@ from backend.finance.models import InvoiceRecurringProfile
 from backend.core.service.asyn_tasks.tasks import Task
 from backend.core.service.boto3.scheduler.create_schedule import create_boto_schedule
 from backend.core.service.boto3.scheduler.get import get_boto_schedule
-from backend.core.service.boto3.scheduler.pause import pause_boto_schedule
+from backend.core.service.boto3.scheduler.pause import pause_recurring_schedule
+from backend.core.service.invoices.recurring.schedule_status import get_schedule_status_version
 from backend.core.types.requests import WebRequest
 
 from datetime import timedelta, datetime
@@ -48,6 +49,16 @@ def recurring_profile_change_status_endpoint(request: WebRequest, invoice_profil
     elif status == "unpause" and invoice_profile.status != "paused":
         return return_message(request, "Can only unpause a paused invoice schedule")
 
+    # read before the schedule task is queued, so the dashboard's poll waits for the task's change
+    schedule_version = get_schedule_status_version(invoice_profile.pk)
+    # poll time stamp (now + 15 seconds) as dateTtime
+    poll_end_timestamp_unix = int((datetime.now() + timedelta(seconds=15)).timestamp())
+    poll_context = {
+        "invoice_profile_id": invoice_profile_id,
+        "schedule_version": schedule_version,
+        "poll_end_timestamp": poll_end_timestamp_unix,
+    }
+
     if status == "refresh":
         print("using refresh")
         if invoice_profile.boto_schedule_uuid:
@@ -56,19 +67,20 @@ def recurring_profile_change_status_endpoint(request: WebRequest, invoice_profil
             if boto_get_response.failed:
                 print("TASK 1 - no schedule found, let's create one")
                 Task().queue_task(create_boto_schedule, invoice_profile.pk)
-                return render(request, "pages/invoices/recurring/dashboard/poll_update.html", {"invoice_profile_id": invoice_profile_id})
+                return render(request, "pages/invoices/recurring/dashboard/poll_update.html", poll_context)
 
             invoice_profile.status = "ongoing" if boto_get_response.response["State"] == "ENABLED" else "paused"
-            invoice_profile.save(update_fields=["status"])
+            invoice_profile.boto_schedule_status = InvoiceRecurringProfile.BotoStatusTypes.COMPLETED
+            invoice_profile.save(update_fields=["status", "boto_schedule_status"])
         else:
             Task().queue_task(create_boto_schedule, invoice_profile.pk)
-            return render(request, "pages/invoices/recurring/dashboard/poll_update.html", {"invoice_profile_id": invoice_profile_id})
+            return render(request, "pages/invoices/recurring/dashboard/poll_update.html", poll_context)
         send_message(request, f"Invoice status has been refreshed!", success=True)
     else:
         if status == "pause":
-            Task().queue_task(pause_boto_schedule, str(invoice_profile.boto_schedule_uuid), pause=True)
+            Task().queue_task(pause_recurring_schedule, invoice_profile.pk, pause=True)
         elif status == "unpause":
-            Task().queue_task(pause_boto_schedule, str(invoice_profile.boto_schedule_uuid), pause=False)
+            Task().queue_task(pause_recurring_schedule, invoice_profile.pk, pause=False)
 
         new_status = "ongoing" if status == "unpause" else "paused"
 
@@ -77,14 +89,10 @@ def recurring_profile_change_status_endpoint(request: WebRequest, invoice_profil
 
         send_message(request, f"Invoice status been changed to <strong>{new_status}</strong>", success=True)
 
-    # poll time stamp (now + 15 seconds) as dateTtime
-
-    poll_end_timestamp_unix = int((datetime.now() + timedelta(seconds=15)).timestamp())
-
     return render(
         request,
         "pages/invoices/recurring/dashboard/_modify_status.html",
-        {"status": status, "invoice_profile_id": invoice_profile_id, "poll_end_timestamp": poll_end_timestamp_unix},
+        {"status": status} | poll_context,
     )
 
 
@@ -1,6 +1,6 @@
 from django.urls import path, include
 
-from . import fetch, delete, edit
+from . import fetch, delete, edit, export
 from .create import set_destination
 from .create.services import add_service
 from .recurring.delete import delete_invoice_recurring_profile_endpoint
@@ -24,6 +24,9 @@ SINGLE_INVOICE_URLS = [
     path("edit/<int:invoice_id>/set_status/<str:status>/", edit.change_status, name="edit status"),
     path("edit/<str:invoice_id>/discount/", edit.edit_discount, name="edit discount"),
     path("fetch/", fetch.fetch_all_invoices, name="fetch"),
+    path("export/", export.export_invoices_endpoint, name="export"),
+    path("export/<str:export_id>/progress/", export.export_invoices_progress_endpoint, name="export progress"),
+    path("export/<str:export_id>/download/", export.export_invoices_download_endpoint, name="export download"),
     # path("", include("backend.finance.api.invoices.reminders.urls")),
 ]
 
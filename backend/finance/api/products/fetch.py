@@ -1,8 +1,10 @@
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 from django.shortcuts import render
 
 from backend.decorators import web_require_scopes
 from backend.finance.models import InvoiceProduct
+from backend.models import SearchEntry
+from backend.core.service.search.query import MAX_FILTER_RESULTS, search_object_ids
 from backend.core.types.htmx import HtmxHttpRequest
 
 
@@ -13,7 +15,7 @@ def fetch_products(request: HtmxHttpRequest):
     if search_text:
         results = (
             InvoiceProduct.objects.filter(user=request.user)
-            .filter(Q(name__icontains=search_text) | Q(description__icontains=search_text))
+            .filter(id__in=search_object_ids(request.user, search_text, SearchEntry.Kinds.PRODUCT, limit=MAX_FILTER_RESULTS))
             .order_by("name")
         )
     else:
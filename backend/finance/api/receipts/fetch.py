@@ -1,8 +1,9 @@
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 from django.shortcuts import render, redirect
 
 from backend.decorators import web_require_scopes
-from backend.models import Receipt
+from backend.models import Receipt, SearchEntry
+from backend.core.service.search.query import MAX_FILTER_RESULTS, search_object_ids
 from backend.core.types.htmx import HtmxHttpRequest
 
 
@@ -32,11 +33,7 @@ def fetch_all_receipts(request: HtmxHttpRequest):
 
     if search_text:
         results = results.filter(
-            Q(name__icontains=search_text)
-            | Q(date__icontains=search_text)
-            | Q(merchant_store__icontains=search_text)
-            | Q(purchase_category__icontains=search_text)
-            | Q(id__icontains=search_text)
+            id__in=search_object_ids(request.actor, search_text, SearchEntry.Kinds.RECEIPT, limit=MAX_FILTER_RESULTS)
         ).order_by("-date")
     elif selected_filters:
         context.update({"selected_filters": [selected_filters]})
@@ -11,8 +11,9 @@ def generate_report_endpoint(request: WebRequest):
     start_date: str = request.POST.get("start_date", "")
     end_date: str = request.POST.get("end_date", "")
     name: str = request.POST.get("name", "")
+    live: bool = request.POST.get("live") in ("on", "true")
 
-    generated_report = generate_report(request.actor, start_date, end_date, name)
+    generated_report = generate_report(request.actor, start_date, end_date, name, live=live)
 
     if generated_report.failed:
         messages.error(request, generated_report.error)
@@ -0,0 +1,36 @@
+from datetime import date, timedelta
+
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.utils import timezone
+
+from backend.decorators import web_require_scopes
+from backend.core.service.reports.revenue import revenue_series
+from backend.core.types.requests import WebRequest
+
+REVENUE_INTERVALS = ("day", "month")
+# how far back the charts look when no start date is given
+DEFAULT_REVENUE_RANGE = {"day": timedelta(days=30), "month": timedelta(days=365)}
+
+
+@web_require_scopes("invoices:read", True, True)
+def revenue_series_endpoint(request: WebRequest):
+    interval = request.GET.get("interval", "month")
+    if interval not in REVENUE_INTERVALS:
+        return JsonResponse({"message": f"interval must be one of: {', '.join(REVENUE_INTERVALS)}"}, status=400)
+
+    try:
+        end_date = date.fromisoformat(request.GET["end"]) if request.GET.get("end") else timezone.now().date()
+        start_date = date.fromisoformat(request.GET["start"]) if request.GET.get("start") else end_date - DEFAULT_REVENUE_RANGE[interval]
+    except ValueError:
+        return JsonResponse({"message": "start and end must be dates in the format YYYY-MM-DD"}, status=400)
+
+    if interval == "month":
+        start_date = start_date.replace(day=1)
+
+    series = revenue_series(request.actor, start_date, end_date, interval, currency=request.GET.get("currency") or None)
+
+    if request.htmx:
+        return render(request, "pages/reports/_revenue_series.html", {"series": series, "interval": interval})
+
+    return JsonResponse({"interval": interval, "start": start_date, "end": end_date, "series": series})
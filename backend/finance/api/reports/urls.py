@@ -1,5 +1,5 @@
 from django.urls import path
-from . import generate, fetch
+from . import generate, fetch, revenue
 
 urlpatterns = [
     path(
@@ -8,6 +8,7 @@ urlpatterns = [
         name="generate",
     ),
     path("fetch/", fetch.fetch_reports_endpoint, name="fetch"),
+    path("revenue/", revenue.revenue_series_endpoint, name="revenue"),
 ]
 
 app_name = "reports"
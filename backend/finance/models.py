@@ -1,4 +1,5 @@
 from __future__ import annotations
+from calendar import monthrange
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from typing import Literal
@@ -118,13 +119,68 @@ class InvoiceBase(OwnerBase):
     discount_amount = models.DecimalField(max_digits=15, default=0, decimal_places=2)
     discount_percentage = models.DecimalField(default=0, max_digits=5, decimal_places=2, validators=[MaxValueValidator(100)])
 
+    # materialized money columns, kept in sync by save() (discounts/VAT) and the finance totals signals (items)
+    subtotal = models.DecimalField(max_digits=15, decimal_places=2, default=0, editable=False)
+    discount_total = models.DecimalField(max_digits=15, decimal_places=2, default=0, editable=False)
+    tax_total = models.DecimalField(max_digits=15, decimal_places=2, default=0, editable=False)
+    total = models.DecimalField(max_digits=15, decimal_places=2, default=0, editable=False, db_index=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    MONEY_FIELDS = ("subtotal", "discount_total", "tax_total", "total")
+    # changing any of these only needs discount/tax/total recalculating from the stored subtotal
+    MONEY_INPUT_FIELDS = ("discount_amount", "discount_percentage", "vat_number")
+
     class Meta:
         abstract = True
         constraints = [USER_OR_ORGANIZATION_CONSTRAINT()]
 
+    def save(self, *args, **kwargs):
+        self.apply_totals()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(self.MONEY_INPUT_FIELDS):
+            kwargs["update_fields"] = {*update_fields, *self.MONEY_FIELDS}
+
+        super().save(*args, **kwargs)
+
+    def calculate_items_subtotal(self) -> Decimal:
+        subtotal = sum((item.get_total_price() or Decimal(0) for item in self.items.all()), Decimal(0))
+        return Decimal(round(subtotal, 2))
+
+    def apply_totals(self) -> None:
+        """
+        Recalculates discount, tax and total from the stored subtotal. No queries.
+        """
+        subtotal = Decimal(self.subtotal or 0)
+        discount_percentage = Decimal(str(self.discount_percentage or 0))
+        discount_amount = Decimal(str(self.discount_amount or 0))
+
+        percentage_amount = round(subtotal * (discount_percentage / 100), 2) if discount_percentage > 0 else Decimal(0)
+        total = subtotal - percentage_amount - discount_amount
+
+        if 0 > total:
+            total, tax = Decimal(0), Decimal(0)
+        else:
+            tax = Decimal(round(total * Decimal(0.2), 2)) if self.vat_number else Decimal(0)
+            total -= tax
+
+        self.discount_total = percentage_amount + discount_amount
+        self.tax_total = tax
+        self.total = Decimal(round(total, 2))
+
+    def refresh_totals(self, save: bool = True) -> None:
+        """
+        Recalculates every money column from the items (one query, or none if items are prefetched)
+        """
+        self.subtotal = self.calculate_items_subtotal()
+        self.apply_totals()
+
+        if save and self.pk:
+            # update() rather than save() so refreshing totals doesn't touch updated_at or re-fire save signals
+            type(self).objects.filter(pk=self.pk).update(**{field: getattr(self, field) for field in self.MONEY_FIELDS})
+
     def has_access(self, user: User) -> bool:
         if not user.is_authenticated:
             return False
@@ -156,6 +212,22 @@ class Invoice(InvoiceBase):
         "InvoiceRecurringProfile", related_name="generated_invoices", on_delete=models.SET_NULL, blank=True, null=True
     )
 
+    class Meta(InvoiceBase.Meta):
+        # keyset pagination on the public API and dashboard: each (owner, ordering, id) page is a bounded index range scan
+        indexes = [
+            models.Index(fields=["user", "id"], name="invoice_user_id_idx"),
+            models.Index(fields=["organization", "id"], name="invoice_org_id_idx"),
+            models.Index(fields=["user", "date_due", "id"], name="invoice_user_due_idx"),
+            models.Index(fields=["organization", "date_due", "id"], name="invoice_org_due_idx"),
+            models.Index(fields=["user", "date_issued", "id"], name="invoice_user_issued_idx"),
+            models.Index(fields=["organization", "date_issued", "id"], name="invoice_org_issued_idx"),
+            # dashboard table: status filters with date ordering, and ordering by total
+            models.Index(fields=["user", "status", "date_due", "id"], name="invoice_user_status_due_idx"),
+            models.Index(fields=["organization", "status", "date_due", "id"], name="invoice_org_status_due_idx"),
+            models.Index(fields=["user", "total", "id"], name="invoice_user_total_idx"),
+            models.Index(fields=["organization", "total", "id"], name="invoice_org_total_idx"),
+        ]
+
     def __str__(self):
         if self.client_name:
             client = self.client_name
@@ -199,39 +271,30 @@ class Invoice(InvoiceBase):
             return "manual", {"name": self.client_name, "company": self.client_company, "email": self.client_email}
 
     def get_subtotal(self) -> Decimal:
-        subtotal = 0
-        for item in self.items.all():
-            subtotal += item.get_total_price()
-        return Decimal(round(subtotal, 2))
+        return self.subtotal
 
     def get_tax(self, amount: Decimal = Decimal(0.00)) -> Decimal:
-        amount = amount or self.get_subtotal()
+        if not amount:
+            return self.tax_total
         if self.vat_number:
             return Decimal(round(amount * Decimal(0.2), 2))
         return Decimal(0)
 
     def get_percentage_amount(self, subtotal: Decimal = Decimal(0.00)) -> Decimal:
-        total = subtotal or self.get_subtotal()
+        total = subtotal or self.subtotal
 
         if self.discount_percentage > 0:
             return round(total * (self.discount_percentage / 100), 2)
         return Decimal(0)
 
     def get_total_price(self) -> Decimal:
-        total = self.get_subtotal() or Decimal(0)
+        return self.total
 
-        total -= self.get_percentage_amount()
 
-        discount_amount = self.discount_amount
-
-        total -= discount_amount
-
-        if 0 > total:
-            total = Decimal(0)
-        else:
-            total -= self.get_tax(total)
-
-        return Decimal(round(total, 2))
+def _add_months(day: date, months: int) -> date:
+    year, month = divmod(day.month - 1 + months, 12)
+    year, month = day.year + year, month + 1
+    return date(year, month, min(day.day, monthrange(year, month)[1]))
 
 
 class InvoiceRecurringProfile(InvoiceBase, BotoSchedule):
@@ -259,47 +322,140 @@ class InvoiceRecurringProfile(InvoiceBase, BotoSchedule):
     day_of_month = models.PositiveSmallIntegerField(null=True, blank=True)
     month_of_year = models.PositiveSmallIntegerField(null=True, blank=True)
 
+    # kept up to date on save and after each generated invoice, None once the profile has ended
+    next_issue_date = models.DateField(blank=True, null=True)
+
+    # the fields next_issue_date is calculated from
+    SCHEDULE_FIELDS = frozenset({"status", "active", "frequency", "date_issued", "end_date"})
+
+    class Meta(InvoiceBase.Meta):
+        # due profiles: status = ongoing and next_issue_date <= day, one index range scan
+        indexes = [models.Index(fields=["status", "next_issue_date"], name="recurring_next_issue_idx")]
+
     def get_total_price(self) -> Decimal:
-        total = Decimal(0)
-        for invoice in self.generated_invoices.all():
-            total += invoice.get_total_price()
-        return Decimal(round(total, 2))
+        """
+        Total of every invoice generated from this profile (uses the generated_total annotation when present)
+        """
+        total = getattr(self, "generated_total", None)
+        if total is None:
+            total = self.generated_invoices.aggregate(total=models.Sum("total"))["total"]
+        return Decimal(round(total or 0, 2))
 
     def get_last_invoice(self) -> Invoice | None:
         return self.generated_invoices.order_by("-id").first()
 
     def next_invoice_issue_date(self) -> date:
-        last_invoice = self.get_last_invoice()
+        return self.next_issue_date or self.scheduled_issue_date() or datetime.now().date()
 
-        if not last_invoice:
-            if self.date_issued is None:
-                return datetime.now().date()
-            return max(self.date_issued, datetime.now().date())
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # what next_issue_date was calculated from, so a full save() only recalculates it when one of them changed
+        instance._loaded_schedule = {name: getattr(instance, name) for name in cls.SCHEDULE_FIELDS if name in field_names}
+        return instance
 
-        last_invoice_date_issued: date = last_invoice.date_issued or datetime.now().date()
+    def schedule_changed(self) -> bool:
+        loaded = getattr(self, "_loaded_schedule", None)
+        return loaded is None or any(getattr(self, name) != value for name, value in loaded.items())
 
+    def generated_periods(self) -> tuple[date | None, date | None]:
+        """
+        The first and last periods generated, from the generation ledger, or for profiles generated before the ledger
+        existed, from the generated invoices
+        """
+        periods = self.generations.aggregate(first=models.Min("period"), last=models.Max("period"))
+        if periods["last"] is None:
+            periods = self.generated_invoices.aggregate(first=models.Min("date_issued"), last=models.Max("date_issued"))
+        return periods["first"], periods["last"]
+
+    def scheduled_issue_date(self, today: date | None = None) -> date | None:
+        """
+        One period after the last generated one (or the profile's issue date if none were), rolled forward so it
+        is never before today: periods missed while paused aren't invoiced. None once past the end date.
+        """
+        today = today or datetime.now().date()
+        first_period, last_period = self.generated_periods()
+
+        if not last_period:
+            issue_date = max(self.date_issued or today, today)
+        elif (issue_date := self.issue_date_following(last_period, anchor=first_period)) < today:
+            issue_date = self.issue_date_following(today - timedelta(days=1), anchor=first_period)
+
+        return self._within_end_date(issue_date)
+
+    def issue_date_after(self, last_issued: date, periods: int = 1) -> date:
+        """
+        The issue date periods after an invoice issued on last_issued. Month ends are clamped (31st Jan -> 28th/29th Feb).
+        """
         match self.frequency:
             case "weekly":
-                return last_invoice_date_issued + timedelta(days=7)
+                return last_issued + timedelta(days=7 * periods)
             case "monthly":
-                return date(year=last_invoice_date_issued.year, month=last_invoice_date_issued.month + 1, day=last_invoice_date_issued.day)
+                return _add_months(last_issued, periods)
             case "yearly":
-                return date(year=last_invoice_date_issued.year + 1, month=last_invoice_date_issued.month, day=last_invoice_date_issued.day)
+                return _add_months(last_issued, 12 * periods)
             case _:
                 return datetime.now().date()
 
+    def issue_date_following(self, period: date, anchor: date | None = None) -> date:
+        """
+        The first issue date after period, counted in whole periods from the schedule's anchor (its issue date, else
+        its first generated period) so a clamped month end isn't carried on: 31st Jan, 29th Feb, then 31st Mar.
+        """
+        anchor = self.date_issued or anchor or period
+        if anchor > period or self.frequency not in self.Frequencies.values:
+            return self.issue_date_after(period)
+
+        months = (period.year - anchor.year) * 12 + period.month - anchor.month
+        periods = max(1, {"weekly": (period - anchor).days // 7, "monthly": months, "yearly": months // 12}[self.frequency])
+        while (issue_date := self.issue_date_after(anchor, periods)) <= period:
+            periods += 1
+        return issue_date
+
+    def following_issue_date(self, period: date, anchor: date | None = None) -> date | None:
+        """
+        next_issue_date once the invoice of period was generated
+        """
+        return self._within_end_date(self.issue_date_following(period, anchor))
+
+    def _within_end_date(self, issue_date: date) -> date | None:
+        return None if self.end_date and issue_date > self.end_date else issue_date
+
     def next_invoice_due_date(self, account_defaults: DefaultValues, from_date: date = datetime.now().date()) -> date:
         match account_defaults.invoice_due_date_type:
             case account_defaults.InvoiceDueDateType.days_after:
                 return from_date + timedelta(days=account_defaults.invoice_due_date_value)
             case account_defaults.InvoiceDueDateType.date_following:
-                return datetime(from_date.year, from_date.month + 1, account_defaults.invoice_due_date_value)
+                following = _add_months(from_date.replace(day=1), 1)
+                return following.replace(day=min(account_defaults.invoice_due_date_value, monthrange(following.year, following.month)[1]))
             case account_defaults.InvoiceDueDateType.date_current:
-                return datetime(from_date.year, from_date.month, account_defaults.invoice_due_date_value)
+                return from_date.replace(day=min(account_defaults.invoice_due_date_value, monthrange(from_date.year, from_date.month)[1]))
             case _:
                 return from_date + timedelta(days=7)
 
 
+class RecurringInvoiceGeneration(models.Model):
+    """
+    Ledger of the invoice generated for each period of a recurring profile. The unique (profile, period) row is
+    claimed in the same transaction as the invoice, so a retried or concurrent delivery for a period that was
+    already generated fails on the constraint instead of creating a second invoice.
+    """
+
+    profile = models.ForeignKey(InvoiceRecurringProfile, on_delete=models.CASCADE, related_name="generations")
+    period = models.DateField()
+    # kept when the invoice is deleted, so the period isn't generated again
+    invoice = models.OneToOneField(Invoice, on_delete=models.SET_NULL, blank=True, null=True, related_name="recurring_generation")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Profile #{self.profile_id} for {self.period}"
+
+    class Meta:
+        verbose_name = "Recurring Invoice Generation"
+        verbose_name_plural = "Recurring Invoice Generations"
+        constraints = [models.UniqueConstraint(fields=["profile", "period"], name="recurring_generation_period_unique")]
+
+
 class InvoiceURL(ExpiresBase):
     uuid = ShortUUIDField(length=8, primary_key=True)
     invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name="invoice_urls")
@@ -325,6 +481,53 @@ class InvoiceURL(ExpiresBase):
         verbose_name_plural = "Invoice URLs"
 
 
+class InvoicePDF(models.Model):
+    """
+    The last rendered PDF of an invoice. render_hash covers everything the render reads, so a changed invoice
+    never serves a stale file; least recently used files are evicted once the cache grows past its size limit.
+    """
+
+    invoice = models.OneToOneField(Invoice, on_delete=models.CASCADE, primary_key=True, related_name="cached_pdf")
+    render_hash = models.CharField(max_length=64)
+    file = models.FileField(upload_to="invoice_pdfs", storage=_private_storage)
+    size = models.PositiveIntegerField(default=0)
+    rendered_at = models.DateTimeField(default=timezone.now)
+    last_accessed = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"PDF of invoice #{self.invoice_id}"
+
+    class Meta:
+        verbose_name = "Invoice PDF"
+        verbose_name_plural = "Invoice PDFs"
+
+
+class InvoiceExport(OwnerBase):
+    """
+    A bulk PDF export run by a background task. Its progress is kept in the database so every process, including the
+    task worker, reads the same state; file_path is the ZIP in private storage once the export finished.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    filename = models.CharField(max_length=100)
+    done = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    file_path = models.CharField(max_length=255, blank=True, default="")
+    failed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Invoice export {self.id}"
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.file_path)
+
+    class Meta(OwnerBase.Meta):
+        verbose_name = "Invoice Export"
+        verbose_name_plural = "Invoice Exports"
+
+
 class InvoiceReminder(BotoSchedule):
     class ReminderTypes(models.TextChoices):
         BEFORE_DUE = "before_due", "Before Due"
@@ -356,10 +559,67 @@ class MonthlyReportRow(models.Model):
     paid_out = models.DecimalField(max_digits=15, decimal_places=2, default=0)
 
 
+class ReportDayBucket(OwnerBase):
+    """
+    Pre-aggregated report figures for one owner and one day, kept in sync by the finance report bucket signals.
+    Live reports sum these instead of rescanning invoices and receipts.
+    """
+
+    date = models.DateField()
+
+    payments_in = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    payments_out = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    invoices_sent = models.PositiveIntegerField(default=0)
+    recurring_invoices = models.PositiveIntegerField(default=0)
+
+    class Meta(OwnerBase.Meta):
+        # not partial: nulls never conflict anyway, and upserts (refresh_report_buckets) can only target full constraints
+        constraints = [
+            *OwnerBase.Meta.constraints,
+            models.UniqueConstraint(fields=["user", "date"], name="report_bucket_user_date_unique"),
+            models.UniqueConstraint(fields=["organization", "date"], name="report_bucket_org_date_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.owner} {self.date}"
+
+
+class RevenueRollup(OwnerBase):
+    """
+    Invoice figures for one owner, issue day, currency and status, kept in sync by the finance report bucket signals.
+    Dashboard charts read time series from here instead of scanning invoices.
+    """
+
+    day = models.DateField()
+    currency = models.CharField(max_length=3)
+    status = models.CharField(max_length=10)
+
+    invoiced = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    paid = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    outstanding = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    # pending and past their due date when the row was last refreshed, see refresh_overdue_revenue_rollups
+    overdue = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    invoice_count = models.PositiveIntegerField(default=0)
+
+    class Meta(OwnerBase.Meta):
+        # the unique indexes lead with (owner, day), so a chart's date range is one index range scan. Not partial, so
+        # refresh_revenue_rollup can upsert against them
+        constraints = [
+            *OwnerBase.Meta.constraints,
+            models.UniqueConstraint(fields=["user", "day", "currency", "status"], name="revenue_rollup_user_unique"),
+            models.UniqueConstraint(fields=["organization", "day", "currency", "status"], name="revenue_rollup_org_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.owner} {self.day} {self.currency} {self.status}"
+
+
 class MonthlyReport(OwnerBase):
     uuid = models.UUIDField(default=uuid4, editable=False, unique=True)
     name = models.CharField(max_length=100, blank=True, null=True)
     items = models.ManyToManyField(MonthlyReportRow, blank=True)
+    # live reports read their figures from ReportDayBucket whenever they are opened instead of storing rows
+    live = models.BooleanField(default=False)
 
     profit = models.DecimalField(max_digits=15, decimal_places=2, default=0)
     invoices_sent = models.PositiveIntegerField(default=0)
@@ -0,0 +1,3 @@
+from __future__ import annotations
+
+from . import totals, report_buckets, pdf_cache, public_invoices, recurring_schedule
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.core.service.invoices.single.pdf_cache import discard_invoice_pdf
+from backend.finance.models import Invoice, InvoicePDF
+
+
+@receiver(post_save, sender=Invoice)
+def discard_changed_invoice_pdf(sender, instance: Invoice, created: bool, **kwargs):
+    # the render hash already keeps a stale PDF from being served, this frees its storage straight away
+    if not created:
+        discard_invoice_pdf(instance.pk)
+
+
+@receiver(post_delete, sender=InvoicePDF)
+def delete_invoice_pdf_file(sender, instance: InvoicePDF, **kwargs):
+    if instance.file:
+        instance.file.delete(save=False)
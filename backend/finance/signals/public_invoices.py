@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.clients.models import Client
+from backend.core.service.invoices.single.public_page import invalidate_public_invoice_url, invalidate_public_invoices
+from backend.finance.models import Invoice, InvoiceURL
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_delete, sender=Invoice)
+def invalidate_changed_invoice(sender, instance: Invoice, **kwargs):
+    invalidate_public_invoices([instance.pk])
+
+
+@receiver(post_save, sender=Client)
+def invalidate_client_invoices(sender, instance: Client, created: bool, **kwargs):
+    # the public page shows the client's details
+    if not created:
+        invalidate_public_invoices(Invoice.objects.filter(client_to=instance).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=InvoiceURL)
+@receiver(post_delete, sender=InvoiceURL)
+def invalidate_changed_url(sender, instance: InvoiceURL, **kwargs):
+    invalidate_public_invoice_url(instance.uuid)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.core.service.invoices.recurring.schedule import refresh_next_issue_date
+from backend.core.service.invoices.recurring.schedule_status import publish_schedule_status
+from backend.finance.models import Invoice, InvoiceRecurringProfile
+
+# the fields written once the AWS schedule was created, updated or failed to
+SCHEDULE_SYNC_FIELDS = {"boto_schedule_status", "boto_schedule_arn", "boto_schedule_uuid"}
+
+
+@receiver(post_save, sender=InvoiceRecurringProfile)
+def update_next_issue_date(
+    sender, instance: InvoiceRecurringProfile, created: bool, update_fields: frozenset[str] | None, raw: bool, **kwargs
+):
+    # covers creation, edits of the frequency or dates, and pausing / resuming. Other saves keep the stored date,
+    # so a period that is due but not generated yet isn't rolled forward past
+    if raw:
+        return
+    if update_fields is None:
+        if not created and not instance.schedule_changed():
+            return
+    elif not InvoiceRecurringProfile.SCHEDULE_FIELDS & update_fields:
+        return
+    refresh_next_issue_date(instance)
+    instance._loaded_schedule = {name: getattr(instance, name) for name in InvoiceRecurringProfile.SCHEDULE_FIELDS}
+
+
+@receiver(post_delete, sender=Invoice)
+def reschedule_after_generated_invoice_deleted(sender, instance: Invoice, **kwargs):
+    if instance.invoice_recurring_profile_id:
+        if profile := InvoiceRecurringProfile.objects.filter(pk=instance.invoice_recurring_profile_id).first():
+            refresh_next_issue_date(profile)
+
+
+@receiver(post_save, sender=InvoiceRecurringProfile)
+def publish_schedule_change(sender, instance: InvoiceRecurringProfile, created: bool, update_fields: frozenset[str] | None, **kwargs):
+    # once committed, so dashboards woken up by it read the new state
+    if not created and (update_fields is None or SCHEDULE_SYNC_FIELDS & update_fields):
+        transaction.on_commit(lambda: publish_schedule_status(instance.pk))
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from backend.core.service.reports.buckets import owner_key, refresh_report_buckets
+from backend.core.service.reports.revenue import refresh_revenue_rollup
+from backend.finance.models import Invoice, Receipt
+
+# the field each model is bucketed by
+BUCKET_DATE_FIELDS: dict[type, str] = {Invoice: "date_issued", Receipt: "date"}
+# saves that can't move a row to another owner or day don't need its previous bucket looking up
+BUCKET_KEY_FIELDS = {"user", "user_id", "organization", "organization_id", "date_issued", "date"}
+
+
+def _bucket_of(instance: Invoice | Receipt):
+    return owner_key(instance), getattr(instance, BUCKET_DATE_FIELDS[type(instance)])
+
+
+@receiver(pre_save, sender=Invoice)
+@receiver(pre_save, sender=Receipt)
+def remember_previous_bucket(sender, instance: Invoice | Receipt, update_fields=None, **kwargs):
+    instance._previous_report_bucket = None
+
+    if not instance.pk or (update_fields is not None and not BUCKET_KEY_FIELDS & set(update_fields)):
+        return
+
+    date_field = BUCKET_DATE_FIELDS[sender]
+    previous = sender.objects.filter(pk=instance.pk).values("user_id", "organization_id", date_field).first()
+    if previous:
+        owner = ("user_id", previous["user_id"]) if previous["user_id"] else ("organization_id", previous["organization_id"])
+        instance._previous_report_bucket = owner, previous[date_field]
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_save, sender=Receipt)
+def refresh_saved_bucket(sender, instance: Invoice | Receipt, **kwargs):
+    owner, day = _bucket_of(instance)
+    previous = getattr(instance, "_previous_report_bucket", None)
+
+    if previous and previous[0] != owner:
+        refreshes = [(previous[0], [previous[1]]), (owner, [day])]
+    else:
+        refreshes = [(owner, [day, previous[1] if previous else None])]
+
+    for bucket_owner, days in refreshes:
+        refresh_report_buckets(bucket_owner, days)
+        if sender is Invoice:
+            refresh_revenue_rollup(bucket_owner, days)
+
+
+@receiver(post_delete, sender=Invoice)
+@receiver(post_delete, sender=Receipt)
+def refresh_deleted_bucket(sender, instance: Invoice | Receipt, **kwargs):
+    owner, day = _bucket_of(instance)
+    refresh_report_buckets(owner, [day])
+    if sender is Invoice:
+        refresh_revenue_rollup(owner, [day])
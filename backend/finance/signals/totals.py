@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from backend.core.service.invoices.single.public_page import invalidate_public_invoices
+from backend.core.service.reports.buckets import refresh_report_buckets_for
+from backend.core.service.reports.revenue import refresh_revenue_rollup_for
+from backend.finance.models import Invoice, InvoiceItem, InvoiceRecurringProfile, InvoiceBase
+
+INVOICE_MODELS: tuple[type[InvoiceBase], ...] = (Invoice, InvoiceRecurringProfile)
+
+
+def refresh_totals_for(model: type[InvoiceBase], ids: Iterable[int]) -> None:
+    invoices = list(model.objects.filter(pk__in=set(ids)).prefetch_related("items"))
+    for invoice in invoices:
+        invoice.refresh_totals()
+
+    if model is Invoice:
+        # totals are written with update(), so the report buckets, revenue rollup and public page cache don't see a save
+        refresh_report_buckets_for(invoices, "date_issued")
+        refresh_revenue_rollup_for(invoices)
+        invalidate_public_invoices(invoice.pk for invoice in invoices)
+
+
+def _related_invoice_ids(item: InvoiceItem) -> dict[type[InvoiceBase], list[int]]:
+    return {model: list(model.objects.filter(items=item).values_list("pk", flat=True)) for model in INVOICE_MODELS}
+
+
+def items_changed(sender, instance, action: str, reverse: bool, model, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # the links are gone by post_clear, so remember which invoices the item belonged to
+        instance._totals_invoice_ids = _related_invoice_ids(instance)
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        instance.refresh_totals()
+        if isinstance(instance, Invoice):
+            refresh_report_buckets_for([instance], "date_issued")
+            refresh_revenue_rollup_for([instance])
+            invalidate_public_invoices([instance.pk])
+    elif action == "post_clear":
+        for invoice_model, ids in getattr(instance, "_totals_invoice_ids", {}).items():
+            refresh_totals_for(invoice_model, ids)
+    else:
+        refresh_totals_for(model, pk_set or ())
+
+
+for invoice_model in INVOICE_MODELS:
+    m2m_changed.connect(items_changed, sender=invoice_model.items.through, dispatch_uid=f"invoice_totals_{invoice_model.__name__}")
+
+
+@receiver(post_save, sender=InvoiceItem)
+def item_saved(sender, instance: InvoiceItem, created: bool, **kwargs):
+    if created:
+        return  # not linked to an invoice yet, m2m_changed handles it once it is
+
+    for invoice_model, ids in _related_invoice_ids(instance).items():
+        refresh_totals_for(invoice_model, ids)
+
+
+@receiver(pre_delete, sender=InvoiceItem)
+def item_deleting(sender, instance: InvoiceItem, **kwargs):
+    instance._totals_invoice_ids = _related_invoice_ids(instance)
+
+
+@receiver(post_delete, sender=InvoiceItem)
+def item_deleted(sender, instance: InvoiceItem, **kwargs):
+    for invoice_model, ids in getattr(instance, "_totals_invoice_ids", {}).items():
+        refresh_totals_for(invoice_model, ids)
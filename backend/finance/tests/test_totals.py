@@ -0,0 +1,105 @@
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from backend.core.management.commands.backfill_invoice_totals import Command as BackfillInvoiceTotalsCommand
+from backend.finance.models import Invoice, InvoiceItem, InvoiceRecurringProfile
+
+
+class InvoiceTotalsTests(TestCase):
+    def setUp(self):
+        self.user = baker.make("backend.User")
+        self.invoice = baker.make(Invoice, user=self.user, vat_number=None, discount_amount=0, discount_percentage=0)
+
+    def make_item(self, price: str) -> InvoiceItem:
+        return InvoiceItem.objects.create(name="item", description="item", is_service=False, price=Decimal(price))
+
+    def assertTotals(self, subtotal: str, discount: str, tax: str, total: str):
+        self.invoice.refresh_from_db()
+        self.assertEqual(
+            (self.invoice.subtotal, self.invoice.discount_total, self.invoice.tax_total, self.invoice.total),
+            (Decimal(subtotal), Decimal(discount), Decimal(tax), Decimal(total)),
+        )
+
+    def test_adding_and_removing_items_updates_totals(self):
+        first, second = self.make_item("100"), self.make_item("50")
+
+        self.invoice.items.add(first, second)
+        self.assertTotals("150", "0", "0", "150")
+
+        self.invoice.items.remove(second)
+        self.assertTotals("100", "0", "0", "100")
+
+        self.invoice.items.clear()
+        self.assertTotals("0", "0", "0", "0")
+
+    def test_editing_and_deleting_items_updates_totals(self):
+        item = self.make_item("100")
+        self.invoice.items.add(item)
+
+        item.price = Decimal("80")
+        item.save()
+        self.assertTotals("80", "0", "0", "80")
+
+        item.delete()
+        self.assertTotals("0", "0", "0", "0")
+
+    def test_discounts_and_vat_are_applied_on_save(self):
+        self.invoice.items.add(self.make_item("200"))
+        self.invoice.refresh_from_db()
+
+        self.invoice.discount_percentage = 10
+        self.invoice.discount_amount = 20
+        self.invoice.vat_number = "GB123"
+        self.invoice.save(update_fields=["discount_percentage", "discount_amount", "vat_number"])
+
+        # 200 - 10% - 20 = 160, VAT 20% of 160 = 32
+        self.assertTotals("200", "40", "32", "128")
+
+    def test_getters_read_stored_totals_without_queries(self):
+        self.invoice.items.add(self.make_item("100"))
+        invoice = Invoice.objects.get(pk=self.invoice.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(invoice.get_subtotal(), Decimal("100"))
+            self.assertEqual(invoice.get_total_price(), Decimal("100"))
+
+    def test_backfill_recalculates_stale_totals(self):
+        self.invoice.items.add(self.make_item("75"))
+        profile = baker.make(InvoiceRecurringProfile, user=self.user, vat_number=None, discount_amount=0, discount_percentage=0)
+        profile.items.add(self.make_item("30"))
+
+        Invoice.objects.update(subtotal=0, total=0)
+        InvoiceRecurringProfile.objects.update(subtotal=0, total=0)
+
+        call_command(BackfillInvoiceTotalsCommand(), batch_size=1, stdout=StringIO())
+
+        self.assertTotals("75", "0", "0", "75")
+        profile.refresh_from_db()
+        self.assertEqual(profile.total, Decimal("30"))
+
+    def test_migration_backfills_existing_totals(self):
+        backfill = import_module("backend.migrations.0074_invoice_money_columns").backfill_invoice_totals
+        self.invoice.items.add(self.make_item("100"))
+        self.invoice.discount_percentage = 10
+        self.invoice.vat_number = "GB123"
+        self.invoice.save()
+        profile = baker.make(InvoiceRecurringProfile, user=self.user, vat_number=None, discount_amount=5, discount_percentage=0)
+        profile.items.add(self.make_item("30"))
+        self.invoice.refresh_from_db()
+        expected = [getattr(self.invoice, field) for field in Invoice.MONEY_FIELDS]
+
+        Invoice.objects.update(subtotal=0, discount_total=0, tax_total=0, total=0)
+        InvoiceRecurringProfile.objects.update(subtotal=0, discount_total=0, tax_total=0, total=0)
+
+        backfill(django_apps, None)
+
+        self.invoice.refresh_from_db()
+        self.assertEqual([getattr(self.invoice, field) for field in Invoice.MONEY_FIELDS], expected)
+        profile.refresh_from_db()
+        self.assertEqual(profile.total, Decimal("25"))
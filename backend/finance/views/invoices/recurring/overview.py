@@ -1,3 +1,5 @@
+from django.db.models import Count, Q, Sum
+
 from backend.decorators import *
 from backend.models import *
 from backend.core.service.defaults.get import get_account_defaults
@@ -28,14 +30,10 @@ def manage_recurring_invoice_profile_endpoint(request: WebRequest, invoice_profi
         context["client_email"] = invoice_profile.client_email
         context["client_is_representative"] = invoice_profile.client_is_representative
 
-    context["total_amt"] = 0
-    context["total_count"] = invoice_profile.generated_invoices.count()
-    context["total_paid"] = 0
-
-    for invoice in invoice_profile.generated_invoices.all():
-        if invoice.status == "paid":
-            context["total_paid"] += 1
-        context["total_amt"] += invoice.get_total_price()
+    generated = invoice_profile.generated_invoices.aggregate(
+        total_amt=Sum("total", default=0), total_count=Count("id"), total_paid=Count("id", filter=Q(status="paid"))
+    )
+    context |= generated
 
     ACCOUNT_DEFAULTS = get_account_defaults(request.actor, invoice_profile.client_to)
 
@@ -4,11 +4,14 @@ from django.contrib import messages
 from django.shortcuts import redirect
 from django.shortcuts import render
 from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 
 from login_required import login_not_required
 
 from backend.decorators import web_require_scopes
-from backend.finance.models import Invoice, InvoiceURL
+from backend.finance.models import Invoice
+from backend.core.service.invoices.single.public_page import get_public_invoice, get_public_invoice_url, get_public_invoice_version
 from backend.core.types.htmx import HtmxHttpRequest
 
 
@@ -39,21 +42,37 @@ def preview(request: HtmxHttpRequest, invoice_id: str) -> HttpResponse:
 def view_invoice_with_uuid_endpoint(request, uuid):
     context = {"type": "view"}
 
-    try:
-        url = InvoiceURL.objects.select_related("invoice").prefetch_related("invoice", "invoice__items").get(uuid=uuid)
-        invoice = url.invoice
-        if not invoice:
-            raise InvoiceURL.DoesNotExist
-    except InvoiceURL.DoesNotExist:
-        messages.error(request, "Invoice not found")
-        return redirect("index")
+    url = get_public_invoice_url(uuid)
+    if not url or url.has_expired:
+        return _public_invoice_not_found(request)
+
+    # the version and share link are cached, so revalidations are answered before the invoice is loaded
+    version = get_public_invoice_version(url.invoice_id)
+    # signed in viewers get an extra link, so they get their own ETag
+    etag = version.etag("user" if request.user.is_authenticated else "")
+    last_modified = int(version.changed_at.timestamp())
+    if not_modified := get_conditional_response(request, etag=etag, last_modified=last_modified):
+        return not_modified
+
+    if not (invoice := get_public_invoice(url.invoice_id, version)):
+        return _public_invoice_not_found(request)
 
     currency_symbol = invoice.get_currency_symbol()
 
     context.update({"invoice": invoice, "currency_symbol": currency_symbol})
 
-    return render(
+    response = render(
         request,
         "pages/invoices/single/view/invoice_page.html",
         context,
     )
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    # the page embeds the viewer's CSRF token, so only their browser may keep it (and must revalidate)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _public_invoice_not_found(request) -> HttpResponse:
+    messages.error(request, "Invoice not found")
+    return redirect("index")
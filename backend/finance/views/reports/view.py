@@ -1,5 +1,6 @@
 from django.contrib import messages
 
+from backend.core.service.reports.buckets import refresh_live_report
 from backend.core.service.reports.get import get_report
 from backend.core.types.requests import WebRequest
 from django.shortcuts import render, redirect
@@ -12,4 +13,4 @@ def view_report_endpoint(request: WebRequest, uuid):
         messages.error(request, report.error)
         return redirect("reports:dashboard")
 
-    return render(request, "pages/reports/monthly_report_base.html", {"report": report.response})
+    return render(request, "pages/reports/monthly_report_base.html", {"report": refresh_live_report(report.response)})
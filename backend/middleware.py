@@ -1,11 +1,12 @@
 from django.contrib.auth.models import AnonymousUser
 from django.utils.deprecation import MiddlewareMixin
-from django.contrib.auth import get_user
+from django.utils.functional import SimpleLazyObject
 from django.db import connection, OperationalError
 from django.http import HttpResponse
 
-from backend.models import User
+from backend.core.service.users.snapshot import get_session_user_snapshot
 from backend.core.types.htmx import HtmxAnyHttpRequest
+from backend.core.utils.navigation import get_navigation_storage
 from backend.core.types.requests import WebRequest
 
 
@@ -48,29 +49,39 @@ class HTMXPartialLoadMiddleware:
 
 
 class LastVisitedMiddleware:
+    """
+    Tracks the previous page (see get_last_visited) in the configured NAVIGATION_HISTORY_STORAGE.
+    Only persisted when the page actually changes, and never through the session by default.
+    """
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.storage = get_navigation_storage()
 
     def __call__(self, request):
-        if request.method == "GET" and "text/html" in request.headers.get("Accept", ""):
-            try:
-                request.session["last_visited"] = request.session["currently_visiting"]
-            except KeyError:
-                pass
-            current_url = request.build_absolute_uri()
-            request.session["currently_visiting"] = current_url
-        return self.get_response(request)
+        request.navigation = SimpleLazyObject(lambda: self.storage.load(request))
+        is_page_view = request.method == "GET" and "text/html" in request.headers.get("Accept", "")
+
+        if is_page_view:
+            request.navigation.visit(request.build_absolute_uri())
+
+        response = self.get_response(request)
+
+        if is_page_view and request.navigation.changed:
+            self.storage.save(request, response, request.navigation)
+        return response
 
 
 class CustomUserMiddleware(MiddlewareMixin):
     def process_request(self, request: WebRequest):
-        user = get_user(request)
-
-        # Replace request.user with CustomUser instance if authenticated
-        if user.is_authenticated:
-            request.user = User.objects.get(pk=user.pk)
-            request.team = request.user.logged_in_as_team or None
-            request.team_id = request.team.id if request.team else None
+        snapshot = get_session_user_snapshot(request)
+
+        # Team and actor come from the cached session snapshot; the user itself is only rebuilt when accessed
+        if snapshot:
+            team = snapshot.build_team()
+            request.user = SimpleLazyObject(lambda: snapshot.build_user(team))  # type: ignore[assignment]
+            request.team = team
+            request.team_id = snapshot.team_id
             request.actor = request.team or request.user
         else:
             # If user is not authenticated, set request.user to AnonymousUser
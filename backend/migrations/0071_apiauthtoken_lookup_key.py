@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0070_remove_invoice_invoice_id_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apiauthtoken",
+            name="lookup_key",
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True, verbose_name="Lookup Key"),
+        ),
+        migrations.AlterField(
+            model_name="apiauthtoken",
+            name="hashed_key",
+            field=models.CharField(blank=True, max_length=128, null=True, unique=True, verbose_name="Key"),
+        ),
+    ]
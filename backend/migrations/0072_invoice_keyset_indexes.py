@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0071_apiauthtoken_lookup_key"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["user", "id"], name="invoice_user_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["organization", "id"], name="invoice_org_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["user", "date_due", "id"], name="invoice_user_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["organization", "date_due", "id"], name="invoice_org_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["user", "date_issued", "id"], name="invoice_user_issued_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["organization", "date_issued", "id"], name="invoice_org_issued_idx"),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:18
+
+from django.db import migrations, models
+
+try:
+    from django.contrib.postgres.operations import TrigramExtension
+except ImportError:  # psycopg2 is only installed with the optional postgres dependency group
+    TrigramExtension = None
+
+TRIGRAM_INDEXED_FIELDS = ("name", "email", "company")
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # icontains/istartswith compile to UPPER(col::text) LIKE UPPER(...) on PostgreSQL, which a trigram index on the same
+    # expression can serve. Other databases keep using the btree indexes only.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for field in TRIGRAM_INDEXED_FIELDS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS client_{field}_trgm_idx ON backend_client USING gin (UPPER({field}::text) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for field in TRIGRAM_INDEXED_FIELDS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS client_{field}_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0072_invoice_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["user", "active", "id"], name="client_user_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["organization", "active", "id"], name="client_org_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["user", "active", "name", "id"], name="client_user_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(fields=["organization", "active", "name", "id"], name="client_org_name_idx"),
+        ),
+        # CreateExtension skips databases other than PostgreSQL
+        *([TrigramExtension()] if TrigramExtension else []),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
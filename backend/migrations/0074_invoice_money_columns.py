@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:23
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+MONEY_FIELDS = ["subtotal", "discount_total", "tax_total", "total"]
+
+
+def _apply_totals(invoice, items):
+    # frozen copy of InvoiceBase.refresh_totals, historical models don't have its methods
+    subtotal = sum(
+        (((item.hours or 0) * (item.price_per_hour or 0) if item.is_service else item.price) or Decimal(0) for item in items),
+        Decimal(0),
+    )
+    subtotal = Decimal(round(subtotal, 2))
+    discount_percentage = Decimal(str(invoice.discount_percentage or 0))
+    discount_amount = Decimal(str(invoice.discount_amount or 0))
+
+    percentage_amount = round(subtotal * (discount_percentage / 100), 2) if discount_percentage > 0 else Decimal(0)
+    total = subtotal - percentage_amount - discount_amount
+
+    if 0 > total:
+        total, tax = Decimal(0), Decimal(0)
+    else:
+        tax = Decimal(round(total * Decimal(0.2), 2)) if invoice.vat_number else Decimal(0)
+        total -= tax
+
+    invoice.subtotal = subtotal
+    invoice.discount_total = percentage_amount + discount_amount
+    invoice.tax_total = tax
+    invoice.total = Decimal(round(total, 2))
+
+
+def backfill_invoice_totals(apps, schema_editor):
+    for model_name in ("Invoice", "InvoiceRecurringProfile"):
+        model = apps.get_model("backend", model_name)
+        last_id = 0
+
+        while True:
+            batch = list(model._default_manager.filter(pk__gt=last_id).order_by("pk").prefetch_related("items")[:BATCH_SIZE])
+            if not batch:
+                break
+
+            for invoice in batch:
+                _apply_totals(invoice, invoice.items.all())
+
+            model._default_manager.bulk_update(batch, MONEY_FIELDS)
+            last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0073_client_keyset_and_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoice",
+            name="discount_total",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name="invoice",
+            name="subtotal",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name="invoice",
+            name="tax_total",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name="invoice",
+            name="total",
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name="invoicerecurringprofile",
+            name="discount_total",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name="invoicerecurringprofile",
+            name="subtotal",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name="invoicerecurringprofile",
+            name="tax_total",
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.AddField(
+            model_name="invoicerecurringprofile",
+            name="total",
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, editable=False, max_digits=15),
+        ),
+        migrations.RunPython(backfill_invoice_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:29
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+BATCH_SIZE = 500
+
+
+def backfill_report_buckets(apps, schema_editor):
+    """
+    A bucket per owner and day with invoices or receipts, as backend.core.service.reports.buckets computes them
+    """
+    Invoice = apps.get_model("backend", "Invoice")
+    Receipt = apps.get_model("backend", "Receipt")
+    ReportDayBucket = apps.get_model("backend", "ReportDayBucket")
+    buckets = {}
+
+    def bucket(user_id, organization_id, day):
+        key = (user_id, organization_id, day)
+        if key not in buckets:
+            buckets[key] = ReportDayBucket(user_id=user_id, organization_id=organization_id, date=day)
+        return buckets[key]
+
+    invoice_days = (
+        Invoice._default_manager.filter(date_issued__isnull=False)
+        .values("user_id", "organization_id", "date_issued")
+        .annotate(
+            payments_in=Sum("total", filter=Q(total__gt=0), default=Decimal(0)),
+            invoices_sent=Count("id"),
+            recurring_invoices=Count("id", filter=Q(invoice_recurring_profile__isnull=False)),
+        )
+        .order_by()
+    )
+    for row in invoice_days:
+        day = bucket(row["user_id"], row["organization_id"], row["date_issued"])
+        day.payments_in, day.invoices_sent, day.recurring_invoices = row["payments_in"], row["invoices_sent"], row["recurring_invoices"]
+
+    receipt_days = (
+        Receipt._default_manager.filter(date__isnull=False)
+        .values("user_id", "organization_id", "date")
+        .annotate(payments_out=Sum("total_price"))
+        .order_by()
+    )
+    for row in receipt_days:
+        bucket(row["user_id"], row["organization_id"], row["date"]).payments_out = round(Decimal(row["payments_out"] or 0), 2)
+
+    ReportDayBucket._default_manager.bulk_create(buckets.values(), batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0074_invoice_money_columns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="monthlyreport",
+            name="live",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name="ReportDayBucket",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("payments_in", models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ("payments_out", models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ("invoices_sent", models.PositiveIntegerField(default=0)),
+                ("recurring_invoices", models.PositiveIntegerField(default=0)),
+                (
+                    "organization",
+                    models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to="backend.organization"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            options={
+                "abstract": False,
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(("organization__isnull", False), ("user__isnull", True)),
+                            models.Q(("organization__isnull", True), ("user__isnull", False)),
+                            _connector="OR",
+                        ),
+                        name="backend_reportdaybucket_check_user_or_organization",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("user__isnull", False)), fields=("user", "date"), name="report_bucket_user_date_unique"
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("organization__isnull", False)),
+                        fields=("organization", "date"),
+                        name="report_bucket_org_date_unique",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_report_buckets, migrations.RunPython.noop),
+    ]
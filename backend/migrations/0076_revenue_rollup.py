@@ -0,0 +1,105 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:33
+
+from datetime import date
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+BATCH_SIZE = 500
+
+
+def backfill_revenue_rollup(apps, schema_editor):
+    """
+    A row per owner, issue day, currency and status, as backend.core.service.reports.revenue computes them
+    """
+    Invoice = apps.get_model("backend", "Invoice")
+    RevenueRollup = apps.get_model("backend", "RevenueRollup")
+    today = date.today()
+
+    rows = (
+        Invoice._default_manager.filter(date_issued__isnull=False)
+        .values("user_id", "organization_id", "date_issued", "currency", "status")
+        .annotate(
+            invoiced=Sum("total", default=Decimal(0)),
+            invoice_count=Count("id"),
+            overdue=Sum("total", filter=Q(status="pending", date_due__lt=today), default=Decimal(0)),
+        )
+        .order_by()
+    )
+    RevenueRollup._default_manager.bulk_create(
+        (
+            RevenueRollup(
+                user_id=row["user_id"],
+                organization_id=row["organization_id"],
+                day=row["date_issued"],
+                currency=row["currency"],
+                status=row["status"],
+                invoiced=row["invoiced"],
+                paid=row["invoiced"] if row["status"] == "paid" else Decimal(0),
+                outstanding=row["invoiced"] if row["status"] == "pending" else Decimal(0),
+                overdue=row["overdue"],
+                invoice_count=row["invoice_count"],
+            )
+            for row in rows.iterator(chunk_size=BATCH_SIZE)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0075_report_day_buckets"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RevenueRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("currency", models.CharField(max_length=3)),
+                ("status", models.CharField(max_length=10)),
+                ("invoiced", models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ("paid", models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ("outstanding", models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ("overdue", models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ("invoice_count", models.PositiveIntegerField(default=0)),
+                (
+                    "organization",
+                    models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to="backend.organization"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            options={
+                "abstract": False,
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(("organization__isnull", False), ("user__isnull", True)),
+                            models.Q(("organization__isnull", True), ("user__isnull", False)),
+                            _connector="OR",
+                        ),
+                        name="backend_revenuerollup_check_user_or_organization",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("user__isnull", False)),
+                        fields=("user", "day", "currency", "status"),
+                        name="revenue_rollup_user_unique",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("organization__isnull", False)),
+                        fields=("organization", "day", "currency", "status"),
+                        name="revenue_rollup_org_unique",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_revenue_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0076_revenue_rollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["user", "status", "date_due", "id"], name="invoice_user_status_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["organization", "status", "date_due", "id"], name="invoice_org_status_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["user", "total", "id"], name="invoice_user_total_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(fields=["organization", "total", "id"], name="invoice_org_total_idx"),
+        ),
+    ]
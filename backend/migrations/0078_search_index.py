@@ -0,0 +1,180 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:42
+
+from datetime import date
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+SQLITE_FTS = [
+    # external content table: the text lives in backend_searchentry, FTS5 only stores the index
+    """CREATE VIRTUAL TABLE IF NOT EXISTS backend_searchentry_fts USING fts5(
+        title, body, content='backend_searchentry', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS backend_searchentry_fts_insert AFTER INSERT ON backend_searchentry BEGIN
+        INSERT INTO backend_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS backend_searchentry_fts_delete AFTER DELETE ON backend_searchentry BEGIN
+        INSERT INTO backend_searchentry_fts(backend_searchentry_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS backend_searchentry_fts_update AFTER UPDATE ON backend_searchentry BEGIN
+        INSERT INTO backend_searchentry_fts(backend_searchentry_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO backend_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+]
+
+# the expressions must match the ones queried in backend.core.service.search.query
+POSTGRES_FTS = [
+    """CREATE INDEX IF NOT EXISTS search_entry_document_idx ON backend_searchentry USING gin (
+        (setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B'))
+    )""",
+    "CREATE INDEX IF NOT EXISTS search_entry_title_idx ON backend_searchentry USING gin (to_tsvector('simple', title))",
+]
+
+
+def create_full_text_index(apps, schema_editor):
+    statements = {"sqlite": SQLITE_FTS, "postgresql": POSTGRES_FTS}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_full_text_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS backend_searchentry_fts_{trigger}")
+        schema_editor.execute("DROP TABLE IF EXISTS backend_searchentry_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS search_entry_document_idx")
+        schema_editor.execute("DROP INDEX IF EXISTS search_entry_title_idx")
+
+
+BACKFILL_BATCH_SIZE = 500
+
+
+# frozen copies of the document builders in backend.core.service.search.documents, historical models don't have
+# their methods and later changes to the live builders mustn't change what this migration does
+
+
+def _join(*values):
+    return " ".join(str(value) for value in values if value not in (None, ""))
+
+
+def _dates(*values):
+    dates = [date.fromisoformat(value) if isinstance(value, str) else value for value in values if value]
+    return _join(*(f"{value.isoformat()} {value:%d/%m/%Y} {value.day}/{value.month}/{value.year}" for value in dates))
+
+
+def _invoice_document(invoice):
+    client = invoice.client_to
+    client_name = (client.name if client else None) or invoice.client_name or "No Client"
+    return client_name, _join(
+        f"Invoice {invoice.id}",
+        invoice.reference,
+        invoice.client_email,
+        invoice.client_company,
+        client and client.email,
+        client and client.company,
+        invoice.status,
+        _dates(invoice.date_issued, invoice.date_due),
+    )
+
+
+def _client_document(client):
+    return client.name, _join(f"Client {client.id}", client.email, client.company, client.phone_number, client.city, client.country)
+
+
+def _receipt_document(receipt):
+    return receipt.name, _join(f"Receipt {receipt.id}", receipt.merchant_store, receipt.purchase_category, _dates(receipt.date))
+
+
+def _product_document(product):
+    return product.name, _join(product.description, product.rate)
+
+
+def backfill_search_index(apps, schema_editor):
+    """
+    Indexes the rows that already exist, so searches (which only go through the index) keep finding them.
+    """
+    SearchEntry = apps.get_model("backend", "SearchEntry")
+    kinds = {
+        "invoice": (apps.get_model("backend", "Invoice")._default_manager.select_related("client_to"), _invoice_document),
+        "client": (apps.get_model("backend", "Client")._default_manager.filter(active=True), _client_document),
+        "receipt": (apps.get_model("backend", "Receipt")._default_manager.all(), _receipt_document),
+        "product": (apps.get_model("backend", "InvoiceProduct")._default_manager.all(), _product_document),
+    }
+
+    for kind_name, (queryset, build) in kinds.items():
+        entries = []
+        for obj in queryset.order_by("pk").iterator(chunk_size=BACKFILL_BATCH_SIZE):
+            title, body = build(obj)
+            entries.append(
+                SearchEntry(
+                    kind=kind_name,
+                    object_id=obj.pk,
+                    user_id=obj.user_id,
+                    organization_id=obj.organization_id,
+                    title=title[:200],
+                    body=body,
+                )
+            )
+            if len(entries) == BACKFILL_BATCH_SIZE:
+                SearchEntry._default_manager.bulk_create(entries)
+                entries = []
+        SearchEntry._default_manager.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0077_invoice_dashboard_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("invoice", "Invoice"), ("client", "Client"), ("receipt", "Receipt"), ("product", "Product")],
+                        max_length=10,
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("title", models.CharField(max_length=200)),
+                ("body", models.TextField(blank=True, default="")),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "organization",
+                    models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to="backend.organization"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            options={
+                "abstract": False,
+                "indexes": [
+                    models.Index(fields=["user", "kind"], name="search_entry_user_kind_idx"),
+                    models.Index(fields=["organization", "kind"], name="search_entry_org_kind_idx"),
+                ],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(("organization__isnull", False), ("user__isnull", True)),
+                            models.Q(("organization__isnull", True), ("user__isnull", False)),
+                            _connector="OR",
+                        ),
+                        name="backend_searchentry_check_user_or_organization",
+                    ),
+                    models.UniqueConstraint(fields=("kind", "object_id"), name="search_entry_object_unique"),
+                ],
+            },
+        ),
+        migrations.RunPython(create_full_text_index, drop_full_text_index),
+        # after the full-text index, so its triggers index the backfilled entries
+        migrations.RunPython(backfill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:51
+
+import backend.core.models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0078_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InvoicePDF",
+            fields=[
+                (
+                    "invoice",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="cached_pdf",
+                        serialize=False,
+                        to="backend.invoice",
+                    ),
+                ),
+                ("render_hash", models.CharField(max_length=64)),
+                ("file", models.FileField(storage=backend.core.models._private_storage, upload_to="invoice_pdfs")),
+                ("size", models.PositiveIntegerField(default=0)),
+                ("rendered_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("last_accessed", models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Invoice PDF",
+                "verbose_name_plural": "Invoice PDFs",
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:13
+
+from calendar import monthrange
+from datetime import date, timedelta
+
+from django.db import migrations, models
+from django.db.models import Max
+
+BATCH_SIZE = 500
+
+
+def _add_months(day, months):
+    year, month = divmod(day.month - 1 + months, 12)
+    year, month = day.year + year, month + 1
+    return date(year, month, min(day.day, monthrange(year, month)[1]))
+
+
+def _issue_date_after(frequency, last_issued, periods):
+    match frequency:
+        case "weekly":
+            return last_issued + timedelta(days=7 * periods)
+        case "monthly":
+            return _add_months(last_issued, periods)
+        case "yearly":
+            return _add_months(last_issued, 12 * periods)
+        case _:
+            return None
+
+
+def _scheduled_issue_date(profile, last_issued, today):
+    # frozen copy of InvoiceRecurringProfile.scheduled_issue_date, historical models don't have its methods
+    if not last_issued:
+        issue_date = max(profile.date_issued or today, today)
+    else:
+        periods = 1
+        while (issue_date := _issue_date_after(profile.frequency, last_issued, periods) or today) < today:
+            periods += 1
+    return None if profile.end_date and issue_date > profile.end_date else issue_date
+
+
+def backfill_next_issue_dates(apps, schema_editor):
+    InvoiceRecurringProfile = apps.get_model("backend", "InvoiceRecurringProfile")
+    today = date.today()
+    last_id = 0
+
+    while True:
+        batch = list(
+            InvoiceRecurringProfile._default_manager.filter(pk__gt=last_id)
+            .annotate(last_issued=Max("generated_invoices__date_issued"))
+            .order_by("pk")[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+
+        for profile in batch:
+            profile.next_issue_date = _scheduled_issue_date(profile, profile.last_issued, today)
+
+        InvoiceRecurringProfile._default_manager.bulk_update(batch, ["next_issue_date"])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0079_invoice_pdf_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoicerecurringprofile",
+            name="next_issue_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="invoicerecurringprofile",
+            index=models.Index(fields=["status", "next_issue_date"], name="recurring_next_issue_idx"),
+        ),
+        migrations.RunPython(backfill_next_issue_dates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0080_recurring_next_issue_date"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecurringInvoiceGeneration",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("period", models.DateField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "invoice",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="recurring_generation",
+                        to="backend.invoice",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="generations", to="backend.invoicerecurringprofile"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Recurring Invoice Generation",
+                "verbose_name_plural": "Recurring Invoice Generations",
+                "constraints": [models.UniqueConstraint(fields=("profile", "period"), name="recurring_generation_period_unique")],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0081_recurring_generation_ledger"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="reportdaybucket",
+            name="report_bucket_user_date_unique",
+        ),
+        migrations.RemoveConstraint(
+            model_name="reportdaybucket",
+            name="report_bucket_org_date_unique",
+        ),
+        migrations.AddConstraint(
+            model_name="reportdaybucket",
+            constraint=models.UniqueConstraint(fields=("user", "date"), name="report_bucket_user_date_unique"),
+        ),
+        migrations.AddConstraint(
+            model_name="reportdaybucket",
+            constraint=models.UniqueConstraint(fields=("organization", "date"), name="report_bucket_org_date_unique"),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("backend", "0082_report_bucket_upsert_constraints"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="revenuerollup",
+            name="revenue_rollup_user_unique",
+        ),
+        migrations.RemoveConstraint(
+            model_name="revenuerollup",
+            name="revenue_rollup_org_unique",
+        ),
+        migrations.AddConstraint(
+            model_name="revenuerollup",
+            constraint=models.UniqueConstraint(fields=("user", "day", "currency", "status"), name="revenue_rollup_user_unique"),
+        ),
+        migrations.AddConstraint(
+            model_name="revenuerollup",
+            constraint=models.UniqueConstraint(fields=("organization", "day", "currency", "status"), name="revenue_rollup_org_unique"),
+        ),
+    ]
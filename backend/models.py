@@ -18,20 +18,26 @@ from backend.core.models import (
     QuotaIncreaseRequest,
     EmailSendStatus,
     FileStorageFile,
+    SearchEntry,
     MultiFileUpload,
 )
 
 from backend.finance.models import (
     Invoice,
     InvoiceURL,
+    InvoicePDF,
+    InvoiceExport,
     InvoiceItem,
     InvoiceReminder,
     InvoiceRecurringProfile,
+    RecurringInvoiceGeneration,
     InvoiceProduct,
     Receipt,
     ReceiptDownloadToken,
     MonthlyReport,
     MonthlyReportRow,
+    ReportDayBucket,
+    RevenueRollup,
 )
 
 from backend.clients.models import Client, DefaultValues
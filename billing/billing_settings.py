@@ -12,6 +12,11 @@ STRIPE_LIVE_MODE = True if STRIPE_LIVE_SECRET_KEY else False
 
 stripe.api_key = STRIPE_MAIN_API_KEY
 
+# Entitlements are served from cache and refreshed from Stripe in the background once older than ENTITLEMENTS_FRESH_FOR
+# seconds; the entitlement webhook updates them immediately.
+ENTITLEMENTS_FRESH_FOR = int(get_var("ENTITLEMENTS_FRESH_FOR", default=60 * 15))
+ENTITLEMENTS_CACHE_TIMEOUT = int(get_var("ENTITLEMENTS_CACHE_TIMEOUT", default=60 * 60 * 24))
+
 NO_SUBSCRIPTION_PLAN_DENY_VIEW_NAMES: set[str] = {
     "clients:create",
     "file_storage:upload:start_batch",
@@ -1,11 +1,10 @@
 from django.contrib import messages
 from django.shortcuts import redirect, render
-from django.urls import resolve
+from django.utils.functional import SimpleLazyObject
 
 from backend.core.types.requests import WebRequest
 from billing.billing_settings import NO_SUBSCRIPTION_PLAN_DENY_VIEW_NAMES
-from billing.models import UserSubscription
-
+from billing.service.subscription_state import get_active_subscription
 
 # middleware to check if user is subscribed to a plan yet
 
@@ -15,24 +14,26 @@ class CheckUserSubScriptionMiddleware:
         self.get_response = get_response
 
     def __call__(self, request: WebRequest):
+        return self.get_response(request)
+
+    def process_view(self, request: WebRequest, view_func, view_args, view_kwargs):
+        # runs after URL resolution, so the view name comes from the resolver match django already computed
         if not request.user.is_authenticated:
-            return self.get_response(request)
+            return None
 
         if request.team:
             # todo: handle organization billing
-            return self.get_response(request)
+            return None
 
-        subscription: UserSubscription | None = (
-            UserSubscription.filter_by_owner(request.actor).filter(end_date__isnull=True).prefetch_related("subscription_plan").first()
-        )
-        request.users_subscription = subscription
+        actor = request.actor
 
-        resolver_match = resolve(request.path_info)
+        if request.resolver_match.view_name not in NO_SUBSCRIPTION_PLAN_DENY_VIEW_NAMES:
+            # only loaded (from the subscription state cache) if something actually reads it
+            request.users_subscription = SimpleLazyObject(lambda: get_active_subscription(actor))
+            return None
 
-        view_name = resolver_match.view_name
-
-        if view_name not in NO_SUBSCRIPTION_PLAN_DENY_VIEW_NAMES:
-            return self.get_response(request)
+        subscription = get_active_subscription(actor)
+        request.users_subscription = subscription
 
         if not subscription:
             print("[BILLING] [MIDDLEWARE] User doesn't have an active subscription.")
@@ -47,4 +48,4 @@ class CheckUserSubScriptionMiddleware:
             if request.htmx:
                 return render(request, "base/toast.html", {"autohide": False})
             return redirect("billing:dashboard")
-        return self.get_response(request)
+        return None
@@ -1,15 +1,52 @@
+import logging
+import threading
+import time
+
 import stripe.entitlements
 from django.contrib import messages
 from django.core.cache import cache
 from django.core.cache.backends.redis import RedisCacheClient
+from django.db import connection
 from django.shortcuts import redirect
 
 from backend.models import User, Organization
+from billing.billing_settings import ENTITLEMENTS_FRESH_FOR, ENTITLEMENTS_CACHE_TIMEOUT
 from billing.models import StripeWebhookEvent
 from billing.service.get_user import get_actor_from_stripe_customer
 
 cache: RedisCacheClient = cache
 
+logger = logging.getLogger(__name__)
+
+# only one worker refreshes a given actor from Stripe at a time
+REFRESH_LOCK_TIMEOUT = 60
+
+
+def _cache_key(actor: User | Organization) -> str:
+    cache_actor_type = "user" if isinstance(actor, User) else "org"
+    return f"myfinances:entitlements:{cache_actor_type}:{actor.id}:state"
+
+
+def _store_entitlements(actor: User | Organization, entitlement_names: list[str], fetched_at: float | None = None) -> None:
+    # fetched_at=0 marks the entry as stale straight away, so it is served but also refreshed in the background
+    cache.set(
+        _cache_key(actor),
+        {"entitlements": entitlement_names, "fetched_at": time.time() if fetched_at is None else fetched_at},
+        timeout=ENTITLEMENTS_CACHE_TIMEOUT,
+    )
+
+
+def set_entitlements(actor: User | Organization, entitlement_names: list[str]) -> list[str]:
+    """
+    Persists and caches a fresh list of entitlements (empty lists included, so they're never treated as a miss)
+    """
+    actor.entitlements = entitlement_names
+    actor.save(update_fields=["entitlements"])
+
+    _store_entitlements(actor, entitlement_names)
+
+    return entitlement_names
+
 
 def entitlements_updated_via_stripe_webhook(webhook_event: StripeWebhookEvent) -> None:
     data: stripe.entitlements.ActiveEntitlementSummary = webhook_event.data["object"]
@@ -19,6 +56,13 @@ def entitlements_updated_via_stripe_webhook(webhook_event: StripeWebhookEvent) -
         print("No actor found for customer.")
         return
 
+    summary = data.get("entitlements")
+
+    if summary is not None and not summary.get("has_more"):
+        # the summary already holds the active entitlements, no need to ask Stripe again
+        set_entitlements(actor, [entitlement["lookup_key"] for entitlement in summary["data"]])
+        return
+
     # Re-fetch and update the entitlements for the actor (User or Organization)
     update_user_entitlements(actor)
 
@@ -29,24 +73,58 @@ def update_user_entitlements(actor: User | Organization) -> list[str]:
 
     entitlements = stripe.entitlements.ActiveEntitlement.list(customer=actor.stripe_customer_id, limit=25).data
 
-    entitlement_names = [entitlement.lookup_key for entitlement in entitlements]
+    return set_entitlements(actor, [entitlement.lookup_key for entitlement in entitlements])
 
-    actor.entitlements = entitlement_names
-    actor.save(update_fields=["entitlements"])
 
-    cache_actor_type = "user" if isinstance(actor, User) else "org"
+def _refresh_entitlements(model: type[User | Organization], actor_id: int, lock_key: str) -> None:
+    try:
+        if actor := model.objects.filter(id=actor_id).first():
+            update_user_entitlements(actor)
+    except Exception:
+        logger.exception(f"Failed to refresh entitlements for {model.__name__} {actor_id}")
+    finally:
+        cache.delete(lock_key)
+        # the thread's own connection, Django only closes connections at the end of a request
+        connection.close()
 
-    cache.set(f"myfinances:entitlements:{cache_actor_type}:{actor.id}", entitlement_names, timeout=3600)
 
-    return entitlement_names
+def refresh_entitlements_in_background(actor: User | Organization) -> None:
+    lock_key = f"{_cache_key(actor)}:refreshing"
+
+    if not cache.add(lock_key, True, timeout=REFRESH_LOCK_TIMEOUT):
+        return
+
+    # _meta.model rather than type(): request.actor may be a SimpleLazyObject wrapping the user
+    threading.Thread(target=_refresh_entitlements, args=(actor._meta.model, actor.id, lock_key), daemon=True).start()
 
 
 def get_entitlements(actor: User | Organization, avoid_cache=False) -> list[str]:
-    cache_key = "user" if isinstance(actor, User) else "org"
+    """
+    Stale-while-revalidate: serves the cached entitlements (or the ones persisted on the actor) straight away and
+    refreshes from Stripe in the background once they're older than ENTITLEMENTS_FRESH_FOR. Only avoid_cache=True
+    (an explicit refetch) waits on Stripe.
+    """
+    if avoid_cache:
+        return update_user_entitlements(actor)
+
+    cached = cache.get(_cache_key(actor))
+
+    if cached is None:
+        entitlement_names = list(actor.entitlements or [])
+
+        if not actor.stripe_customer_id:
+            # nothing to fetch from Stripe, the persisted (usually empty) list is authoritative
+            _store_entitlements(actor, entitlement_names)
+            return entitlement_names
+
+        _store_entitlements(actor, entitlement_names, fetched_at=0)
+        refresh_entitlements_in_background(actor)
+        return entitlement_names
+
+    if time.time() - cached["fetched_at"] > ENTITLEMENTS_FRESH_FOR and actor.stripe_customer_id:
+        refresh_entitlements_in_background(actor)
 
-    if not avoid_cache and (cached_entitlements := cache.get(f"myfinances:entitlements:{cache_key}:{actor.id}", default=[])):
-        return cached_entitlements
-    return update_user_entitlements(actor)
+    return cached["entitlements"]
 
 
 def has_entitlement(actor: User | Organization, entitlement: str) -> bool:
@@ -54,4 +132,5 @@ def has_entitlement(actor: User | Organization, entitlement: str) -> bool:
 
 
 def has_entitlements(actor: User | Organization, entitlements: list[str]) -> bool:
-    return all(entitlement in entitlements for entitlement in get_entitlements(actor))
+    actor_entitlements = get_entitlements(actor)
+    return all(entitlement in actor_entitlements for entitlement in entitlements)
@@ -30,10 +30,9 @@ def subscription_ended(webhook_event: StripeWebhookEvent) -> None:
             return
 
     if not actor_subscription_plan:
-        actor_subscriptions = UserSubscription.filter_by_owner(owner=actor).all()
-        if not actor_subscriptions:
-            return
-
         # Find a subscription plan with the same Stripe subscription ID
-        if plan_with_same_id := actor_subscriptions.filter(stripe_subscription_id=event_data.id).first():
-            plan_with_same_id.end_now()
+        actor_subscription_plan = UserSubscription.filter_by_owner(owner=actor).filter(stripe_subscription_id=event_data.id).first()
+
+    # ending it saves the subscription, whose signal invalidates the actor's cached subscription state
+    if actor_subscription_plan and not actor_subscription_plan.has_ended:
+        actor_subscription_plan.end_now()
@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCacheClient
+
+from backend.models import User, Organization
+from billing.models import UserSubscription
+
+cache: RedisCacheClient = cache
+
+SUBSCRIPTION_STATE_TIMEOUT = 60 * 60
+
+# cached when the actor has no active subscription, so unsubscribed actors don't query every time either
+_NO_SUBSCRIPTION = "-"
+
+
+def _cache_key(actor: User | Organization) -> str:
+    cache_actor_type = "user" if isinstance(actor, User) else "org"
+    return f"myfinances:billing:subscription:{cache_actor_type}:{actor.id}"
+
+
+def get_active_subscription(actor: User | Organization) -> UserSubscription | None:
+    """
+    The actor's ongoing (not ended) subscription, cached until the subscription signals see one of its subscriptions change
+    """
+    cached = cache.get(_cache_key(actor))
+
+    if cached is not None:
+        return None if cached == _NO_SUBSCRIPTION else cached
+
+    subscription: UserSubscription | None = (
+        UserSubscription.filter_by_owner(actor).filter(end_date__isnull=True).select_related("subscription_plan").first()
+    )
+
+    cache.set(_cache_key(actor), subscription or _NO_SUBSCRIPTION, timeout=SUBSCRIPTION_STATE_TIMEOUT)
+    return subscription
+
+
+def invalidate_subscription_state(actor: User | Organization | None) -> None:
+    if actor is not None:
+        cache.delete(_cache_key(actor))
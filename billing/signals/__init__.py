@@ -1 +1 @@
-from . import migrations, usage, stripe
+from . import migrations, usage, stripe, subscriptions
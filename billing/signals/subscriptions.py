@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from billing.models import UserSubscription
+from billing.service.subscription_state import invalidate_subscription_state
+
+
+@receiver(post_save, sender=UserSubscription)
+@receiver(post_delete, sender=UserSubscription)
+def subscription_changed(sender, instance: UserSubscription, **kwargs):
+    """
+    Every created, ended, changed or deleted subscription drops its owner's cached subscription state,
+    once committed so a request racing the transaction can't cache the old state again
+    """
+    owner = instance.owner
+    transaction.on_commit(lambda: invalidate_subscription_state(owner))
@@ -0,0 +1,6 @@
+from unittest import SkipTest
+
+from django.apps import apps
+
+if not apps.is_installed("billing"):
+    raise SkipTest("the billing app is only installed with BILLING_ENABLED=true")
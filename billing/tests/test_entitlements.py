@@ -0,0 +1,131 @@
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils.functional import SimpleLazyObject
+
+from backend.models import User
+from billing.service import entitlements
+from billing.service.entitlements import (
+    _cache_key,
+    _store_entitlements,
+    entitlements_updated_via_stripe_webhook,
+    get_entitlements,
+    refresh_entitlements_in_background,
+)
+
+
+def stripe_entitlements(*lookup_keys: str) -> SimpleNamespace:
+    return SimpleNamespace(data=[SimpleNamespace(lookup_key=lookup_key) for lookup_key in lookup_keys])
+
+
+class InlineThread:
+    """Runs the refresh as soon as it's started, so tests see its result"""
+
+    def __init__(self, target, args=(), daemon=None):
+        self.target, self.args = target, args
+
+    def start(self):
+        self.target(*self.args)
+
+
+@mock.patch.object(entitlements, "connection")
+@mock.patch.object(entitlements.threading, "Thread", InlineThread)
+@mock.patch.object(entitlements.stripe.entitlements.ActiveEntitlement, "list")
+class EntitlementsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="owner", email="owner@example.com", password="password")
+        self.user.stripe_customer_id = "cus_123"
+        self.user.entitlements = ["invoices"]
+        self.user.save()
+
+    def test_stale_entitlements_are_served_then_refreshed(self, stripe_list, connection):
+        _store_entitlements(self.user, ["invoices"], fetched_at=time.time() - entitlements.ENTITLEMENTS_FRESH_FOR - 1)
+        stripe_list.return_value = stripe_entitlements("invoices", "receipts")
+
+        self.assertEqual(get_entitlements(self.user), ["invoices"])
+
+        stripe_list.assert_called_once_with(customer="cus_123", limit=25)
+        self.assertEqual(get_entitlements(self.user), ["invoices", "receipts"])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.entitlements, ["invoices", "receipts"])
+        # the refresh thread closes its own database connection
+        connection.close.assert_called_once_with()
+
+    def test_lazy_actors_are_refreshed(self, stripe_list, connection):
+        # request.actor of a personal account
+        actor = SimpleLazyObject(lambda: User.objects.get(pk=self.user.pk))
+        _store_entitlements(self.user, ["invoices"], fetched_at=0)
+        stripe_list.return_value = stripe_entitlements("invoices", "receipts")
+
+        get_entitlements(actor)
+
+        stripe_list.assert_called_once_with(customer="cus_123", limit=25)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.entitlements, ["invoices", "receipts"])
+
+    def test_fresh_entitlements_never_call_stripe(self, stripe_list, connection):
+        _store_entitlements(self.user, ["invoices"])
+
+        self.assertEqual(get_entitlements(self.user), ["invoices"])
+        stripe_list.assert_not_called()
+
+    def test_empty_entitlements_are_cached(self, stripe_list, connection):
+        stripe_list.return_value = stripe_entitlements()
+
+        get_entitlements(self.user)
+        self.assertEqual(get_entitlements(self.user), [])
+        self.assertEqual(get_entitlements(self.user), [])
+
+        self.assertEqual(stripe_list.call_count, 1)
+
+    def test_actors_without_a_stripe_customer_are_cached_without_stripe(self, stripe_list, connection):
+        self.user.stripe_customer_id = None
+
+        self.assertEqual(get_entitlements(self.user), ["invoices"])
+        self.assertEqual(cache.get(_cache_key(self.user))["entitlements"], ["invoices"])
+        stripe_list.assert_not_called()
+
+    def test_only_one_refresh_runs_at_a_time(self, stripe_list, connection):
+        stripe_list.return_value = stripe_entitlements()
+        lock_key = f"{_cache_key(self.user)}:refreshing"
+        cache.add(lock_key, True)
+
+        refresh_entitlements_in_background(self.user)
+        stripe_list.assert_not_called()
+
+        cache.delete(lock_key)
+        refresh_entitlements_in_background(self.user)
+        stripe_list.assert_called_once()
+        self.assertIsNone(cache.get(lock_key))
+
+    def test_failed_refreshes_release_the_lock(self, stripe_list, connection):
+        stripe_list.side_effect = RuntimeError("stripe is down")
+
+        refresh_entitlements_in_background(self.user)
+
+        self.assertIsNone(cache.get(f"{_cache_key(self.user)}:refreshing"))
+        connection.close.assert_called_once_with()
+
+    def test_webhook_summary_replaces_the_cached_entitlements(self, stripe_list, connection):
+        _store_entitlements(self.user, ["invoices"])
+        event = SimpleNamespace(
+            data={"object": {"customer": "cus_123", "entitlements": {"has_more": False, "data": [{"lookup_key": "receipts"}]}}}
+        )
+
+        entitlements_updated_via_stripe_webhook(event)
+
+        self.assertEqual(get_entitlements(self.user), ["receipts"])
+        stripe_list.assert_not_called()
+
+    def test_webhook_with_a_partial_summary_refetches(self, stripe_list, connection):
+        _store_entitlements(self.user, ["invoices"])
+        stripe_list.return_value = stripe_entitlements("invoices", "receipts", "teams")
+        event = SimpleNamespace(data={"object": {"customer": "cus_123", "entitlements": {"has_more": True, "data": []}}})
+
+        entitlements_updated_via_stripe_webhook(event)
+
+        self.assertEqual(get_entitlements(self.user), ["invoices", "receipts", "teams"])
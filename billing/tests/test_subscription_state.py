@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from billing.models import SubscriptionPlan, UserSubscription
+from billing.service.subscription_ended import subscription_ended
+from billing.service.subscription_state import get_active_subscription
+from tests.handler import ViewTestCase
+
+
+class SubscriptionStateTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.plan = baker.make(SubscriptionPlan)
+
+    def subscribe(self, **kwargs) -> UserSubscription:
+        with self.captureOnCommitCallbacks(execute=True):
+            return UserSubscription.objects.create(owner=self.log_in_user, subscription_plan=self.plan, **kwargs)
+
+    def subscription_queries(self, queries: CaptureQueriesContext) -> list[dict]:
+        # silk (in DEBUG) also EXPLAINs queries once a request has gone through its middleware
+        return [query for query in queries if UserSubscription._meta.db_table in query["sql"] and not query["sql"].startswith("EXPLAIN")]
+
+    def test_gated_routes_redirect_without_a_subscription(self):
+        self.login_user()
+
+        response = self.client.get(reverse("clients:create"))
+
+        self.assertRedirects(response, reverse("billing:dashboard"), fetch_redirect_response=False)
+
+    def test_gated_routes_show_a_toast_to_htmx_requests(self):
+        self.login_user()
+
+        response = self.client.get(reverse("clients:create"), **self.htmx_headers)
+
+        self.assertTemplateUsed(response, "base/toast.html")
+
+    def test_gated_routes_open_with_a_subscription(self):
+        self.subscribe()
+        self.login_user()
+
+        response = self.client.get(reverse("clients:create"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.users_subscription.subscription_plan, self.plan)
+
+    def test_ungated_routes_never_load_the_subscription(self):
+        self.login_user()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("dashboard"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.subscription_queries(queries), [])
+
+    def test_subscription_state_is_cached_until_a_subscription_changes(self):
+        self.assertIsNone(get_active_subscription(self.log_in_user))
+
+        subscription = self.subscribe()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(get_active_subscription(self.log_in_user), subscription)
+            self.assertEqual(get_active_subscription(self.log_in_user), subscription)
+        self.assertEqual(len(self.subscription_queries(queries)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            subscription.end_now()
+        self.assertIsNone(get_active_subscription(self.log_in_user))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            subscription.delete()
+        self.assertIsNone(get_active_subscription(self.log_in_user))
+
+    def test_subscription_ended_webhook_ends_the_subscription(self):
+        self.log_in_user.stripe_customer_id = "cus_123"
+        self.log_in_user.save()
+        self.subscribe(stripe_subscription_id="sub_123")
+        self.assertIsNotNone(get_active_subscription(self.log_in_user))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            subscription_ended(SimpleNamespace(data=SimpleNamespace(object=SimpleNamespace(id="sub_123", customer="cus_123"))))
+
+        self.assertIsNone(get_active_subscription(self.log_in_user))
@@ -86,6 +86,23 @@ REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_RATES": {"user": "1800/hour", "anon": "250/day"},
 }
 
+# page sizes for the keyset paginated public API list endpoints
+PUBLIC_API_DEFAULT_PAGE_SIZE = int(get_var("PUBLIC_API_DEFAULT_PAGE_SIZE", default=50))
+PUBLIC_API_MAX_PAGE_SIZE = int(get_var("PUBLIC_API_MAX_PAGE_SIZE", default=200))
+# rows loaded per scroll on the invoices dashboard table
+INVOICE_TABLE_PAGE_SIZE = int(get_var("INVOICE_TABLE_PAGE_SIZE", default=25))
+# total size of the rendered invoice PDFs kept in private storage before the least recently used are evicted
+INVOICE_PDF_CACHE_MAX_BYTES = int(get_var("INVOICE_PDF_CACHE_MAX_BYTES", default=256 * 1024 * 1024))
+# size of the process pool shared by bulk invoice exports (1 renders in the exporting process)
+INVOICE_EXPORT_WORKERS = int(get_var("INVOICE_EXPORT_WORKERS", default=min(4, os.cpu_count() or 1)))
+# how long the public invoice page keeps share links and invoices cached (edits invalidate them straight away)
+PUBLIC_INVOICE_CACHE_TIMEOUT = int(get_var("PUBLIC_INVOICE_CACHE_TIMEOUT", default=60 * 60 * 24))
+# recurring profiles generated per transaction by the batch generator
+RECURRING_GENERATION_BATCH_SIZE = int(get_var("RECURRING_GENERATION_BATCH_SIZE", default=500))
+# concurrent AWS Scheduler updates, and API calls per second, when reconciling every schedule
+SCHEDULE_REFRESH_WORKERS = int(get_var("SCHEDULE_REFRESH_WORKERS", default=8))
+SCHEDULE_REFRESH_RATE = float(get_var("SCHEDULE_REFRESH_RATE", default=20))
+
 SWAGGER_SETTINGS = {
     "USE_SESSION_AUTH": False,
     "DEFAULT_INFO": "backend.core.api.public.swagger_ui.INFO",
@@ -130,13 +147,30 @@ AUTHENTICATION_BACKENDS = [
 ]
 
 SECRET_KEY = get_var("SECRET_KEY", default="secret_key")
+# Keys the HMAC digest used to look up API keys. Changing it invalidates every issued API key.
+API_KEY_LOOKUP_SECRET = get_var("API_KEY_LOOKUP_SECRET", default=SECRET_KEY)
+# Verified API keys are cached in the shared cache for API_KEY_CACHE_TTL seconds and in each worker for
+# API_KEY_CACHE_LOCAL_TTL seconds (0 disables the local layer). Revocations reach every worker through a shared generation key
+API_KEY_CACHE_TTL = int(get_var("API_KEY_CACHE_TTL", default=60))
+API_KEY_CACHE_LOCAL_TTL = int(get_var("API_KEY_CACHE_LOCAL_TTL", default=5))
+API_KEY_CACHE_MAXSIZE = int(get_var("API_KEY_CACHE_MAXSIZE", default=1024))
+# API key last_used timestamps are buffered and written in bulk, so they're accurate to within this many seconds
+API_KEY_LAST_USED_FLUSH_INTERVAL = int(get_var("API_KEY_LAST_USED_FLUSH_INTERVAL", default=60))
 
 LOGIN_URL = "/auth/login/"
 LOGIN_REDIRECT_URL = "/dashboard"
 
 ROOT_URLCONF = "backend.urls"
 SESSION_COOKIE_AGE = 604800
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# "db" (default), "cached_db" (db writes, reads served from the cache) or "cache" (cache only, needs a persistent shared cache
+# such as REDIS_CACHE_HOST)
+SESSION_ENGINE = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "cache": "django.contrib.sessions.backends.cache",
+}.get(get_var("SESSION_STORAGE", default="db").lower(), "django.contrib.sessions.backends.db")
+# where LastVisitedMiddleware keeps the previous page: "cookie" (signed cookie, default), "cache" or "session"
+NAVIGATION_HISTORY_STORAGE = get_var("NAVIGATION_HISTORY_STORAGE", default="cookie").lower()
 STATIC_URL = "/static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
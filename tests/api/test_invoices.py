@@ -1,10 +1,13 @@
 import random
+import re
+from datetime import date, timedelta
+from decimal import Decimal
 
 from django.urls import reverse, resolve
 from model_bakery import baker
 
 from backend.finance.models import Invoice
-from tests.handler import ViewTestCase, assert_url_matches_view
+from tests.handler import ViewTestCase, assert_url_matches_view, make_invoice
 
 
 class InvoicesAPIFetch(ViewTestCase):
@@ -77,6 +80,81 @@ class InvoicesAPIFetch(ViewTestCase):
         for invoice in invoices:
             self.assertIn(invoice, response.context.get("invoices"))
 
+    def make_priced_invoice(self, price, **kwargs):
+        return make_invoice(self.log_in_user, price, **kwargs)
+
+    def test_invoices_are_paginated_with_infinite_scroll(self):
+        self.login_user()
+        invoices = baker.make("backend.Invoice", _quantity=5, user=self.log_in_user)
+
+        with self.settings(INVOICE_TABLE_PAGE_SIZE=3):
+            first = self.client.get(reverse(self.url_name), **self.htmx_headers)
+            cursor = first.context["next_cursor"]
+            second = self.client.get(reverse(self.url_name), {"cursor": cursor}, **self.htmx_headers)
+
+        self.assertTemplateUsed(first, "pages/invoices/dashboard/_fetch_body.html")
+        self.assertTemplateUsed(second, "pages/invoices/dashboard/_fetch_rows.html")
+        self.assertTemplateNotUsed(second, "pages/invoices/dashboard/_fetch_body.html")
+        self.assertIsNone(second.context["next_cursor"])
+
+        seen = [invoice.id for invoice in first.context["invoices"] + second.context["invoices"]]
+        self.assertEqual(seen, sorted(invoice.id for invoice in invoices))
+
+    def test_infinite_scroll_sentinel_only_replaces_itself(self):
+        self.login_user()
+        baker.make("backend.Invoice", _quantity=7, user=self.log_in_user)
+
+        with self.settings(INVOICE_TABLE_PAGE_SIZE=3):
+            first = self.client.get(reverse(self.url_name), **self.htmx_headers)
+            second = self.client.get(reverse(self.url_name), {"cursor": first.context["next_cursor"]}, **self.htmx_headers)
+
+        for page in (first, second):
+            sentinel = re.search(r'<tr hx-get="[^"]*"[^>]*>', page.content.decode()).group()
+            self.assertIn('hx-trigger="revealed"', sentinel)
+            # not the inherited #table_body, which would swap out the rows already loaded
+            self.assertIn('hx-target="this"', sentinel)
+            self.assertIn('hx-swap="outerHTML"', sentinel)
+
+        self.assertContains(first, 'id="table_body"')
+        self.assertNotContains(second, 'id="table_body"')
+
+    def test_sort_by_total_descending(self):
+        self.login_user()
+        for price in ["20", "300", "5"]:
+            self.make_priced_invoice(price)
+
+        response = self.client.get(reverse(self.url_name), {"sort": "amount", "sort_direction": "desc"}, **self.htmx_headers)
+
+        self.assertEqual([invoice.total for invoice in response.context["invoices"]], [Decimal("300"), Decimal("20"), Decimal("5")])
+
+    def test_amount_filter_uses_invoice_total(self):
+        self.login_user()
+        cheap, mid, expensive = self.make_priced_invoice("10"), self.make_priced_invoice("150"), self.make_priced_invoice("900")
+
+        def ids(amount):
+            response = self.client.get(reverse(self.url_name), {"amount": amount}, **self.htmx_headers)
+            return {invoice.id for invoice in response.context["invoices"]}
+
+        self.assertEqual(ids("150"), {mid.id})
+        self.assertEqual(ids("100+"), {mid.id, expensive.id})
+        self.assertEqual(ids("5-200"), {cheap.id, mid.id})
+
+    def test_overdue_status_filter(self):
+        self.login_user()
+        overdue = baker.make("backend.Invoice", user=self.log_in_user, status="pending", date_due=date.today() - timedelta(days=3))
+        baker.make("backend.Invoice", user=self.log_in_user, status="pending", date_due=date.today() + timedelta(days=3))
+
+        response = self.client.get(reverse(self.url_name), {"status": "overdue"}, **self.htmx_headers)
+
+        self.assertEqual([invoice.id for invoice in response.context["invoices"]], [overdue.id])
+
+    def test_invalid_filters_and_sorts_do_not_swap_the_table(self):
+        self.login_user()
+
+        for params in ({"sort": "client"}, {"amount": "lots"}, {"due_date": "yesterday"}, {"cursor": "nonsense"}):
+            response = self.client.get(reverse(self.url_name), params, **self.htmx_headers)
+            self.assertEqual(response["HX-Reswap"], "none")
+
 
 class InvoicesAPIDelete(ViewTestCase):
     def setUp(self):
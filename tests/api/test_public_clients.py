@@ -0,0 +1,80 @@
+from django.core.cache import cache
+from django.urls import reverse
+from model_bakery import baker
+
+from backend.core.api.public import APIAuthToken
+from backend.core.service.api_keys.cache import clear_local_api_key_cache
+from tests.handler import ViewTestCase
+
+
+class PublicClientsListTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        clear_local_api_key_cache()
+        self.url = reverse("api:public:clients:list")
+
+        token = APIAuthToken(user=self.log_in_user, name="key", scopes=["clients:read"])
+        self.auth_headers = {"HTTP_AUTHORIZATION": f"Bearer {token.generate_key()}"}
+        token.save()
+
+    def get(self, **params):
+        return self.client.get(self.url, params, **self.auth_headers)
+
+    def make_client(self, **kwargs):
+        return baker.make("backend.Client", user=self.log_in_user, **kwargs)
+
+    def test_pages_by_name(self):
+        for name in ["Delta", "alpha", "Charlie", "bravo", "Echo"]:
+            self.make_client(name=name)
+
+        first = self.get(page_size=3, order_by="name").json()["data"]
+        second = self.get(page_size=3, order_by="name", cursor=first["pagination"]["next_cursor"]).json()["data"]
+
+        names = [client["name"] for client in first["clients"] + second["clients"]]
+        self.assertEqual(sorted(names), sorted(["Delta", "alpha", "Charlie", "bravo", "Echo"]))
+        self.assertEqual(len(set(names)), 5)
+        self.assertIsNone(second["pagination"]["next_cursor"])
+
+    def test_order_by_is_honoured(self):
+        clients = [self.make_client() for _ in range(3)]
+
+        ids = [client["id"] for client in self.get(order_by="-id").json()["data"]["clients"]]
+
+        self.assertEqual(ids, sorted((client.id for client in clients), reverse=True))
+
+    def test_search_reads_query_params(self):
+        match = self.make_client(name="Acme Ltd", email="billing@acme.test")
+        self.make_client(name="Globex", email="accounts@globex.test", company="Globex Corp")
+
+        ids = [client["id"] for client in self.get(search="acme").json()["data"]["clients"]]
+        self.assertEqual(ids, [match.id])
+
+    def test_search_matches_company_and_prefix(self):
+        globex = self.make_client(name="Hank", company="Globex Corp")
+        self.make_client(name="Initech", company="Not Globex")
+
+        self.assertEqual(len(self.get(search="globex").json()["data"]["clients"]), 2)
+
+        ids = [client["id"] for client in self.get(search="globex", search_type="prefix").json()["data"]["clients"]]
+        self.assertEqual(ids, [globex.id])
+
+    def test_sparse_fieldsets(self):
+        self.make_client(email="a@example.com")
+
+        clients = self.get(fields="id,email").json()["data"]["clients"]
+
+        self.assertEqual(set(clients[0]), {"id", "email"})
+        self.assertEqual(clients[0]["email"], "a@example.com")
+
+    def test_invalid_parameters_return_400(self):
+        self.assertEqual(self.get(fields="id,password").status_code, 400)
+        self.assertEqual(self.get(order_by="email").status_code, 400)
+        self.assertEqual(self.get(search_type="fuzzy").status_code, 400)
+
+    def test_inactive_and_other_owners_are_excluded(self):
+        self.make_client()
+        self.make_client(active=False)
+        baker.make("backend.Client", organization=self.created_team)
+
+        self.assertEqual(len(self.get().json()["data"]["clients"]), 1)
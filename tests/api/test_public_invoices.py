@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+from model_bakery import baker
+
+from backend.core.api.public import APIAuthToken
+from backend.core.service.api_keys.cache import clear_local_api_key_cache
+from backend.finance.models import Invoice, InvoiceItem
+from tests.handler import ViewTestCase
+
+
+class PublicInvoicesListTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        clear_local_api_key_cache()
+        self.url = reverse("api:public:invoices:list")
+
+        token = APIAuthToken(user=self.log_in_user, name="key", scopes=["invoices:read"])
+        self.auth_headers = {"HTTP_AUTHORIZATION": f"Bearer {token.generate_key()}"}
+        token.save()
+
+    def get(self, **params):
+        return self.client.get(self.url, params, **self.auth_headers)
+
+    def make_invoices(self, count, **kwargs):
+        return baker.make("backend.Invoice", _quantity=count, user=self.log_in_user, **kwargs)
+
+    def test_pages_through_every_invoice_once(self):
+        invoices = self.make_invoices(7)
+        seen, cursor = [], None
+
+        for _ in range(4):
+            response = self.get(page_size=3, **({"cursor": cursor} if cursor else {}))
+            self.assertEqual(response.status_code, 200)
+            data = response.json()["data"]
+            seen.extend(invoice["id"] for invoice in data["invoices"])
+            cursor = data["pagination"]["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(seen, sorted(invoice.id for invoice in invoices))
+        self.assertFalse(data["pagination"]["has_more"])
+
+    def test_descending_date_due_with_ties(self):
+        today = date.today()
+        self.make_invoices(3, date_due=today)
+        self.make_invoices(2, date_due=today + timedelta(days=5))
+
+        first = self.get(page_size=3, ordering="-date_due").json()["data"]
+        second = self.get(page_size=3, ordering="-date_due", cursor=first["pagination"]["next_cursor"]).json()["data"]
+
+        ordered = [(invoice["date_due"], invoice["id"]) for invoice in first["invoices"] + second["invoices"]]
+        self.assertEqual(len(ordered), 5)
+        self.assertEqual(ordered, sorted(ordered, reverse=True))
+
+    def test_date_issued_ordering_includes_unissued_invoices_last(self):
+        self.make_invoices(2, date_issued=None)
+        self.make_invoices(2, date_issued=date.today())
+
+        first = self.get(page_size=3, ordering="date_issued").json()["data"]
+        second = self.get(page_size=3, ordering="date_issued", cursor=first["pagination"]["next_cursor"]).json()["data"]
+
+        issued = [invoice["date_issued"] for invoice in first["invoices"] + second["invoices"]]
+        self.assertEqual(issued[:2], [date.today().isoformat()] * 2)
+        self.assertEqual(issued[2:], [None, None])
+
+    def test_status_filter_includes_overdue(self):
+        today = date.today()
+        overdue = self.make_invoices(1, status="pending", date_due=today - timedelta(days=1))[0]
+        pending = self.make_invoices(1, status="pending", date_due=today + timedelta(days=1))[0]
+        self.make_invoices(1, status="paid", date_due=today)
+
+        ids = [invoice["id"] for invoice in self.get(status="overdue").json()["data"]["invoices"]]
+        self.assertEqual(ids, [overdue.id])
+
+        ids = [invoice["id"] for invoice in self.get(status="pending,overdue").json()["data"]["invoices"]]
+        self.assertEqual(ids, sorted([overdue.id, pending.id]))
+
+    def test_date_client_and_amount_filters(self):
+        client = baker.make("backend.Client", user=self.log_in_user)
+        matching = self.make_invoices(1, client_to=client, date_due=date(2024, 6, 1))[0]
+        matching.items.add(baker.make(InvoiceItem, is_service=False, price=150))
+        cheap = self.make_invoices(1, client_to=client, date_due=date(2024, 6, 2))[0]
+        cheap.items.add(baker.make(InvoiceItem, is_service=True, hours=1, price_per_hour=10))
+        self.make_invoices(1, date_due=date(2024, 6, 1))
+
+        response = self.get(client=client.id, date_due_after="2024-05-01", date_due_before="2024-06-30", amount_min="100")
+
+        self.assertEqual([invoice["id"] for invoice in response.json()["data"]["invoices"]], [matching.id])
+        self.assertEqual(len(response.json()["data"]["invoices"][0]["items"]), 1)
+
+    def test_page_size_is_capped(self):
+        self.make_invoices(3)
+
+        with self.settings(PUBLIC_API_MAX_PAGE_SIZE=2):
+            data = self.get(page_size=1000).json()["data"]
+
+        self.assertEqual(len(data["invoices"]), 2)
+        self.assertEqual(data["pagination"]["page_size"], 2)
+
+    def test_invalid_parameters_return_400(self):
+        self.assertEqual(self.get(ordering="client_name").status_code, 400)
+        self.assertEqual(self.get(cursor="not-a-cursor").status_code, 400)
+        self.assertEqual(self.get(status="unknown").status_code, 400)
+        self.assertEqual(self.get(date_due_after="01/02/2024").status_code, 400)
+
+    def test_cursor_must_match_ordering(self):
+        self.make_invoices(3)
+        cursor = self.get(page_size=1).json()["data"]["pagination"]["next_cursor"]
+
+        self.assertEqual(self.get(ordering="-date_due", cursor=cursor).status_code, 400)
+
+    def test_only_own_invoices_are_listed(self):
+        self.make_invoices(2)
+        baker.make("backend.Invoice", _quantity=2, organization=self.created_team)
+
+        self.assertEqual(len(self.get().json()["data"]["invoices"]), 2)
+        self.assertEqual(Invoice.objects.count(), 4)
@@ -6,8 +6,11 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, SimpleTestCase, override_settings
 from django.urls import resolve, reverse
 from datetime import date, timedelta
+from decimal import Decimal
 
-from backend.models import User, Organization, Receipt, UserSettings, Invoice
+from model_bakery import baker
+
+from backend.models import User, Organization, Receipt, UserSettings, Invoice, InvoiceItem
 
 
 def assert_url_matches_view(url_path, url_name, view_function_path):
@@ -39,6 +42,23 @@ def create_mock_image():
     return SimpleUploadedFile("mock_image.jpg", image_io.getvalue(), content_type="image/jpeg")
 
 
+def make_invoice(user: User, price: str | None = "10", **kwargs) -> Invoice:
+    """
+    Create an invoice whose money columns can be calculated, with a single product item.
+
+    Args:
+        user (User): The invoice's owner.
+        price (str | None): The item's price, or None for an invoice without items.
+        **kwargs: Invoice fields, overriding the defaults (no VAT number, discount or logo).
+    """
+    invoice = baker.make(
+        Invoice, **{"user": user, "vat_number": None, "discount_amount": 0, "discount_percentage": 0, "logo": None, **kwargs}
+    )
+    if price is not None:
+        invoice.items.add(InvoiceItem.objects.create(name="item", description="item", is_service=False, price=Decimal(price)))
+    return invoice
+
+
 @override_settings(STATICFILES_STORAGE="django.contrib.staticfiles.storage.StaticFilesStorage")
 class ViewTestCase(TestCase):
     def setUp(self):
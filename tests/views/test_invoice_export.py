@@ -0,0 +1,83 @@
+import tempfile
+import zipfile
+from datetime import date
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.test import override_settings
+from django.urls import reverse
+from model_bakery import baker
+
+from backend.core.service.asyn_tasks.tasks import Task
+from backend.core.service.invoices.single import export_pdfs
+from tests.handler import ViewTestCase
+
+
+@override_settings(INVOICE_EXPORT_WORKERS=1)
+# the background thread would use its own database connection, outside the test's transaction
+@mock.patch.object(Task, "queue_background_task", Task.queue_task)
+@mock.patch.object(export_pdfs, "store_invoice_pdf")
+@mock.patch.object(export_pdfs, "html_to_pdf", return_value=b"%PDF-1.4")
+class InvoiceExportEndpointTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("api:finance:invoices:single:export")
+
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        storage_patch = mock.patch.object(export_pdfs, "_private_storage", return_value=FileSystemStorage(location=media.name))
+        storage_patch.start()
+        self.addCleanup(storage_patch.stop)
+
+    def test_exports_in_the_background_and_serves_the_zip(self, *mocks):
+        self.login_user()
+        invoice = baker.make(
+            "backend.Invoice",
+            user=self.log_in_user,
+            date_issued=date(2024, 3, 4),
+            vat_number=None,
+            discount_amount=0,
+            discount_percentage=0,
+            logo=None,
+        )
+        baker.make("backend.Invoice", user=self.log_in_user, date_issued=date(2023, 3, 4), vat_number=None, logo=None)
+
+        # the response is returned before the task runs, once the export is committed
+        with self.captureOnCommitCallbacks(execute=True):
+            queued = self.client.post(self.url, {"start_date": "2024-01-01"})
+
+        self.assertEqual(queued.status_code, 202)
+        export_id = queued.json()["export_id"]
+        self.assertEqual((queued.json()["done"], queued.json()["finished"]), (0, False))
+
+        progress = self.client.get(reverse("api:finance:invoices:single:export progress", kwargs={"export_id": export_id}))
+        self.assertEqual((progress.status_code, progress.json()["done"]), (200, 1))
+        self.assertEqual(
+            progress.json()["download_url"], reverse("api:finance:invoices:single:export download", kwargs={"export_id": export_id})
+        )
+
+        download = self.client.get(progress.json()["download_url"])
+        self.assertEqual(download["Content-Disposition"], 'attachment; filename="invoices_2024-01-01.zip"')
+        archive = zipfile.ZipFile(BytesIO(b"".join(download.streaming_content)))
+        self.assertEqual(archive.namelist(), [f"invoice_{invoice.id}.pdf"])
+
+    def test_exports_are_private_to_their_owner(self, *mocks):
+        self.login_user()
+        export_id = self.client.post(self.url).json()["export_id"]
+
+        self.client.force_login(baker.make("backend.User"))
+
+        for name in ("export progress", "export download"):
+            self.assertEqual(
+                self.client.get(reverse(f"api:finance:invoices:single:{name}", kwargs={"export_id": export_id})).status_code, 404
+            )
+        self.assertEqual(
+            self.client.get(reverse("api:finance:invoices:single:export progress", kwargs={"export_id": "not-an-export"})).status_code,
+            404,
+        )
+
+    def test_invalid_filters_return_400(self, *mocks):
+        self.login_user()
+        self.assertEqual(self.client.post(self.url, {"start_date": "last year"}).status_code, 400)
+        self.assertEqual(self.client.post(self.url, {"status": "lost"}).status_code, 400)
@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from backend.core.utils.navigation import NAVIGATION_COOKIE_NAME, get_last_visited
+from tests.handler import ViewTestCase
+
+
+class LastVisitedMiddlewareTestCase(ViewTestCase):
+    html_headers = {"HTTP_ACCEPT": "text/html"}
+
+    def setUp(self):
+        super().setUp()
+        self.login_user()
+
+    def test_page_views_do_not_write_session(self):
+        self.client.get(reverse("dashboard"), **self.html_headers)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("settings:dashboard"), **self.html_headers)
+
+        session_writes = [
+            query["sql"] for query in queries if "django_session" in query["sql"] and query["sql"].startswith(("UPDATE", "INSERT"))
+        ]
+        self.assertEqual(session_writes, [])
+
+    def test_last_visited_is_tracked_in_signed_cookie(self):
+        self.client.get(reverse("dashboard"), **self.html_headers)
+        response = self.client.get(reverse("settings:dashboard"), **self.html_headers)
+
+        self.assertIn(NAVIGATION_COOKIE_NAME, response.cookies)
+        self.assertEqual(get_last_visited(response.wsgi_request), "http://testserver" + reverse("dashboard"))
+
+    def test_reload_keeps_history_and_skips_persisting(self):
+        self.client.get(reverse("dashboard"), **self.html_headers)
+        self.client.get(reverse("settings:dashboard"), **self.html_headers)
+        response = self.client.get(reverse("settings:dashboard"), **self.html_headers)
+
+        self.assertNotIn(NAVIGATION_COOKIE_NAME, response.cookies)
+        self.assertEqual(get_last_visited(response.wsgi_request), "http://testserver" + reverse("dashboard"))
+
+    @override_settings(NAVIGATION_HISTORY_STORAGE="cache")
+    def test_cache_storage(self):
+        self.client.get(reverse("dashboard"), **self.html_headers)
+        response = self.client.get(reverse("settings:dashboard"), **self.html_headers)
+
+        self.assertNotIn(NAVIGATION_COOKIE_NAME, response.cookies)
+        self.assertEqual(get_last_visited(response.wsgi_request), "http://testserver" + reverse("dashboard"))
@@ -0,0 +1,70 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from backend.finance.views.invoices.single import view
+from backend.models import InvoiceItem, InvoiceURL
+from tests.handler import ViewTestCase
+
+
+class PublicInvoicePageTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.invoice = baker.make(
+            "backend.Invoice", user=self.log_in_user, vat_number=None, discount_amount=0, discount_percentage=0, logo=None
+        )
+        self.invoice_url = InvoiceURL.objects.create(invoice=self.invoice)
+        self.url = reverse("invoices view invoice", kwargs={"uuid": self.invoice_url.uuid})
+
+    def test_revalidation_returns_not_modified(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def test_revalidation_does_not_load_the_invoice(self):
+        response = self.client.get(self.url)
+
+        with mock.patch.object(view, "get_public_invoice") as get_public_invoice:
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+            self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code, 304)
+
+        get_public_invoice.assert_not_called()
+
+    def test_invoice_changes_change_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.invoice.items.add(InvoiceItem.objects.create(name="item", description="item", is_service=False, price=Decimal("10")))
+        after_items = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(after_items.status_code, 200)
+        self.assertContains(after_items, "10.00")
+
+        self.invoice.refresh_from_db()
+        self.invoice.notes = "Thanks for your business"
+        self.invoice.save()
+        after_edit = self.client.get(self.url, HTTP_IF_NONE_MATCH=after_items["ETag"])
+        self.assertEqual(after_edit.status_code, 200)
+        self.assertContains(after_edit, "Thanks for your business")
+
+    def test_signed_in_viewers_get_their_own_etag(self):
+        anonymous = self.client.get(self.url)["ETag"]
+        self.login_user()
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=anonymous).status_code, 200)
+
+    def test_expired_and_deleted_links_are_not_served(self):
+        self.client.get(self.url)
+
+        self.invoice_url.expires = timezone.now() - timedelta(minutes=1)
+        self.invoice_url.save()
+        self.assertRedirects(self.client.get(self.url), reverse("index"), fetch_redirect_response=False)
+
+        self.invoice_url.delete()
+        self.assertRedirects(self.client.get(self.url), reverse("index"), fetch_redirect_response=False)
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from model_bakery import baker
+
+from backend.core.service.boto3.scheduler import pause
+from backend.core.service.invoices.recurring.schedule_status import get_schedule_status_version
+from backend.models import InvoiceRecurringProfile
+from tests.handler import ViewTestCase
+
+SCHEDULE_UUID = "5f0c7bd6-8a47-4ad3-9a2d-0d1e4f8f2b6b"
+
+
+class RecurringScheduleStatusTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.login_user()
+        self.profile = baker.make(InvoiceRecurringProfile, user=self.log_in_user, vat_number=None, logo=None)
+        InvoiceRecurringProfile.objects.filter(pk=self.profile.pk).update(status="ongoing", boto_schedule_uuid=SCHEDULE_UUID)
+        self.poll_url = reverse("api:finance:invoices:recurring:poll_update_schedule", kwargs={"invoice_profile_id": self.profile.pk})
+
+    def change_status(self, status: str):
+        url = reverse("api:finance:invoices:recurring:edit status", kwargs={"invoice_profile_id": self.profile.pk, "status": status})
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(url, **self.htmx_headers)
+
+    @mock.patch.object(pause, "pause_boto_schedule", return_value=True)
+    def test_pausing_publishes_the_schedule_change(self, pause_boto_schedule):
+        response = self.change_status("pause")
+
+        self.assertEqual(response.context["schedule_version"], 0)
+        self.assertEqual(get_schedule_status_version(self.profile.pk), 1)
+        pause_boto_schedule.assert_called_once_with(SCHEDULE_UUID, pause=True)
+
+        poll = self.client.get(self.poll_url, {"v": 0}, **self.htmx_headers)
+
+        self.assertEqual(poll.status_code, 286)
+        self.assertTemplateUsed(poll, "pages/invoices/recurring/dashboard/poll_response.html")
+        self.assertEqual(poll.context["invoiceProfile"].status, "paused")
+        self.assertEqual(poll.context["invoiceProfile"].boto_schedule_status, "completed")
+
+    @mock.patch.object(pause, "pause_boto_schedule", return_value=False)
+    def test_failed_schedule_changes_are_reported(self, pause_boto_schedule):
+        self.change_status("pause")
+
+        poll = self.client.get(self.poll_url, {"v": 0}, **self.htmx_headers)
+
+        self.assertIn("could not be updated", " ".join(str(message) for message in poll.context["messages"]))
+
+    def test_unchanged_schedule_keeps_polling_without_calling_aws(self):
+        version = get_schedule_status_version(self.profile.pk)
+
+        with mock.patch.object(pause, "get_boto_schedule") as get_boto_schedule:
+            with CaptureQueriesContext(connection) as queries:
+                poll = self.client.get(self.poll_url, {"v": version}, **self.htmx_headers)
+
+        self.assertEqual(poll.status_code, 204)
+        profile_selects = [query for query in queries if query["sql"].startswith(f'SELECT "{InvoiceRecurringProfile._meta.db_table}"')]
+        self.assertEqual(len(profile_selects), 1)
+        get_boto_schedule.assert_not_called()
+
+    def test_unchanged_schedule_of_another_user_is_not_found(self):
+        other = baker.make(InvoiceRecurringProfile, user=baker.make("backend.User"), vat_number=None, logo=None)
+        url = reverse("api:finance:invoices:recurring:poll_update_schedule", kwargs={"invoice_profile_id": other.pk})
+
+        poll = self.client.get(url, {"v": get_schedule_status_version(other.pk)}, **self.htmx_headers)
+
+        self.assertEqual(poll.status_code, 404)
+
+    def test_timed_out_poll_renders_the_profile_from_the_database(self):
+        # e.g. the change was published to another worker's local cache
+        InvoiceRecurringProfile.objects.filter(pk=self.profile.pk).update(status="paused")
+        expired = int((datetime.now() - timedelta(seconds=1)).timestamp())
+
+        poll = self.client.get(self.poll_url, {"v": get_schedule_status_version(self.profile.pk), "t": expired}, **self.htmx_headers)
+
+        self.assertEqual(poll.status_code, 286)
+        self.assertTemplateUsed(poll, "pages/invoices/recurring/dashboard/poll_response.html")
+        self.assertEqual(poll.context["status"], "paused")
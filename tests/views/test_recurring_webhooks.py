@@ -0,0 +1,110 @@
+from datetime import date
+from unittest import mock
+
+from django.urls import reverse
+from model_bakery import baker
+
+from backend.core.api.public import APIAuthToken
+from backend.core.service.asyn_tasks.tasks import Task
+from backend.core.service.invoices.recurring.generation import next_invoice
+from backend.core.service.invoices.recurring.generation.batch import generate_due_recurring_invoices_task
+from backend.core.service.invoices.recurring.generation.ledger import claim_period
+from backend.core.utils.dataclasses import BaseServiceResponse
+from backend.models import DefaultValues, Invoice, InvoiceRecurringProfile, RecurringInvoiceGeneration
+from tests.handler import ViewTestCase
+
+
+class RecurringInvoiceBatchWebhookTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("webhooks:receive_recurring_invoices_batch")
+
+    def test_requires_the_webhook_key(self):
+        response = self.client.post(self.url, {"issue_date": "2024-02-15"})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(response.json()["success"])
+
+    def test_unknown_key_is_rejected(self):
+        response = self.client.post(self.url, {"issue_date": "2024-02-15"}, HTTP_AUTHORIZATION="Bearer not-a-key")
+
+        self.assertEqual(response.status_code, 400)
+
+    @mock.patch.object(Task, "queue_background_task")
+    def test_queues_the_batch_and_answers_202(self, queue_background_task):
+        token = APIAuthToken(
+            name="scheduler", user=self.log_in_user, administrator_service_type=APIAuthToken.AdministratorServiceTypes.AWS_WEBHOOK_CALLBACK
+        )
+        raw_key = token.generate_key()
+        token.save()
+
+        response = self.client.post(self.url, {"issue_date": "2024-02-15"}, HTTP_AUTHORIZATION=f"Bearer {raw_key}")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {"message": "Generation queued", "success": True, "issue_date": "2024-02-15"})
+        queue_background_task.assert_called_once_with(generate_due_recurring_invoices_task, "2024-02-15")
+
+
+class RecurringInvoiceWebhookRetryTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        token = APIAuthToken(
+            name="scheduler", user=self.log_in_user, administrator_service_type=APIAuthToken.AdministratorServiceTypes.AWS_WEBHOOK_CALLBACK
+        )
+        self.raw_key = token.generate_key()
+        token.save()
+        DefaultValues.objects.get_or_create(user=self.log_in_user, client=None)
+        self.profile = baker.make(
+            InvoiceRecurringProfile,
+            user=self.log_in_user,
+            status="ongoing",
+            client_to=None,
+            vat_number=None,
+            discount_amount=0,
+            discount_percentage=0,
+            logo=None,
+        )
+        InvoiceRecurringProfile.objects.filter(pk=self.profile.pk).update(next_issue_date=date(2024, 2, 15))
+        self.url = reverse("webhooks:receive_recurring_invoices")
+
+    @mock.patch.object(
+        next_invoice, "on_create_invoice_email_service", side_effect=lambda **kwargs: BaseServiceResponse(True, response="sent")
+    )
+    def test_retried_deliveries_generate_once(self, send_email):
+        data = {"invoice_profile_id": self.profile.pk, "scheduled_time": "2024-02-15T09:00:00Z"}
+
+        first = self.client.post(self.url, data, HTTP_AUTHORIZATION=f"Bearer {self.raw_key}")
+        retry = self.client.post(self.url, data, HTTP_AUTHORIZATION=f"Bearer {self.raw_key}")
+
+        self.assertEqual((first.status_code, first.json()["message"]), (200, "Invoice generated"))
+        self.assertEqual((retry.status_code, retry.json()["message"]), (200, "No invoice due"))
+        self.assertEqual(Invoice.objects.filter(invoice_recurring_profile=self.profile).count(), 1)
+        self.assertEqual(send_email.call_count, 1)
+
+    @mock.patch.object(
+        next_invoice, "on_create_invoice_email_service", side_effect=lambda **kwargs: BaseServiceResponse(True, response="sent")
+    )
+    def test_generates_the_next_issue_date_period(self, send_email):
+        # delivered the day after, "Z" suffixed as the scheduler sends it
+        data = {"invoice_profile_id": self.profile.pk, "scheduled_time": "2024-02-16T07:00:00Z"}
+
+        response = self.client.post(self.url, data, HTTP_AUTHORIZATION=f"Bearer {self.raw_key}")
+
+        self.assertEqual((response.status_code, response.json()["message"]), (200, "Invoice generated"))
+        self.assertEqual(list(RecurringInvoiceGeneration.objects.values_list("period", flat=True)), [date(2024, 2, 15)])
+
+    def test_period_claimed_by_the_batch_isnt_generated_again(self):
+        claim_period(self.profile.pk, date(2024, 2, 15))
+        data = {"invoice_profile_id": self.profile.pk, "scheduled_time": "2024-02-15T07:00:00Z"}
+
+        response = self.client.post(self.url, data, HTTP_AUTHORIZATION=f"Bearer {self.raw_key}")
+
+        self.assertTrue(response.json()["success"])
+        self.assertFalse(Invoice.objects.filter(invoice_recurring_profile=self.profile).exists())
+
+    def test_invalid_scheduled_time(self):
+        data = {"invoice_profile_id": self.profile.pk, "scheduled_time": "15/02/2024"}
+
+        response = self.client.post(self.url, data, HTTP_AUTHORIZATION=f"Bearer {self.raw_key}")
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,33 @@
+from datetime import date
+from decimal import Decimal
+
+from django.urls import reverse
+
+from tests.handler import ViewTestCase, make_invoice
+
+
+class RevenueSeriesEndpointTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("api:finance:reports:revenue")
+
+    def test_returns_series_as_json(self):
+        self.login_user()
+        make_invoice(self.log_in_user, "25", date_issued=date(2024, 3, 4), status="paid", currency="GBP")
+
+        response = self.client.get(self.url, {"start": "2024-01-01", "end": "2024-12-31"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Decimal(response.json()["series"]["GBP"][0]["paid"]), Decimal("25"))
+
+    def test_htmx_renders_table(self):
+        self.login_user()
+        response = self.client.get(self.url, HTTP_HX_REQUEST="true")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "pages/reports/_revenue_series.html")
+
+    def test_invalid_parameters_return_400(self):
+        self.login_user()
+        self.assertEqual(self.client.get(self.url, {"interval": "week"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"start": "yesterday"}).status_code, 400)
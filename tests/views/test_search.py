@@ -0,0 +1,38 @@
+from datetime import date
+
+from django.urls import reverse
+from model_bakery import baker
+
+from tests.handler import ViewTestCase
+
+
+class GlobalSearchEndpointTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("api:base:search")
+
+    def test_returns_matching_results_as_json(self):
+        self.login_user()
+        receipt = baker.make("backend.Receipt", user=self.log_in_user, name="Office chair", date=date(2024, 2, 1))
+        baker.make("backend.Receipt", user=self.log_in_user, name="Desk lamp", date=date(2024, 2, 1))
+
+        response = self.client.get(self.url, {"q": "chair"})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([(result["kind"], result["id"]) for result in results], [("receipt", receipt.pk)])
+
+    def test_kind_filter(self):
+        self.login_user()
+        baker.make("backend.Receipt", user=self.log_in_user, name="Office chair", date=date(2024, 2, 1))
+
+        response = self.client.get(self.url, {"q": "chair", "kind": "client"})
+
+        self.assertEqual(response.json()["results"], [])
+
+    def test_htmx_renders_results(self):
+        self.login_user()
+        response = self.client.get(self.url, {"q": "anything"}, HTTP_HX_REQUEST="true")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "base/search/_results.html")
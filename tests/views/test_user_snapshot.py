@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from backend.models import UserSettings
+from tests.handler import ViewTestCase
+
+
+class UserSnapshotMiddlewareTestCase(ViewTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.login_user()
+        self.client.get(reverse("dashboard"))
+
+    def user_queries(self, url_name="dashboard"):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(url_name))
+        return response, [query["sql"] for query in queries.captured_queries if 'FROM "backend_user"' in query["sql"]]
+
+    def test_cached_snapshot_makes_no_user_queries(self):
+        response, queries = self.user_queries()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertEqual(response.wsgi_request.user.pk, self.log_in_user.pk)
+        self.assertEqual(response.wsgi_request.actor.pk, self.log_in_user.pk)
+        self.assertIsNone(response.wsgi_request.team)
+
+    def test_team_switch_invalidates_snapshot(self):
+        self.log_in_user.logged_in_as_team = self.created_team
+        self.log_in_user.save()
+
+        response = self.client.get(reverse("dashboard"))
+
+        self.assertEqual(response.wsgi_request.team_id, self.created_team.pk)
+        self.assertEqual(response.wsgi_request.actor.pk, self.created_team.pk)
+        self.assertEqual(response.wsgi_request.user.logged_in_as_team.pk, self.created_team.pk)
+
+    def test_settings_change_invalidates_snapshot(self):
+        user_settings = UserSettings.objects.get(user=self.log_in_user)
+        user_settings.currency = "EUR"
+        user_settings.save()
+
+        response = self.client.get(reverse("dashboard"))
+
+        self.assertEqual(response.wsgi_request.user.user_profile.currency, "EUR")
+
+    def test_password_change_logs_out_session(self):
+        self.log_in_user.set_password("new password")
+        self.log_in_user.save()
+
+        response = self.client.get(reverse("dashboard"))
+
+        self.assertEqual(response.status_code, 302)